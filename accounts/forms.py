@@ -16,8 +16,8 @@ class UserRegistrationForm(UserCreationForm):
         user.email = self.cleaned_data['email']
         user.phone = self.cleaned_data['phone']
         if commit:
+            # The post_save signal creates the matching Profile.
             user.save()
-            Profile.objects.create(user=user)
         return user
 
 
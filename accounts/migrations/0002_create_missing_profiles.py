@@ -0,0 +1,25 @@
+# Generated by Django 6.0 on 2026-10-19 13:52
+
+from django.db import migrations
+
+
+def create_missing_profiles(apps, schema_editor):
+    """Give every existing user a profile so the dashboard never creates one."""
+    User = apps.get_model('accounts', 'User')
+    Profile = apps.get_model('accounts', 'Profile')
+    missing = User.objects.filter(profile__isnull=True).values_list('pk', flat=True)
+    Profile.objects.bulk_create(
+        [Profile(user_id=pk) for pk in missing.iterator()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_missing_profiles, migrations.RunPython.noop),
+    ]
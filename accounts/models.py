@@ -56,7 +56,7 @@ class Profile(models.Model):
     activity_level = models.CharField(max_length=20, choices=ACTIVITY_LEVELS, default='sedentary')
     fitness_goal = models.CharField(max_length=20, choices=GOAL_CHOICES, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return f"{self.user.username}'s Profile"
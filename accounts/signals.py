@@ -0,0 +1,25 @@
+"""
+Django signals for user accounts.
+
+Creates the profile row when a user is created so request handlers
+(e.g. the dashboard) never have to create it on a read.
+"""
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import Profile, User
+
+
+@receiver(post_save, sender=User)
+def create_user_profile(instance, created, raw=False, **kwargs):
+    """
+    Create an empty Profile for every newly created user.
+
+    Args:
+        instance: The User instance being saved
+        created: True if the user was just inserted
+        raw: True when loading fixtures (skipped)
+        **kwargs: Additional signal arguments
+    """
+    if created and not raw:
+        Profile.objects.get_or_create(user=instance)
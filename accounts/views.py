@@ -11,9 +11,16 @@ from django.core.mail import send_mail
 from django.conf import settings
 from django.db.models import F, Sum
 
+from diet_planner.routers import replica_reads
+from diet_plans.catalog import active_template, render_plan
+from diet_plans.models import DietPlan
 from diet_plans.services import DietPlanGenerator
+from diet_plans.tasks import generate_diet_plan_async
 from orders.models import Order
 from products.models import Supplement, ProteinBar
+from products.recommendations import recommendations_for
+from products.tasks import refresh_recommendations_async
+from progress.services import log_weight
 
 from .forms import UserRegistrationForm, ProfileForm
 from .models import Profile, User
@@ -92,20 +99,43 @@ def dashboard(request):
     """
     Display user dashboard with profile and diet plan information.
 
-    Shows user's profile details and generated diet plan if available.
+    Read-only: the plan for the current goal and the profile are fetched in
+    one joined query. If the plan is missing it is generated by a
+    background job and a placeholder is shown meanwhile, unless no meal
+    template is active for the goal, in which case no plan can be built. Product
+    recommendations are read precomputed from the cache; if the cache is
+    cold a background rebuild is started and none are shown.
     """
-    profile, _ = Profile.objects.get_or_create(user=request.user)
-    diet_plan = None
-
-    if profile.fitness_goal:
-        diet_plan = request.user.diet_plans.filter(goal_type=profile.fitness_goal).first()
-        if not diet_plan:
-            generator = DietPlanGenerator(profile)
-            diet_plan = generator.generate()
+    diet_plan = DietPlan.objects.select_related('user__profile').filter(
+        user=request.user,
+        goal_type=F('user__profile__fitness_goal'),
+    ).first()
+    plan_pending = False
+    plan_unavailable = False
+    recommendations = []
+
+    if diet_plan:
+        profile = diet_plan.user.profile
+        recommendations = recommendations_for(diet_plan.goal_type, diet_plan.daily_calories)
+        if recommendations is None:
+            refresh_recommendations_async()
+            recommendations = []
+    else:
+        profile = Profile.objects.filter(user=request.user).first()
+        if profile and profile.fitness_goal and DietPlanGenerator(profile).calculate_bmr():
+            if active_template(profile.fitness_goal) is None:
+                plan_unavailable = True
+            else:
+                generate_diet_plan_async(profile.pk)
+                plan_pending = True
 
     context = {
         'profile': profile,
         'diet_plan': diet_plan,
+        'meals': render_plan(diet_plan) if diet_plan else [],
+        'plan_pending': plan_pending,
+        'plan_unavailable': plan_unavailable,
+        'recommendations': recommendations,
     }
     return render(request, 'accounts/dashboard.html', context)
 
@@ -158,6 +188,8 @@ def edit_profile(request):
         form = ProfileForm(request.POST, instance=profile)
         if form.is_valid():
             form.save()
+            if 'current_weight' in form.changed_data and profile.current_weight is not None:
+                log_weight(request.user, profile.current_weight)
             messages.success(request, 'Profile updated successfully!')
 
             if profile.fitness_goal:
@@ -198,6 +230,7 @@ def is_admin(user):
 
 @login_required
 @user_passes_test(is_admin)
+@replica_reads
 def admin_dashboard(request):
     """
     Display admin dashboard with system statistics.
@@ -0,0 +1,147 @@
+"""
+Namespaced, versioned cache keys.
+
+Each app caches under its own namespace ("products", "orders",
+"dashboard", "diet_plans"). Keys embed the namespace's current version,
+which is itself kept in the cache, so bumping the version invalidates
+everything in the namespace at once: old entries are never read again
+and expire on their own. This works the same on every backend selected
+by CACHE_BACKEND, including ones that cannot delete by prefix.
+
+A missing version (never set, or evicted) restarts from the current
+time in milliseconds, so it can never collide with a version whose
+entries may still be cached.
+"""
+import time
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+NAMESPACES = ('products', 'orders', 'dashboard', 'diet_plans')
+VERSION_KEY = 'cache-version:{}'
+
+
+def _fresh_version():
+    return int(time.time() * 1000)
+
+
+class Namespace:
+    """
+    A cache namespace whose keys are invalidated together.
+    """
+    def __init__(self, name, alias='default'):
+        """
+        Initialize the namespace.
+
+        Args:
+            name: Namespace name, used as the key prefix
+            alias: Cache alias from settings.CACHES
+        """
+        self.name = name
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def version(self):
+        """
+        Get the namespace's current version, starting one if missing.
+
+        Returns:
+            int: Version embedded in this namespace's keys
+        """
+        version_key = VERSION_KEY.format(self.name)
+        version = self.cache.get(version_key)
+        if version is None:
+            version = _fresh_version()
+            if not self.cache.add(version_key, version, timeout=None):
+                version = self.cache.get(version_key, version)
+        return version
+
+    def key(self, *parts, version=None):
+        """
+        Build a versioned key from its parts.
+
+        Args:
+            *parts: Key components, joined with ":"
+            version: Namespace version (looked up if not given)
+
+        Returns:
+            str: Cache key such as "products:v3:recommendations"
+        """
+        if version is None:
+            version = self.version()
+        return ':'.join([self.name, f'v{version}', *(str(part) for part in parts)])
+
+    def get(self, key, default=None):
+        return self.cache.get(self.key(key), default)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        self.cache.set(self.key(key), value, timeout=timeout)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT):
+        return self.cache.add(self.key(key), value, timeout=timeout)
+
+    def incr(self, key, delta=1):
+        return self.cache.incr(self.key(key), delta)
+
+    def delete(self, key):
+        self.cache.delete(self.key(key))
+
+    def get_many(self, keys):
+        """
+        Fetch several keys with one version lookup and one cache round trip.
+
+        Args:
+            keys: Unversioned keys
+
+        Returns:
+            dict: Found unversioned keys -> values
+        """
+        version = self.version()
+        versioned = {self.key(key, version=version): key for key in keys}
+        found = self.cache.get_many(list(versioned))
+        return {versioned[key]: value for key, value in found.items()}
+
+    def delete_many(self, keys):
+        version = self.version()
+        self.cache.delete_many([self.key(key, version=version) for key in keys])
+
+    def invalidate(self):
+        """
+        Invalidate every key in the namespace by bumping its version.
+
+        Returns:
+            int: The new version
+        """
+        version_key = VERSION_KEY.format(self.name)
+        try:
+            return self.cache.incr(version_key)
+        except ValueError:
+            version = _fresh_version()
+            self.cache.set(version_key, version, timeout=None)
+            return version
+
+
+_namespaces = {}
+
+
+def namespace(name):
+    """
+    Get the shared Namespace object for a name.
+
+    Args:
+        name: One of NAMESPACES
+
+    Returns:
+        Namespace: Namespace bound to the default cache
+
+    Raises:
+        KeyError: If the name is not a registered namespace
+    """
+    if name not in NAMESPACES:
+        raise KeyError(f'Unknown cache namespace "{name}"')
+    if name not in _namespaces:
+        _namespaces[name] = Namespace(name)
+    return _namespaces[name]
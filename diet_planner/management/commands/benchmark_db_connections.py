@@ -0,0 +1,68 @@
+"""
+Management command to measure per-request database connection overhead.
+
+Replays simulated request cycles (request_started, one query,
+request_finished) so Django's connection handling runs exactly as in a
+worker: first with connections closed after every request, then with the
+configured DATABASES setting (persistent connections or a pool).
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connection
+from django.db.backends.signals import connection_created
+
+
+class Command(BaseCommand):
+    help = 'Compare request latency with per-request and configured database connections.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=500,
+            help='Simulated requests per run (default: 500).',
+        )
+
+    def _run(self, label, requests):
+        opened = []
+
+        def count(**kwargs):
+            opened.append(kwargs['connection'].alias)
+
+        connection_created.connect(count)
+        try:
+            connection.close()
+            started = time.perf_counter()
+            for _ in range(requests):
+                request_started.send(sender=self.__class__)
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+                request_finished.send(sender=self.__class__)
+            elapsed = (time.perf_counter() - started) * 1000
+        finally:
+            connection_created.disconnect(count)
+            connection.close()
+
+        self.stdout.write(
+            f'{label}: {elapsed / requests:.3f} ms/request, '
+            f'{len(opened)} connection(s) opened for {requests} request(s)'
+        )
+
+    def handle(self, *args, **options):
+        settings_dict = connection.settings_dict
+        configured = settings_dict['CONN_MAX_AGE']
+        pooled = bool(settings_dict.get('OPTIONS', {}).get('pool'))
+        self.stdout.write(f"{connection.vendor} database '{settings_dict['NAME']}'")
+
+        if not pooled:
+            settings_dict['CONN_MAX_AGE'] = 0
+            try:
+                self._run('connect per request', options['requests'])
+            finally:
+                settings_dict['CONN_MAX_AGE'] = configured
+        self._run(
+            'connection pool' if pooled else f'CONN_MAX_AGE={configured}',
+            options['requests'],
+        )
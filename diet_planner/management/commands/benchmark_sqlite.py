@@ -0,0 +1,128 @@
+"""
+Management command to benchmark SQLite under concurrent worker processes.
+
+Runs the same mixed workload against a scratch database twice: once with
+SQLite's defaults (rollback journal, deferred transactions) and once
+with the SQLITE_PRAGMAS profile from settings. Each worker process plays
+an app server worker doing catalog-style range reads and checkout-style
+read-then-update transactions. The project database is not touched.
+"""
+import multiprocessing
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+ROWS = 10000
+PAGE_SIZE = 20
+# Python's sqlite3 default, which Django uses unless OPTIONS sets timeout
+DEFAULT_TIMEOUT = 5.0
+
+
+def _create_database(path):
+    with sqlite3.connect(path) as conn:
+        conn.execute('CREATE TABLE product (id INTEGER PRIMARY KEY, name TEXT, stock INTEGER)')
+        conn.executemany(
+            'INSERT INTO product (id, name, stock) VALUES (?, ?, ?)',
+            ((pk, f'Product {pk}', 1000) for pk in range(1, ROWS + 1)),
+        )
+    conn.close()
+
+
+def _worker(path, pragmas, begin, *, seconds, write_ratio, seed, results):
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path, timeout=DEFAULT_TIMEOUT, isolation_level=None)
+    for name, value in pragmas.items():
+        conn.execute(f'PRAGMA {name}={value}')
+
+    reads = writes = locked = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        try:
+            if rng.random() < write_ratio:
+                pk = rng.randint(1, ROWS)
+                conn.execute(begin)
+                stock = conn.execute('SELECT stock FROM product WHERE id = ?', (pk,)).fetchone()[0]
+                conn.execute('UPDATE product SET stock = ? WHERE id = ?', (stock - 1, pk))
+                conn.execute('COMMIT')
+                writes += 1
+            else:
+                start = rng.randint(1, ROWS - PAGE_SIZE)
+                conn.execute(
+                    'SELECT id, name, stock FROM product WHERE id BETWEEN ? AND ?',
+                    (start, start + PAGE_SIZE),
+                ).fetchall()
+                reads += 1
+        except sqlite3.OperationalError:
+            locked += 1
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+    conn.close()
+    results.put((reads, writes, locked))
+
+
+class Command(BaseCommand):
+    help = 'Compare SQLite read/write throughput with and without the tuned pragma profile.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Concurrent worker processes (default: 4).',
+        )
+        parser.add_argument(
+            '--seconds',
+            type=float,
+            default=5.0,
+            help='Duration of each run (default: 5).',
+        )
+        parser.add_argument(
+            '--write-ratio',
+            type=float,
+            default=0.2,
+            help='Share of operations that are write transactions (default: 0.2).',
+        )
+
+    def _run(self, directory, label, pragmas, begin, options):
+        path = os.path.join(directory, f'{label}.sqlite3')
+        _create_database(path)
+        results = multiprocessing.Queue()
+        workers = [
+            multiprocessing.Process(
+                target=_worker,
+                args=(path, pragmas, begin),
+                kwargs={
+                    'seconds': options['seconds'],
+                    'write_ratio': options['write_ratio'],
+                    'seed': seed,
+                    'results': results,
+                },
+            )
+            for seed in range(options['workers'])
+        ]
+        for worker in workers:
+            worker.start()
+        totals = [sum(counts) for counts in zip(*(results.get() for _ in workers))]
+        for worker in workers:
+            worker.join()
+
+        reads, writes, locked = totals
+        seconds = options['seconds']
+        self.stdout.write(
+            f'{label}: {reads / seconds:.0f} reads/s, {writes / seconds:.0f} writes/s, '
+            f'{locked} failed with "database is locked"'
+        )
+
+    def handle(self, *args, **options):
+        directory = tempfile.mkdtemp(prefix='benchmark_sqlite_')
+        try:
+            self._run(directory, 'default', {}, 'BEGIN', options)
+            self._run(directory, 'tuned', settings.SQLITE_PRAGMAS, 'BEGIN IMMEDIATE', options)
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,31 @@
+"""
+Management command to invalidate cache namespaces.
+
+Bumps each namespace's version so every key in it is abandoned at once,
+across all workers sharing the cache backend. In-process caches layered
+on top (such as the diet plan bucket LRU) are not affected.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from diet_planner.cache import NAMESPACES, namespace
+
+
+class Command(BaseCommand):
+    help = 'Invalidate one or more cache namespaces by bumping their versions.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'namespaces',
+            nargs='*',
+            help=f'Namespaces to invalidate (default: all of {", ".join(NAMESPACES)}).',
+        )
+
+    def handle(self, *args, **options):
+        names = options['namespaces'] or NAMESPACES
+        unknown = sorted(set(names) - set(NAMESPACES))
+        if unknown:
+            raise CommandError(f'Unknown namespace(s): {", ".join(unknown)}')
+
+        for name in names:
+            version = namespace(name).invalidate()
+            self.stdout.write(self.style.SUCCESS(f'{name}: now at version {version}'))
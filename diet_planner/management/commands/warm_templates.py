@@ -0,0 +1,49 @@
+"""
+Management command to pre-compile templates and report their timings.
+
+Compile times show what the first request after a deploy would pay
+without pre-warming; a second pass shows the cached lookup cost. With
+--render, templates that render without their view's context are timed
+too.
+"""
+from django.core.management.base import BaseCommand
+
+from diet_planner.template_warmup import project_template_names, warm_templates
+
+
+class Command(BaseCommand):
+    help = 'Compile all project templates into the cached loader and report timings.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--render',
+            action='store_true',
+            help='Also time a render of each template with an empty context.',
+        )
+        parser.add_argument(
+            '--include-packages',
+            action='store_true',
+            help='Include templates shipped by third-party packages.',
+        )
+
+    def handle(self, *args, **options):
+        names = project_template_names(include_packages=options['include_packages'])
+        cold = warm_templates(names, render=options['render'])
+        warm = {name: compile_ms for name, compile_ms, _, _ in warm_templates(names)}
+
+        failed = 0
+        for name, compile_ms, render_ms, error in cold:
+            if error:
+                failed += 1
+                self.stdout.write(self.style.ERROR(f'{name}: {error}'))
+                continue
+            line = f'{name}: compile {compile_ms:.2f} ms, cached {warm[name]:.3f} ms'
+            if options['render']:
+                line += f', render {render_ms:.2f} ms' if render_ms is not None else ', render needs view context'
+            self.stdout.write(line)
+
+        total = sum(compile_ms for _, compile_ms, _, _ in cold if compile_ms is not None)
+        self.stdout.write(self.style.SUCCESS(
+            f'Warmed {len(cold) - failed} template(s) in {total:.0f} ms'
+            + (f', {failed} failed' if failed else '')
+        ))
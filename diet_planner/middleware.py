@@ -0,0 +1,36 @@
+"""
+Project-wide middleware.
+"""
+from django.conf import settings
+
+from .routers import begin_request, end_request
+
+PRIMARY_PIN_COOKIE = 'db_primary'
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pin a client to the primary database for a short time after it writes.
+
+    Tracks whether the request wrote through the ReplicaRouter; if it did,
+    a short-lived cookie makes the client's next requests skip the
+    replica until replication has caught up.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state, token = begin_request(pinned=PRIMARY_PIN_COOKIE in request.COOKIES)
+        try:
+            response = self.get_response(request)
+        finally:
+            end_request(token)
+        if state.wrote:
+            response.set_cookie(
+                PRIMARY_PIN_COOKIE,
+                '1',
+                max_age=settings.DB_REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
@@ -0,0 +1,109 @@
+"""
+Read-replica routing.
+
+When a "replica" database is configured (see DB_REPLICA in settings),
+views decorated with @replica_reads run their queries against it:
+catalog pages and admin reporting, which dominate reads and tolerate a
+little replication lag. Everything else, and all writes, use the
+primary. ReadYourWritesMiddleware pins a browser to the primary for
+DB_REPLICA_PIN_SECONDS after it writes, so shoppers always see their own
+changes. Without a replica every query goes to the primary.
+"""
+import contextvars
+from functools import wraps
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_ALIAS = 'replica'
+# Models written on nearly every request; always read from the primary
+PRIMARY_ONLY_MODELS = {'sessions.session', 'orders.cart', 'orders.cartitem'}
+
+_request_state = contextvars.ContextVar('replica_request_state', default=None)
+
+
+class RequestState:
+    """
+    Routing state for the request being handled.
+    """
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.use_replica = False
+        self.wrote = False
+
+
+def begin_request(pinned):
+    """
+    Start tracking routing state for a request.
+
+    Args:
+        pinned: True if the client wrote recently and must read the primary
+
+    Returns:
+        tuple: (state, token) where token is passed to end_request
+    """
+    state = RequestState(pinned)
+    return state, _request_state.set(state)
+
+
+def end_request(token):
+    """Stop tracking the request started with begin_request."""
+    _request_state.reset(token)
+
+
+def replica_configured():
+    """
+    Check whether a replica alias is configured.
+
+    Returns:
+        bool: True if DATABASES has a "replica" entry
+    """
+    return REPLICA_ALIAS in connections.settings
+
+
+def replica_reads(view):
+    """
+    Run a read-only view's queries against the replica.
+
+    Has no effect for unsafe methods, for clients pinned to the primary
+    or when no replica is configured.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        state = _request_state.get()
+        if state is not None and not state.pinned and request.method in ('GET', 'HEAD'):
+            state.use_replica = True
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+class ReplicaRouter:  # pylint: disable=unused-argument
+    """
+    Route reads to the replica for @replica_reads views, writes to the primary.
+
+    Method signatures follow Django's router API, which passes some
+    arguments by keyword, so unused ones keep their names.
+    """
+    def db_for_read(self, model, **hints):
+        state = _request_state.get()
+        if (
+            state is not None and state.use_replica and replica_configured()
+            and model._meta.label_lower not in PRIMARY_ONLY_MODELS
+        ):
+            return REPLICA_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _request_state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica mirrors the primary, so objects from both can relate
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica receives the schema through replication
+        if db == REPLICA_ALIAS:
+            return False
+        return None
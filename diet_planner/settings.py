@@ -12,12 +12,23 @@ https://docs.djangoproject.com/en/6.0/ref/settings/
 
 from pathlib import Path
 import os
+import tempfile
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Load .env file if it exists
+env_path = BASE_DIR / '.env'
+if env_path.exists():
+    with open(env_path) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#') and '=' in line:
+                key, value = line.split('=', 1)
+                os.environ.setdefault(key.strip(), value.strip())
+
 SECRET_KEY = os.getenv("DJANGO_SECRET_KEY")
 
-DEBUG = True
+DEBUG = os.environ.get('DJANGO_DEBUG', 'true').lower() in ('1', 'true', 'yes')
 
 ALLOWED_HOSTS = ['*']
 
@@ -35,6 +46,8 @@ INSTALLED_APPS = [
     'products',
     'orders',
     'notifications.apps.NotificationsConfig',
+    'progress',
+    'diet_planner',
 ]
 
 MIDDLEWARE = [
@@ -43,6 +56,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'diet_planner.middleware.ReadYourWritesMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -53,8 +67,16 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Compiled templates are kept per process (the autoreloader
+            # clears them when DEBUG is on); TEMPLATE_PREWARM compiles them
+            # all when the WSGI app loads, see diet_planner.template_warmup.
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -68,17 +90,121 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'diet_planner.wsgi.application'
 
+# Compile every project template when the WSGI app loads, so the first
+# requests after a deploy skip template parsing.
+TEMPLATE_PREWARM = os.environ.get('TEMPLATE_PREWARM', 'false' if DEBUG else 'true').lower() in ('1', 'true', 'yes')
+
 
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
-DATABASES = {
+# DB_ENGINE selects "sqlite" (default) or "postgres". Connections are
+# kept open for DB_CONN_MAX_AGE seconds and health-checked before reuse,
+# so requests skip connection setup. With DB_POOL=true, Postgres uses
+# psycopg's connection pool instead of persistent connections.
+DB_ENGINE = os.environ.get('DB_ENGINE', 'sqlite')
+DB_CONN_MAX_AGE = int(os.environ.get('DB_CONN_MAX_AGE', 60))
+DB_POOL = os.environ.get('DB_POOL', 'false').lower() in ('1', 'true', 'yes')
+
+# SQLite tuning applied to every new connection: WAL lets readers run
+# alongside the single writer, synchronous=NORMAL is safe under WAL, and
+# IMMEDIATE transactions take the write lock up front so concurrent
+# writers wait out busy_timeout instead of failing with "database is
+# locked". Set SQLITE_TUNING=false for SQLite's defaults.
+SQLITE_TUNING = os.environ.get('SQLITE_TUNING', 'true').lower() in ('1', 'true', 'yes')
+SQLITE_PRAGMAS = {
+    'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 128 * 1024 * 1024)),
+    # Negative values are KiB, so -20000 is a ~20 MB page cache
+    'cache_size': int(os.environ.get('SQLITE_CACHE_SIZE', -20000)),
+    'temp_store': os.environ.get('SQLITE_TEMP_STORE', 'MEMORY'),
+}
+
+if DB_ENGINE == 'postgres':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DB_NAME', 'diet_planner'),
+            'USER': os.environ.get('DB_USER', 'postgres'),
+            'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+            'HOST': os.environ.get('DB_HOST', 'localhost'),
+            'PORT': os.environ.get('DB_PORT', '5432'),
+            # The pool manages connection lifetime itself
+            'CONN_MAX_AGE': 0 if DB_POOL else DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'connect_timeout': int(os.environ.get('DB_CONNECT_TIMEOUT', 5)),
+                **({
+                    'pool': {
+                        'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 2)),
+                        'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', 10)),
+                        'timeout': int(os.environ.get('DB_POOL_TIMEOUT', 10)),
+                    },
+                } if DB_POOL else {}),
+            },
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DB_NAME', BASE_DIR / 'db.sqlite3'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'init_command': ';'.join(
+                    f'PRAGMA {name}={value}' for name, value in SQLITE_PRAGMAS.items()
+                ),
+                'transaction_mode': 'IMMEDIATE',
+            } if SQLITE_TUNING else {},
+        }
+    }
+
+# Optional read replica (SQLite file path, or Postgres host) used by
+# catalog and reporting views; see diet_planner.routers. Clients that
+# write are pinned to the primary for DB_REPLICA_PIN_SECONDS.
+DB_REPLICA = os.environ.get('DB_REPLICA', '')
+DB_REPLICA_PIN_SECONDS = int(os.environ.get('DB_REPLICA_PIN_SECONDS', 5))
+if DB_REPLICA:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST' if DB_ENGINE == 'postgres' else 'NAME': DB_REPLICA,
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['diet_planner.routers.ReplicaRouter']
+
+
+# Cache backend shared by the app's namespaced caches (see
+# diet_planner.cache). "locmem" is per process; "file" and "redis" are
+# shared between workers. CACHE_LOCATION overrides the backend's default
+# location (directory for "file", URL for "redis").
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'locmem')
+CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'diet-planner'),
+    'file': (
+        'django.core.cache.backends.filebased.FileBasedCache',
+        os.path.join(tempfile.gettempdir(), 'diet_planner_cache'),
+    ),
+    'redis': ('django.core.cache.backends.redis.RedisCache', 'redis://127.0.0.1:6379/0'),
+}
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND][0],
+        'LOCATION': os.environ.get('CACHE_LOCATION', CACHE_BACKENDS[CACHE_BACKEND][1]),
+        'KEY_PREFIX': os.environ.get('CACHE_KEY_PREFIX', 'diet_planner'),
+        'TIMEOUT': int(os.environ.get('CACHE_TIMEOUT', 300)),
+        **({} if CACHE_BACKEND == 'redis' else {
+            'OPTIONS': {'MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRIES', 10000))},
+        }),
     }
 }
 
+# Seconds that {% cachefragment %}/{% userfragment %} page chrome stays
+# cached (see diet_planner.templatetags.fragments); 0 disables it.
+FRAGMENT_CACHE_TIMEOUT = int(os.environ.get('FRAGMENT_CACHE_TIMEOUT', 0 if DEBUG else 60 * 60))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -127,16 +253,6 @@ LOGOUT_REDIRECT_URL = 'accounts:login'
 CRISPY_ALLOWED_TEMPLATE_PACKS = 'bootstrap5'
 CRISPY_TEMPLATE_PACK = 'bootstrap5'
 
-# Load .env file if it exists
-env_path = BASE_DIR / '.env'
-if env_path.exists():
-    with open(env_path) as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith('#') and '=' in line:
-                key, value = line.split('=', 1)
-                os.environ.setdefault(key.strip(), value.strip())
-
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = os.environ.get('EMAIL_HOST', 'smtp.gmail.com')
 EMAIL_PORT = int(os.environ.get('EMAIL_PORT', 587))
@@ -147,6 +263,26 @@ EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
 # If not set in env, use EMAIL_HOST_USER as fallback
 DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL') or EMAIL_HOST_USER or 'noreply@dietplanner.com'
 
+# Minutes a cart item holds its stock before other shoppers can claim it.
+# 0 disables reservations (stock is only checked at checkout).
+CART_RESERVATION_MINUTES = int(os.environ.get('CART_RESERVATION_MINUTES', 0))
+
+# Where shopping carts are kept: "database" (Cart/CartItem rows, kept
+# across sessions and devices, guest carts merged on login) or "session".
+CART_STORAGE = os.environ.get('CART_STORAGE', 'database')
+
+# Share generated meal picks between profiles with near-identical inputs
+# (see diet_plans.plan_cache).
+DIET_PLAN_BUCKET_CACHE = os.environ.get('DIET_PLAN_BUCKET_CACHE', 'true').lower() in ('1', 'true', 'yes')
+
+# Session storage. Every cart click rewrites the session, so the default
+# "cached_db" serves reads from the cache and only writes through to the
+# database; "signed_cookies" keeps the (small) session in the browser and
+# never touches the database; "db" is Django's plain database backend.
+# Expired database sessions are removed by the sweep_sessions command.
+SESSION_BACKEND = os.environ.get('SESSION_BACKEND', 'cached_db')
+SESSION_ENGINE = f'django.contrib.sessions.backends.{SESSION_BACKEND}'
+
 
 CSRF_TRUSTED_ORIGINS = [
     "https://b9cd0a238dd34aabb9c5f622e3681d61.vfs.cloud9.us-east-1.amazonaws.com",
@@ -0,0 +1,77 @@
+"""
+Template pre-warming.
+
+The cached template loader compiles each template once per process, on
+first use. warm_templates() compiles every project template up front
+(called from wsgi.py when TEMPLATE_PREWARM is on, and by the
+warm_templates command), so no request pays for parsing.
+"""
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.template import TemplateSyntaxError, engines
+from django.template.autoreload import get_template_directories
+from django.template.base import VariableDoesNotExist
+from django.urls import NoReverseMatch
+
+TEMPLATE_SUFFIXES = ('.html', '.txt')
+# Errors from rendering a template without the context its view supplies
+RENDER_ERRORS = (NoReverseMatch, VariableDoesNotExist, AttributeError, KeyError, TypeError, ValueError)
+
+
+def project_template_names(include_packages=False):
+    """
+    List the names of templates found in the template directories.
+
+    Args:
+        include_packages: Also include templates shipped by installed
+            third-party packages (outside BASE_DIR)
+
+    Returns:
+        list: Sorted template names, relative to their directory
+    """
+    names = set()
+    for directory in get_template_directories():
+        if not include_packages and not directory.is_relative_to(settings.BASE_DIR):
+            continue
+        for path in Path(directory).rglob('*'):
+            if path.suffix in TEMPLATE_SUFFIXES and path.is_file():
+                names.add(path.relative_to(directory).as_posix())
+    return sorted(names)
+
+
+def warm_templates(names=None, render=False):
+    """
+    Compile templates into the cached loader and time them.
+
+    Args:
+        names: Template names (defaults to project_template_names())
+        render: Also time a render with an empty context
+
+    Returns:
+        list: (name, compile_ms, render_ms, error) tuples; render_ms is None
+        when not rendered or the template needs its view's context, and
+        error is the message for templates that failed to compile
+    """
+    engine = engines['django']
+    results = []
+    for name in names if names is not None else project_template_names():
+        started = time.perf_counter()
+        try:
+            template = engine.get_template(name)
+        except TemplateSyntaxError as e:
+            results.append((name, None, None, str(e)))
+            continue
+        compile_ms = (time.perf_counter() - started) * 1000
+
+        render_ms = None
+        if render:
+            started = time.perf_counter()
+            try:
+                template.render({})
+                render_ms = (time.perf_counter() - started) * 1000
+            except RENDER_ERRORS:
+                pass
+        results.append((name, compile_ms, render_ms, None))
+    return results
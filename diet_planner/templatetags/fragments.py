@@ -0,0 +1,104 @@
+"""
+Fragment caching for shared page chrome.
+
+{% cachefragment "name" vary... %}...{% endcachefragment %} caches the
+rendered body in the "dashboard" cache namespace, keyed by the name and
+the vary values, e.g. {% cachefragment "nav-links" user|role %} renders
+the navigation once per role. {% userfragment %} works the same but
+also varies on the signed-in user's id and the cart version, so
+per-user chrome such as the account menu and cart badge is re-rendered
+only when the user or their cart changes.
+
+Never put request-specific output (CSRF tokens, messages) inside a
+fragment. FRAGMENT_CACHE_TIMEOUT bounds how long fragments live (0
+disables them); "manage.py invalidate_cache dashboard" drops them all,
+e.g. after changing the templates they come from.
+"""
+import hashlib
+
+from django import template
+from django.conf import settings
+
+from diet_planner.cache import namespace
+
+register = template.Library()
+
+
+@register.filter
+def role(user):
+    """
+    Get the navigation role of a user.
+
+    Returns:
+        str: "staff", "customer" or "anonymous"
+    """
+    if not user.is_authenticated:
+        return 'anonymous'
+    return 'staff' if user.is_staff else 'customer'
+
+
+class FragmentNode(template.Node):
+    """
+    Render a block once per vary key and serve it from the cache after.
+    """
+    def __init__(self, nodelist, name, vary_on, per_user):
+        self.nodelist = nodelist
+        self.name = name
+        self.vary_on = vary_on
+        self.per_user = per_user
+
+    def cache_key(self, context):
+        vary = [str(var.resolve(context)) for var in self.vary_on]
+        if self.per_user:
+            vary.append(str(getattr(context.get('user'), 'pk', None)))
+            vary.append(str(context.get('cart_version', '')))
+        digest = hashlib.md5('\x1f'.join(vary).encode(), usedforsecurity=False).hexdigest()
+        return f'fragment:{self.name.resolve(context)}:{digest}'
+
+    def render(self, context):
+        timeout = settings.FRAGMENT_CACHE_TIMEOUT
+        if not timeout:
+            return self.nodelist.render(context)
+        cache = namespace('dashboard')
+        key = self.cache_key(context)
+        content = cache.get(key)
+        if content is None:
+            content = self.nodelist.render(context)
+            cache.set(key, content, timeout=timeout)
+        return content
+
+
+def _parse_fragment(parser, token, per_user):
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' tag requires a fragment name.")
+    nodelist = parser.parse((f'end{bits[0]}',))
+    parser.delete_first_token()
+    return FragmentNode(
+        nodelist,
+        parser.compile_filter(bits[1]),
+        [parser.compile_filter(bit) for bit in bits[2:]],
+        per_user,
+    )
+
+
+@register.tag
+def cachefragment(parser, token):
+    """
+    Cache a template fragment, varying on the given values.
+
+    Usage: {% cachefragment "name" [vary ...] %}...{% endcachefragment %}
+    """
+    return _parse_fragment(parser, token, per_user=False)
+
+
+@register.tag
+def userfragment(parser, token):
+    """
+    Cache a per-user template fragment.
+
+    Varies on the user id and cart version in addition to the given values.
+
+    Usage: {% userfragment "name" [vary ...] %}...{% enduserfragment %}
+    """
+    return _parse_fragment(parser, token, per_user=True)
@@ -30,6 +30,8 @@ urlpatterns = [
     path('accounts/', include('accounts.urls')),
     path('products/', include('products.urls')),
     path('orders/', include('orders.urls')),
+    path('diet-plans/', include('diet_plans.urls')),
+    path('progress/', include('progress.urls')),
 ]
 
 if settings.DEBUG:
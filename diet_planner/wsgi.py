@@ -14,3 +14,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'diet_planner.settings')
 
 application = get_wsgi_application()
+
+from django.conf import settings  # noqa: E402  pylint: disable=wrong-import-position
+
+if settings.TEMPLATE_PREWARM:
+    from diet_planner.template_warmup import warm_templates  # noqa: E402
+    warm_templates()
@@ -1,10 +1,24 @@
 from django.contrib import admin
-from .models import DietPlan
+from .models import DietPlan, Food, MealTemplate
 
 
 @admin.register(DietPlan)
 class DietPlanAdmin(admin.ModelAdmin):
-    list_display = ['user', 'goal_type', 'daily_calories', 'created_at']
+    list_display = ['user', 'goal_type', 'daily_calories', 'template', 'created_at']
     list_filter = ['goal_type', 'created_at']
     search_fields = ['user__username', 'user__email']
     readonly_fields = ['created_at', 'updated_at']
+
+
+@admin.register(MealTemplate)
+class MealTemplateAdmin(admin.ModelAdmin):
+    list_display = ['goal_type', 'version', 'is_active', 'updated_at']
+    list_filter = ['goal_type', 'is_active']
+    readonly_fields = ['created_at', 'updated_at']
+
+
+@admin.register(Food)
+class FoodAdmin(admin.ModelAdmin):
+    list_display = ['name', 'meal_type', 'calories', 'protein_g', 'carbs_g', 'fat_g', 'is_active']
+    list_filter = ['meal_type', 'is_active']
+    search_fields = ['name']
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class DietPlansConfig(AppConfig):
     name = 'diet_plans'
+
+    def ready(self):
+        import diet_plans.signals  # pylint: disable=unused-import
@@ -0,0 +1,296 @@
+"""
+Batch diet plan generation.
+
+Regenerates plans for many profiles at once: profiles are loaded in
+keyset-paginated chunks into NumPy arrays, BMR/TDEE/goal calories are
+computed vectorized with the same formulas as DietPlanGenerator, and plans
+are upserted with one bulk statement per chunk.
+"""
+import numpy as np
+from django.db.models import F, OuterRef, Q, Subquery
+from django.db.models.functions import Abs
+
+from accounts.models import Profile
+
+from .catalog import active_template
+from .models import DietPlan
+from .optimizer import optimize_meals_batch
+from .services import (
+    ACTIVITY_MULTIPLIERS,
+    GOAL_CALORIE_ADJUSTMENTS,
+    plan_fingerprint,
+)
+
+DEFAULT_CHUNK_SIZE = 5000
+
+PROFILE_FIELDS = (
+    'pk', 'user_id', 'age', 'height', 'current_weight',
+    'gender', 'activity_level', 'fitness_goal',
+)
+
+
+def round_2dp(values):
+    """
+    Round an array to 2 decimals exactly like Python's round(value, 2).
+
+    np.round scales by 100 before rounding, which can differ from Python's
+    correctly rounded result on near-halfway values; those few elements are
+    re-rounded in Python so batch output matches DietPlanGenerator.
+
+    Args:
+        values: Float array
+
+    Returns:
+        ndarray: Rounded copy of ``values``
+    """
+    rounded = np.round(values, 2)
+    scaled = values * 100
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for index in np.flatnonzero(near_tie):
+        rounded[index] = round(float(values[index]), 2)
+    return rounded
+
+
+def calculate_daily_calories(age, height, weight, gender, *, activity_level, goal):
+    """
+    Compute daily calorie targets for arrays of profile attributes.
+
+    Mirrors DietPlanGenerator.calculate_bmr, calculate_tdee and
+    adjust_calories_for_goal, including treating zero or missing
+    age/height/weight/gender as incomplete.
+
+    Args:
+        age: Array of ages (NaN when missing)
+        height: Array of heights in cm (NaN when missing)
+        weight: Array of weights in kg (NaN when missing)
+        gender: Array of gender strings
+        activity_level: Array of activity level strings
+        goal: Array of fitness goal strings
+
+    Returns:
+        tuple: (daily_calories int array, valid bool array)
+    """
+    male = gender == 'male'
+    bmr = np.where(
+        male,
+        88.362 + 13.397 * weight + 4.799 * height - 5.677 * age,
+        447.593 + 9.247 * weight + 3.098 * height - 4.330 * age,
+    )
+    bmr = round_2dp(bmr)
+
+    multipliers = np.array(
+        [ACTIVITY_MULTIPLIERS.get(level, 1.2) for level in activity_level],
+        dtype=float,
+    )
+    tdee = round_2dp(bmr * multipliers)
+
+    adjustments = np.array(
+        [GOAL_CALORIE_ADJUSTMENTS.get(value, 0) for value in goal],
+        dtype=float,
+    )
+
+    valid = (
+        np.nan_to_num(age) != 0
+    ) & (
+        np.nan_to_num(height) != 0
+    ) & (
+        np.nan_to_num(weight) != 0
+    ) & (gender != '') & (goal != '') & (np.nan_to_num(bmr) != 0)
+
+    daily_calories = np.trunc(np.nan_to_num(tdee) + adjustments).astype(np.int64)
+    return daily_calories, valid
+
+
+def add_chunk_size_argument(parser):
+    """Add the --chunk-size option shared by the batch regeneration commands."""
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f'Profiles loaded and written per batch (default: {DEFAULT_CHUNK_SIZE}).',
+    )
+
+
+def drifted_profiles(since, threshold):
+    """
+    Find profiles whose weight moved away from their plan's weight.
+
+    Only profiles updated at or after ``since`` are considered (a range
+    scan on the Profile.updated_at index, skipped when ``since`` is
+    None); for those, the current plan's
+    source_weight is joined in with a correlated subquery and compared in
+    SQL. Plans without a recorded source weight count as drifted.
+
+    Args:
+        since: Datetime lower bound for Profile.updated_at, or None for all
+        threshold: Minimum absolute weight change in kg
+
+    Returns:
+        QuerySet: Profiles whose plans should be regenerated
+    """
+    plan_weight = DietPlan.objects.filter(
+        user_id=OuterRef('user_id'),
+        goal_type=OuterRef('fitness_goal'),
+    ).values('source_weight')[:1]
+    profiles = Profile.objects.filter(current_weight__isnull=False)
+    if since is not None:
+        profiles = profiles.filter(updated_at__gte=since)
+    return profiles.exclude(fitness_goal='').annotate(
+        plan_weight=Subquery(plan_weight),
+    ).annotate(
+        drift=Abs(F('current_weight') - F('plan_weight')),
+    ).filter(Q(plan_weight__isnull=True) | Q(drift__gte=threshold))
+
+
+class BatchDietPlanGenerator:
+    """
+    Regenerate diet plans for many profiles with vectorized calculations.
+
+    Meals are built once per distinct (calories, goal) pair in a chunk,
+    with the optimizer solving each calorie bucket once. Plans whose
+    stored fingerprint and template already match are skipped, and the
+    rest are written with a single bulk upsert per chunk.
+    """
+    def __init__(self, chunk_size=DEFAULT_CHUNK_SIZE, force=False):
+        """
+        Initialize the batch generator.
+
+        Args:
+            chunk_size: Number of profiles loaded and written per round trip
+            force: Rewrite plans even when their fingerprint is unchanged
+        """
+        self.chunk_size = chunk_size
+        self.force = force
+
+    def _load_chunk(self, queryset, after_pk):
+        return list(
+            queryset.filter(pk__gt=after_pk).order_by('pk').values_list(
+                *PROFILE_FIELDS
+            )[:self.chunk_size]
+        )
+
+    def build_plans(self, rows):
+        """
+        Build unsaved DietPlan instances for a chunk of profile rows.
+
+        Args:
+            rows: List of tuples ordered like PROFILE_FIELDS
+
+        Returns:
+            list: DietPlan instances for profiles with complete data
+        """
+        columns = list(zip(*rows))
+
+        def numeric(values):
+            return np.array(
+                [np.nan if value is None else value for value in values],
+                dtype=float,
+            )
+
+        goals = np.array(columns[7], dtype=object)
+        daily_calories, valid = calculate_daily_calories(
+            age=numeric(columns[2]),
+            height=numeric(columns[3]),
+            weight=numeric(columns[4]),
+            gender=np.array(columns[5], dtype=object),
+            activity_level=columns[6],
+            goal=goals,
+        )
+
+        fingerprints = [
+            plan_fingerprint(age, height, weight, gender, activity_level=activity_level, goal=goal)
+            for age, height, weight, gender, activity_level, goal in (row[2:8] for row in rows)
+        ]
+        stored = {}
+        if not self.force:
+            stored = {
+                (user_id, goal_type): (fingerprint, template_id)
+                for user_id, goal_type, fingerprint, template_id in DietPlan.objects.filter(
+                    user_id__in=columns[1]
+                ).values_list('user_id', 'goal_type', 'input_fingerprint', 'template_id')
+            }
+
+        pending = []
+        for index in np.flatnonzero(valid):
+            goal_type = goals[index]
+            template = active_template(goal_type)
+            if template is None:
+                continue
+            if stored.get((columns[1][index], goal_type)) == (fingerprints[index], template.pk):
+                continue
+            pending.append((index, template))
+
+        meals = {}
+        for goal_type in {goals[index] for index, _ in pending}:
+            meals[goal_type] = optimize_meals_batch(
+                active_template(goal_type),
+                goal_type,
+                [int(daily_calories[index]) for index, _ in pending if goals[index] == goal_type],
+            )
+
+        plans = []
+        for index, template in pending:
+            goal_type = goals[index]
+            calories = int(daily_calories[index])
+            plans.append(DietPlan(
+                user_id=columns[1][index],
+                goal_type=goal_type,
+                daily_calories=calories,
+                template=template,
+                meals=meals[goal_type][calories],
+                source_weight=rows[index][4],
+                input_fingerprint=fingerprints[index],
+            ))
+        return plans
+
+    def save_plans(self, plans):
+        """
+        Insert or update plans with a single upsert statement per batch.
+
+        Args:
+            plans: List of unsaved DietPlan instances
+        """
+        DietPlan.objects.bulk_create(
+            plans,
+            update_conflicts=True,
+            unique_fields=['user', 'goal_type'],
+            update_fields=[
+                'daily_calories', 'template', 'meals', 'source_weight',
+                'input_fingerprint', 'updated_at',
+            ],
+            batch_size=1000,
+        )
+
+    def run(self, queryset=None, progress=None):
+        """
+        Regenerate plans for every profile in ``queryset``.
+
+        Args:
+            queryset: Profile queryset (defaults to profiles with a goal)
+            progress: Optional callable(processed, written, total) per chunk
+
+        Returns:
+            tuple: (profiles processed, plans written)
+        """
+        if queryset is None:
+            queryset = Profile.objects.exclude(fitness_goal='')
+        total = queryset.count()
+        processed = written = 0
+        last_pk = 0
+
+        while True:
+            rows = self._load_chunk(queryset, last_pk)
+            if not rows:
+                break
+            last_pk = rows[-1][0]
+
+            plans = self.build_plans(rows)
+            if plans:
+                self.save_plans(plans)
+
+            processed += len(rows)
+            written += len(plans)
+            if progress is not None:
+                progress(processed, written, total)
+
+        return processed, written
@@ -0,0 +1,174 @@
+"""
+In-process meal template and food catalog.
+
+Templates and foods are loaded with one query each the first time they
+are needed and kept for the life of the process, so rendering or
+generating plans never rebuilds food lists. Saving a template or food
+clears the catalog in the current process; other processes pick the
+change up after CATALOG_TTL_SECONDS. ``catalog_version()`` changes on
+every reload so callers can key their own caches on it, and
+``catalog_stamp()`` identifies the catalog contents across processes.
+"""
+import hashlib
+import threading
+import time
+
+from .models import Food, MealTemplate
+
+CATALOG_TTL_SECONDS = 300
+
+_lock = threading.Lock()
+_catalog = {
+    'loaded_at': None,
+    'version': 0,
+    'stamp': '',
+    'templates': {},
+    'active': {},
+    'foods': {},
+    'foods_by_meal': {},
+}
+
+
+def _load():
+    templates = {template.pk: template for template in MealTemplate.objects.all()}
+    active = {}
+    for template in sorted(templates.values(), key=lambda item: item.version):
+        if template.is_active:
+            active[template.goal_type] = template
+
+    foods = {food.pk: food for food in Food.objects.all()}
+    foods_by_meal = {}
+    for food in foods.values():
+        if food.is_active:
+            foods_by_meal.setdefault(food.meal_type, []).append(food)
+
+    rows = sorted(
+        [('template', item.pk, item.updated_at.isoformat()) for item in templates.values()]
+        + [('food', item.pk, item.updated_at.isoformat()) for item in foods.values()]
+    )
+    _catalog.update(
+        loaded_at=time.monotonic(),
+        version=_catalog['version'] + 1,
+        stamp=hashlib.sha256(repr(rows).encode()).hexdigest()[:12],
+        templates=templates,
+        active=active,
+        foods=foods,
+        foods_by_meal=foods_by_meal,
+    )
+
+
+def _ensure_loaded(force=False):
+    loaded_at = _catalog['loaded_at']
+    expired = loaded_at is None or time.monotonic() - loaded_at > CATALOG_TTL_SECONDS
+    if force or expired:
+        with _lock:
+            _load()
+
+
+def get_template(pk):
+    """
+    Look up a template by primary key.
+
+    Args:
+        pk: MealTemplate primary key
+
+    Returns:
+        MealTemplate: Cached template instance
+
+    Raises:
+        MealTemplate.DoesNotExist: If no such template exists
+    """
+    _ensure_loaded()
+    if pk not in _catalog['templates']:
+        # Created by another process since the catalog was loaded
+        _ensure_loaded(force=True)
+    try:
+        return _catalog['templates'][pk]
+    except KeyError as exc:
+        raise MealTemplate.DoesNotExist(f'MealTemplate {pk} does not exist') from exc
+
+
+def active_template(goal_type):
+    """
+    Return the highest active template version for a goal.
+
+    Args:
+        goal_type: 'weight_loss' or 'weight_gain'
+
+    Returns:
+        MealTemplate or None: Template used for new plans
+    """
+    _ensure_loaded()
+    return _catalog['active'].get(goal_type)
+
+
+def food_catalog():
+    """
+    Return every food, including inactive ones still referenced by plans.
+
+    Returns:
+        dict: Food primary key -> Food
+    """
+    _ensure_loaded()
+    return _catalog['foods']
+
+
+def render_plan(plan):
+    """
+    Build a diet plan's full meal structure for display.
+
+    Combines the per-user calorie targets stored on the plan with the
+    food suggestions of its template from the in-process catalog. Plans
+    saved before templates existed hold a full copy in ``meals``.
+
+    Args:
+        plan: DietPlan instance
+
+    Returns:
+        list: Dicts with key, name, calories and foods per meal
+    """
+    if plan.template_id is None:
+        return [dict(meal, key=key) for key, meal in plan.meals.items()]
+    return get_template(plan.template_id).render(plan.meals, food_catalog())
+
+
+def foods_for_meal(meal_type):
+    """
+    Return the active foods that can be picked for a meal.
+
+    Args:
+        meal_type: Meal key such as 'breakfast'
+
+    Returns:
+        list: Food instances
+    """
+    _ensure_loaded()
+    return _catalog['foods_by_meal'].get(meal_type, [])
+
+
+def catalog_version():
+    """
+    Identify the currently loaded catalog contents.
+
+    Returns:
+        int: Number that changes whenever the catalog is reloaded
+    """
+    _ensure_loaded()
+    return _catalog['version']
+
+
+def catalog_stamp():
+    """
+    Identify the catalog contents independently of the process.
+
+    Returns:
+        str: Short hash of every template and food id and update time
+    """
+    _ensure_loaded()
+    return _catalog['stamp']
+
+
+def clear_catalog():
+    """Drop the cached templates and foods so the next lookup reloads them."""
+    with _lock:
+        _catalog.update(loaded_at=None, templates={}, active={}, foods={}, foods_by_meal={})
@@ -0,0 +1,169 @@
+"""
+Management command to benchmark the meal optimizer.
+
+Measures cold per-user plan latency (memo cleared before every user) and
+batch throughput over synthetic calorie targets, and reports how closely
+the picked foods match each meal's calorie target. With --burst it also
+replays a signup burst of synthetic profiles with and without the
+bucketed plan cache. Nothing is written to the database.
+"""
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from accounts.models import Profile
+from diet_plans.catalog import active_template, food_catalog
+from diet_plans.models import DietPlan
+from diet_plans.optimizer import (
+    clear_optimizer_cache,
+    optimize_meals,
+    optimize_meals_batch,
+    optimizer_cache_info,
+)
+from diet_plans.plan_cache import plan_cache
+from diet_plans.services import DietPlanGenerator
+
+TARGET_MS = 50
+
+
+class Command(BaseCommand):
+    help = 'Benchmark meal optimizer latency and accuracy on synthetic users.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--users',
+            type=int,
+            default=1000,
+            help='Synthetic users for the batch run (default: 1000).',
+        )
+        parser.add_argument(
+            '--cold-users',
+            type=int,
+            default=100,
+            help='Users timed individually with an empty memo (default: 100).',
+        )
+        parser.add_argument(
+            '--burst',
+            type=int,
+            default=0,
+            help='Synthetic signups to replay against the bucket cache (default: off).',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Random seed for the synthetic calorie targets.',
+        )
+
+    def _calorie_error(self, meals):
+        foods = food_catalog()
+        errors = []
+        for meal in meals.values():
+            if not meal.get('foods') or not meal['calories']:
+                continue
+            picked = sum(foods[pk].calories * servings for pk, servings in meal['foods'])
+            errors.append(abs(picked - meal['calories']) / meal['calories'])
+        return errors
+
+    def _synthetic_profiles(self, rng, count):
+        goals = [value for value, _ in Profile.GOAL_CHOICES]
+        activity_levels = [value for value, _ in Profile.ACTIVITY_LEVELS]
+        return [
+            Profile(
+                gender=rng.choice(['male', 'female']),
+                age=rng.randint(18, 65),
+                height=rng.randint(155, 195),
+                current_weight=rng.randint(100, 240) / 2,
+                activity_level=rng.choice(activity_levels),
+                fitness_goal=rng.choice(goals),
+            )
+            for _ in range(count)
+        ]
+
+    def _replay_burst(self, profiles, enabled):
+        clear_optimizer_cache()
+        plan_cache.clear()
+        started = time.perf_counter()
+        with override_settings(DIET_PLAN_BUCKET_CACHE=enabled):
+            for profile in profiles:
+                generator = DietPlanGenerator(profile)
+                calories = generator.adjust_calories_for_goal(
+                    generator.calculate_tdee(generator.calculate_bmr()),
+                    profile.fitness_goal,
+                )
+                generator.generate_meal_plan(calories, profile.fitness_goal)
+        return (time.perf_counter() - started) * 1000
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        goals = [value for value, _ in DietPlan.GOAL_CHOICES]
+        templates = {goal: active_template(goal) for goal in goals}
+        if not all(templates.values()):
+            self.stderr.write(self.style.ERROR('Every goal needs an active meal template.'))
+            return
+
+        users = [
+            (rng.choice(goals), rng.randint(1200, 4200))
+            for _ in range(options['users'])
+        ]
+
+        timings = []
+        errors = []
+        for goal, calories in users[:options['cold_users']]:
+            clear_optimizer_cache()
+            started = time.perf_counter()
+            meals = optimize_meals(templates[goal].split_calories(calories), goal)
+            timings.append((time.perf_counter() - started) * 1000)
+            errors.extend(self._calorie_error(meals))
+
+        if timings:
+            ordered = sorted(timings)
+            p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+            self.stdout.write(
+                f'Cold per-user: mean {statistics.mean(timings):.1f} ms, '
+                f'p95 {p95:.1f} ms, max {ordered[-1]:.1f} ms '
+                f'over {len(timings)} user(s)'
+            )
+            if errors:
+                self.stdout.write(
+                    f'Meal calorie error: mean {statistics.mean(errors) * 100:.1f}%, '
+                    f'max {max(errors) * 100:.1f}%'
+                )
+
+        clear_optimizer_cache()
+        started = time.perf_counter()
+        for goal in goals:
+            optimize_meals_batch(
+                templates[goal],
+                goal,
+                [calories for user_goal, calories in users if user_goal == goal],
+            )
+        elapsed = (time.perf_counter() - started) * 1000
+        info = optimizer_cache_info()
+        per_user = elapsed / len(users) if users else 0
+        self.stdout.write(
+            f'Batch: {len(users)} user(s) in {elapsed:.0f} ms '
+            f'({per_user:.2f} ms/user, {info.misses} bucket solve(s), {info.hits} memo hit(s))'
+        )
+
+        if options['burst']:
+            profiles = self._synthetic_profiles(rng, options['burst'])
+            uncached = self._replay_burst(profiles, enabled=False)
+            cached = self._replay_burst(profiles, enabled=True)
+            stats = plan_cache.stats()
+            self.stdout.write(
+                f'Signup burst of {len(profiles)}: {uncached:.0f} ms without bucket cache, '
+                f'{cached:.0f} ms with it (hit rate {stats["hit_rate"] * 100:.1f}%, '
+                f'{stats["misses"]} bucket(s) computed)'
+            )
+
+        worst = max(timings, default=0)
+        if worst < TARGET_MS:
+            self.stdout.write(self.style.SUCCESS(f'All cold plans under {TARGET_MS} ms.'))
+        else:
+            self.stdout.write(self.style.WARNING(
+                f'Slowest cold plan took {worst:.1f} ms (target {TARGET_MS} ms).'
+            ))
@@ -0,0 +1,36 @@
+"""
+Management command to report diet plan bucket cache hit rates.
+
+Counters are aggregated across processes through the shared cache, so
+this works from any shell as long as CACHES points at a shared backend.
+"""
+from django.core.management.base import BaseCommand
+
+from diet_plans.plan_cache import bucket_cache_enabled, plan_cache
+
+
+class Command(BaseCommand):
+    help = 'Show hit-rate statistics for the bucketed diet plan cache.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Reset the shared counters after reporting them.',
+        )
+
+    def handle(self, *args, **options):
+        if not bucket_cache_enabled():
+            self.stdout.write(self.style.WARNING('DIET_PLAN_BUCKET_CACHE is disabled.'))
+
+        stats = plan_cache.stats(shared=True)
+        self.stdout.write(
+            f"Lookups: {stats['lookups']} "
+            f"(local hits {stats['local_hits']}, shared hits {stats['shared_hits']}, "
+            f"misses {stats['misses']})"
+        )
+        self.stdout.write(f"Hit rate: {stats['hit_rate'] * 100:.1f}%")
+
+        if options['reset']:
+            plan_cache.clear(shared_stats=True)
+            self.stdout.write(self.style.SUCCESS('Counters reset.'))
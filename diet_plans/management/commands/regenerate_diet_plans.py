@@ -0,0 +1,55 @@
+"""
+Management command to regenerate diet plans for all profiles.
+
+Run after changing calorie formulas or meal templates (bump PLAN_VERSION
+or pass --force). Profiles are processed in chunks with vectorized
+calculations and bulk upserts; plans with unchanged inputs are skipped.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.models import Profile
+from diet_plans.batch import BatchDietPlanGenerator, add_chunk_size_argument
+
+
+class Command(BaseCommand):
+    help = 'Regenerate diet plans for every profile with a fitness goal.'
+
+    def add_arguments(self, parser):
+        add_chunk_size_argument(parser)
+        parser.add_argument(
+            '--goal',
+            choices=[value for value, _ in Profile.GOAL_CHOICES],
+            help='Only regenerate plans for profiles with this goal.',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Rewrite plans even if their inputs are unchanged.',
+        )
+
+    def handle(self, *args, **options):
+        queryset = Profile.objects.exclude(fitness_goal='')
+        if options['goal']:
+            queryset = queryset.filter(fitness_goal=options['goal'])
+
+        started = time.monotonic()
+
+        def report(processed, written, total):
+            elapsed = time.monotonic() - started
+            rate = processed / elapsed if elapsed else 0
+            self.stdout.write(
+                f'{processed}/{total} profiles processed, {written} plans written '
+                f'({rate:.0f} profiles/s)'
+            )
+
+        generator = BatchDietPlanGenerator(
+            chunk_size=options['chunk_size'],
+            force=options['force'],
+        )
+        processed, written = generator.run(queryset, progress=report)
+        self.stdout.write(self.style.SUCCESS(
+            f'Done: {written} plan(s) regenerated from {processed} profile(s) '
+            f'in {time.monotonic() - started:.1f}s.'
+        ))
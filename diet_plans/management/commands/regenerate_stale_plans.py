@@ -0,0 +1,71 @@
+"""
+Management command to regenerate plans whose profile weight has drifted.
+
+Meant to run on a schedule (e.g. hourly cron). Only profiles updated
+since the last successful run started are scanned, using the
+Profile.updated_at index, so a missed or failed run is caught up by the
+next one; the first run scans every profile. Profiles whose weight moved
+at least --threshold kg from the weight their plan was built with are
+regenerated, in batch.
+"""
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from diet_plans.batch import BatchDietPlanGenerator, add_chunk_size_argument, drifted_profiles
+from diet_plans.models import StalePlanScan
+
+DEFAULT_THRESHOLD_KG = 1.0
+
+
+class Command(BaseCommand):
+    help = 'Regenerate diet plans for profiles whose weight drifted past a threshold.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--since-hours',
+            type=float,
+            help='Scan profiles updated within this many hours instead of since the last run.',
+        )
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=DEFAULT_THRESHOLD_KG,
+            help=f'Weight change in kg that makes a plan stale (default: {DEFAULT_THRESHOLD_KG}).',
+        )
+        add_chunk_size_argument(parser)
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many plans are stale.',
+        )
+
+    def handle(self, *args, **options):
+        # Taken before scanning so profiles updated during the run are
+        # picked up by the next one
+        scan_started = timezone.now()
+        if options['since_hours'] is not None:
+            since = scan_started - timedelta(hours=options['since_hours'])
+        else:
+            since = StalePlanScan.objects.values_list('started_at', flat=True).first()
+        queryset = drifted_profiles(since, options['threshold'])
+        window = f'since {since:%Y-%m-%d %H:%M}' if since else 'across all profiles'
+
+        if options['dry_run']:
+            self.stdout.write(f"{queryset.count()} plan(s) drifted by at least {options['threshold']} kg {window}.")
+            return
+
+        started = time.monotonic()
+        generator = BatchDietPlanGenerator(chunk_size=options['chunk_size'], force=True)
+        processed, written = generator.run(queryset)
+        if options['since_hours'] is None:
+            # A narrower manual window must not move the scheduled one forward
+            StalePlanScan.objects.create(started_at=scan_started, plans_regenerated=written)
+            # Only the latest scan is needed to pick the next window
+            StalePlanScan.objects.filter(started_at__lt=scan_started).delete()
+        self.stdout.write(self.style.SUCCESS(
+            f'Done: {written} stale plan(s) regenerated from {processed} drifted '
+            f'profile(s) {window} in {time.monotonic() - started:.1f}s.'
+        ))
@@ -0,0 +1,35 @@
+# Generated by Django 6.0 on 2026-10-19 12:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def remove_duplicate_plans(apps, schema_editor):
+    """Keep only the most recently updated plan per (user, goal_type)."""
+    DietPlan = apps.get_model('diet_plans', 'DietPlan')
+    seen = set()
+    duplicates = []
+    plans = DietPlan.objects.order_by('user_id', 'goal_type', '-updated_at', '-pk')
+    for pk, user_id, goal_type in plans.values_list('pk', 'user_id', 'goal_type').iterator():
+        key = (user_id, goal_type)
+        if key in seen:
+            duplicates.append(pk)
+        else:
+            seen.add(key)
+    DietPlan.objects.filter(pk__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('diet_plans', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_plans, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='dietplan',
+            constraint=models.UniqueConstraint(fields=('user', 'goal_type'), name='unique_diet_plan_per_goal'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-19 13:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('diet_plans', '0002_unique_plan_per_goal'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dietplan',
+            name='input_fingerprint',
+            field=models.CharField(blank=True, help_text='Hash of the profile inputs this plan was generated from', max_length=64),
+        ),
+    ]
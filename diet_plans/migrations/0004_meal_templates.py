@@ -0,0 +1,150 @@
+# Generated by Django 6.0 on 2026-10-19 12:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+MEAL_SHARES = [
+    ('breakfast', 'Breakfast', 0.25),
+    ('lunch', 'Lunch', 0.35),
+    ('dinner', 'Dinner', 0.30),
+    ('snacks', 'Snacks', 0.10),
+]
+
+INITIAL_FOODS = {
+    'weight_loss': {
+        'breakfast': [
+            'Oatmeal with berries (200 cal)',
+            'Greek yogurt with honey (150 cal)',
+            'Whole grain toast with avocado (180 cal)',
+        ],
+        'lunch': [
+            'Grilled chicken salad (350 cal)',
+            'Quinoa bowl with vegetables (320 cal)',
+            'Lentil soup with whole grain bread (380 cal)',
+        ],
+        'dinner': [
+            'Baked salmon with vegetables (400 cal)',
+            'Turkey stir-fry with brown rice (420 cal)',
+            'Vegetable curry with quinoa (380 cal)',
+        ],
+        'snacks': [
+            'Apple with almond butter (120 cal)',
+            'Protein bar (150 cal)',
+            'Mixed nuts (100 cal)',
+        ],
+    },
+    'weight_gain': {
+        'breakfast': [
+            'Protein smoothie with banana (400 cal)',
+            'Eggs with whole grain toast (350 cal)',
+            'Greek yogurt parfait with granola (380 cal)',
+        ],
+        'lunch': [
+            'Chicken and rice bowl (550 cal)',
+            'Pasta with meat sauce (600 cal)',
+            'Burrito bowl with extra protein (580 cal)',
+        ],
+        'dinner': [
+            'Steak with sweet potato (650 cal)',
+            'Salmon with rice and vegetables (620 cal)',
+            'Chicken curry with naan (600 cal)',
+        ],
+        'snacks': [
+            'Protein shake (250 cal)',
+            'Trail mix (200 cal)',
+            'Peanut butter sandwich (280 cal)',
+        ],
+    },
+}
+
+
+def seed_templates_and_compact_plans(apps, schema_editor):
+    """Create v1 templates from the old hard-coded foods and slim existing plans."""
+    MealTemplate = apps.get_model('diet_plans', 'MealTemplate')
+    DietPlan = apps.get_model('diet_plans', 'DietPlan')
+
+    templates = {}
+    for goal_type, foods in INITIAL_FOODS.items():
+        templates[goal_type], _ = MealTemplate.objects.get_or_create(
+            goal_type=goal_type,
+            version=1,
+            defaults={'meals': [
+                {'key': key, 'name': name, 'share': share, 'foods': foods[key]}
+                for key, name, share in MEAL_SHARES
+            ]},
+        )
+
+    batch = []
+    for plan in DietPlan.objects.filter(template__isnull=True).iterator():
+        template = templates.get(plan.goal_type)
+        if template is None:
+            continue
+        plan.template = template
+        plan.meals = {
+            key: {'calories': meal.get('calories', 0)}
+            for key, meal in plan.meals.items()
+        }
+        batch.append(plan)
+        if len(batch) >= 1000:
+            DietPlan.objects.bulk_update(batch, ['template', 'meals'])
+            batch = []
+    DietPlan.objects.bulk_update(batch, ['template', 'meals'])
+
+
+def expand_plans_from_templates(apps, schema_editor):
+    """Copy names and foods back into plans before the template link is dropped."""
+    DietPlan = apps.get_model('diet_plans', 'DietPlan')
+
+    batch = []
+    for plan in DietPlan.objects.filter(template__isnull=False).select_related('template').iterator():
+        plan.meals = {
+            meal['key']: {
+                'name': meal['name'],
+                'calories': plan.meals[meal['key']].get('calories', 0),
+                'foods': list(meal.get('foods', [])),
+            }
+            for meal in plan.template.meals
+            if meal['key'] in plan.meals
+        }
+        batch.append(plan)
+        if len(batch) >= 1000:
+            DietPlan.objects.bulk_update(batch, ['meals'])
+            batch = []
+    DietPlan.objects.bulk_update(batch, ['meals'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('diet_plans', '0003_dietplan_input_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='dietplan',
+            name='meals',
+            field=models.JSONField(default=dict, help_text='Per-meal calorie targets keyed by template meal'),
+        ),
+        migrations.CreateModel(
+            name='MealTemplate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('goal_type', models.CharField(choices=[('weight_loss', 'Weight Loss'), ('weight_gain', 'Weight Gain')], max_length=20)),
+                ('version', models.PositiveIntegerField(default=1)),
+                ('meals', models.JSONField(default=list)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['goal_type', '-version'],
+                'constraints': [models.UniqueConstraint(fields=('goal_type', 'version'), name='unique_meal_template_version')],
+            },
+        ),
+        migrations.AddField(
+            model_name='dietplan',
+            name='template',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='plans', to='diet_plans.mealtemplate'),
+        ),
+        migrations.RunPython(seed_templates_and_compact_plans, expand_plans_from_templates),
+    ]
@@ -0,0 +1,94 @@
+# Generated by Django 6.0 on 2026-10-19 13:02
+
+from django.db import migrations, models
+
+# (meal_type, name, calories, protein_g, carbs_g, fat_g) per serving
+INITIAL_FOODS = [
+    ('breakfast', 'Oatmeal with berries', 200, 6, 36, 4),
+    ('breakfast', 'Greek yogurt with honey', 150, 15, 18, 2),
+    ('breakfast', 'Whole grain toast with avocado', 180, 5, 20, 9),
+    ('breakfast', 'Scrambled eggs (2 eggs)', 180, 12, 2, 14),
+    ('breakfast', 'Protein smoothie with banana', 300, 25, 40, 5),
+    ('breakfast', 'Whole grain toast with peanut butter', 250, 10, 24, 13),
+    ('breakfast', 'Cottage cheese with pineapple', 160, 14, 16, 4),
+    ('breakfast', 'Granola with milk', 280, 9, 42, 8),
+    ('breakfast', 'Egg white omelette with spinach', 120, 18, 4, 3),
+    ('breakfast', 'Banana', 105, 1, 27, 0),
+    ('lunch', 'Grilled chicken salad', 350, 35, 15, 16),
+    ('lunch', 'Quinoa bowl with vegetables', 320, 11, 52, 8),
+    ('lunch', 'Lentil soup', 230, 16, 36, 2),
+    ('lunch', 'Chicken and rice bowl', 550, 40, 65, 12),
+    ('lunch', 'Turkey wrap', 380, 28, 36, 13),
+    ('lunch', 'Tuna salad sandwich', 420, 28, 38, 16),
+    ('lunch', 'Brown rice (1 cup)', 215, 5, 45, 2),
+    ('lunch', 'Black bean burrito bowl', 480, 20, 72, 12),
+    ('lunch', 'Whole grain bread slice', 80, 4, 14, 1),
+    ('lunch', 'Mixed green side salad', 60, 2, 8, 3),
+    ('dinner', 'Baked salmon fillet', 360, 34, 0, 23),
+    ('dinner', 'Turkey stir-fry', 300, 30, 15, 12),
+    ('dinner', 'Vegetable curry', 280, 8, 36, 12),
+    ('dinner', 'Lean steak', 320, 42, 0, 16),
+    ('dinner', 'Baked sweet potato', 180, 4, 41, 0),
+    ('dinner', 'Jasmine rice (1 cup)', 205, 4, 45, 0),
+    ('dinner', 'Roasted vegetables', 120, 3, 16, 5),
+    ('dinner', 'Grilled chicken breast', 230, 43, 0, 5),
+    ('dinner', 'Whole wheat pasta', 200, 8, 40, 1),
+    ('dinner', 'Tofu stir-fry', 250, 18, 14, 14),
+    ('snacks', 'Apple with almond butter', 200, 4, 25, 9),
+    ('snacks', 'Protein bar', 200, 20, 22, 7),
+    ('snacks', 'Mixed nuts (30 g)', 175, 5, 6, 15),
+    ('snacks', 'Protein shake', 160, 30, 4, 2),
+    ('snacks', 'Trail mix', 200, 5, 20, 12),
+    ('snacks', 'Peanut butter sandwich', 350, 13, 34, 18),
+    ('snacks', 'Rice cakes with hummus', 130, 4, 20, 4),
+    ('snacks', 'Carrot sticks with hummus', 100, 3, 10, 5),
+    ('snacks', 'Hard-boiled eggs (2)', 140, 12, 1, 10),
+    ('snacks', 'Low-fat string cheese', 80, 7, 1, 5),
+]
+
+
+def seed_foods(apps, schema_editor):
+    """Load the starter food table used by the meal optimizer."""
+    Food = apps.get_model('diet_plans', 'Food')
+    existing = set(Food.objects.values_list('name', flat=True))
+    Food.objects.bulk_create([
+        Food(
+            meal_type=meal_type,
+            name=name,
+            calories=calories,
+            protein_g=protein,
+            carbs_g=carbs,
+            fat_g=fat,
+        )
+        for meal_type, name, calories, protein, carbs, fat in INITIAL_FOODS
+        if name not in existing
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('diet_plans', '0004_meal_templates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Food',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('meal_type', models.CharField(choices=[('breakfast', 'Breakfast'), ('lunch', 'Lunch'), ('dinner', 'Dinner'), ('snacks', 'Snacks')], db_index=True, max_length=20)),
+                ('calories', models.IntegerField(help_text='Calories per serving')),
+                ('protein_g', models.FloatField(help_text='Protein per serving in grams')),
+                ('carbs_g', models.FloatField(help_text='Carbohydrates per serving in grams')),
+                ('fat_g', models.FloatField(help_text='Fat per serving in grams')),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['meal_type', 'name'],
+            },
+        ),
+        migrations.RunPython(seed_foods, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-19 13:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('diet_plans', '0005_food'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dietplan',
+            name='week',
+            field=models.JSONField(blank=True, default=dict, help_text='Rotation seed and per-meal alternatives for the weekly plan'),
+        ),
+    ]
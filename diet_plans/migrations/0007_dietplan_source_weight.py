@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-19 13:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('diet_plans', '0006_dietplan_week'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dietplan',
+            name='source_weight',
+            field=models.FloatField(blank=True, help_text='Profile weight in kg when the plan was generated', null=True),
+        ),
+    ]
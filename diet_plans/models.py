@@ -22,12 +22,175 @@ class DietPlan(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='diet_plans')
     goal_type = models.CharField(max_length=20, choices=GOAL_CHOICES)
     daily_calories = models.IntegerField()
-    meals = models.JSONField(default=dict)
+    template = models.ForeignKey(
+        'MealTemplate',
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='plans',
+    )
+    meals = models.JSONField(
+        default=dict,
+        help_text='Per-meal calorie targets keyed by template meal',
+    )
+    week = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text='Rotation seed and per-meal alternatives for the weekly plan',
+    )
+    source_weight = models.FloatField(
+        null=True,
+        blank=True,
+        help_text='Profile weight in kg when the plan was generated',
+    )
+    input_fingerprint = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text='Hash of the profile inputs this plan was generated from',
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'goal_type'], name='unique_diet_plan_per_goal'),
+        ]
 
     def __str__(self):
         return f"{self.user.username}'s {self.goal_type} Plan"
+
+
+class MealTemplate(models.Model):
+    """
+    Versioned food suggestions shared by every plan for a goal.
+
+    ``meals`` is an ordered list of ``{'key', 'name', 'share', 'foods'}``
+    dicts; ``share`` is the fraction of daily calories for that meal.
+    Editing foods is a single write picked up by all plans referencing the
+    template; changing shares should be done as a new active version so
+    plans are regenerated with the new split.
+    """
+    goal_type = models.CharField(max_length=20, choices=DietPlan.GOAL_CHOICES)
+    version = models.PositiveIntegerField(default=1)
+    meals = models.JSONField(default=list)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['goal_type', '-version']
+        constraints = [
+            models.UniqueConstraint(fields=['goal_type', 'version'], name='unique_meal_template_version'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_goal_type_display()} v{self.version}"
+
+    def split_calories(self, daily_calories):
+        """
+        Split a daily calorie target across the template's meals.
+
+        Args:
+            daily_calories: Target daily calorie intake
+
+        Returns:
+            dict: Compact per-meal targets, e.g. {'breakfast': {'calories': 500}}
+        """
+        return {
+            meal['key']: {'calories': int(daily_calories * meal['share'])}
+            for meal in self.meals
+        }
+
+    def render(self, targets, foods=None):
+        """
+        Merge per-meal calorie targets into the template's meal list.
+
+        Meals whose target holds optimizer picks (``[[food_id, servings]]``)
+        list those foods; the rest fall back to the template suggestions.
+
+        Args:
+            targets: Compact targets as returned by split_calories
+            foods: Optional mapping of Food primary key to Food
+
+        Returns:
+            list: Dicts with key, name, calories and foods per meal
+        """
+        foods = foods or {}
+        rendered = []
+        for meal in self.meals:
+            target = targets.get(meal['key'], {})
+            picks = [
+                foods[food_id].describe(servings)
+                for food_id, servings in target.get('foods', [])
+                if food_id in foods
+            ]
+            rendered.append({
+                'key': meal['key'],
+                'name': meal['name'],
+                'calories': target.get('calories', 0),
+                'foods': picks or meal['foods'],
+            })
+        return rendered
+
+
+class Food(models.Model):
+    """
+    Food with nutrient values per serving, used by the meal optimizer.
+    """
+    MEAL_CHOICES = [
+        ('breakfast', 'Breakfast'),
+        ('lunch', 'Lunch'),
+        ('dinner', 'Dinner'),
+        ('snacks', 'Snacks'),
+    ]
+
+    name = models.CharField(max_length=100, unique=True)
+    meal_type = models.CharField(max_length=20, choices=MEAL_CHOICES, db_index=True)
+    calories = models.IntegerField(help_text='Calories per serving')
+    protein_g = models.FloatField(help_text='Protein per serving in grams')
+    carbs_g = models.FloatField(help_text='Carbohydrates per serving in grams')
+    fat_g = models.FloatField(help_text='Fat per serving in grams')
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['meal_type', 'name']
+
+    def __str__(self):
+        return self.name
+
+    def describe(self, servings=1):
+        """
+        Format the food for display in a meal plan.
+
+        Args:
+            servings: Number of servings picked
+
+        Returns:
+            str: e.g. "Grilled chicken breast (230 cal)" or
+            "Brown rice, 1.5 servings (322 cal)"
+        """
+        calories = int(self.calories * servings)
+        if servings == 1:
+            return f"{self.name} ({calories} cal)"
+        return f"{self.name}, {servings:g} servings ({calories} cal)"
+
+
+class StalePlanScan(models.Model):
+    """
+    A completed run of the regenerate_stale_plans command.
+
+    The next run scans profiles updated since the latest scan started, so
+    a missed or failed run widens the window instead of losing drift.
+    """
+    started_at = models.DateTimeField(db_index=True)
+    finished_at = models.DateTimeField(auto_now_add=True)
+    plans_regenerated = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-started_at']
+
+    def __str__(self):
+        return f"Stale plan scan at {self.started_at:%Y-%m-%d %H:%M}"
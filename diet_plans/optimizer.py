@@ -0,0 +1,242 @@
+"""
+Meal optimizer: pick foods that hit a meal's calorie and macro targets.
+
+Each meal is solved as a small bounded knapsack over the foods for that
+meal: up to MAX_FOODS_PER_MEAL distinct foods, each in one of
+SERVING_OPTIONS, scored on relative calorie error plus weighted macro
+error. A depth-first branch-and-bound search prunes any branch that
+already exceeds the calorie ceiling or cannot beat the scores kept so far.
+
+Targets are quantized to CALORIE_BUCKET calories and solutions are
+memoized per (catalog version, meal, goal, bucket), so users sharing a
+bucket reuse one solve and food edits invalidate old solutions.
+"""
+from functools import lru_cache
+
+from .catalog import catalog_version, foods_for_meal
+
+CALORIE_BUCKET = 25
+SERVING_OPTIONS = (0.5, 1, 1.5, 2)
+MAX_FOODS_PER_MEAL = 3
+# Picks may overshoot a meal's calorie target by at most this fraction
+CALORIE_TOLERANCE = 0.10
+MACRO_WEIGHT = 0.5
+
+# Share of calories from (protein, carbs, fat) per goal
+MACRO_SPLITS = {
+    'weight_loss': (0.30, 0.40, 0.30),
+    'weight_gain': (0.25, 0.50, 0.25),
+}
+CALORIES_PER_GRAM = (4, 4, 9)
+
+
+def bucket_calories(calories):
+    """
+    Quantize a calorie target to the memoization bucket.
+
+    Args:
+        calories: Calorie target
+
+    Returns:
+        int: Nearest multiple of CALORIE_BUCKET
+    """
+    return int(round(calories / CALORIE_BUCKET)) * CALORIE_BUCKET
+
+
+def macro_targets(calories, goal_type):
+    """
+    Convert a calorie target into protein, carb and fat grams.
+
+    Args:
+        calories: Calorie target
+        goal_type: 'weight_loss' or 'weight_gain'
+
+    Returns:
+        tuple: (protein_g, carbs_g, fat_g)
+    """
+    split = MACRO_SPLITS.get(goal_type, MACRO_SPLITS['weight_loss'])
+    return tuple(
+        calories * share / per_gram
+        for share, per_gram in zip(split, CALORIES_PER_GRAM)
+    )
+
+
+def _search(options, target, macros, count=1):
+    """
+    Branch-and-bound search for the best food combinations.
+
+    Keeps the ``count`` best combinations with distinct food sets (serving
+    variations of the same foods compete for one slot) and prunes against
+    the worst score still kept.
+
+    Args:
+        options: List of (food_id, servings, calories, protein, carbs, fat)
+            grouped by food and ordered by servings
+        target: Calorie target
+        macros: (protein_g, carbs_g, fat_g) targets
+        count: Number of alternative combinations to return
+
+    Returns:
+        tuple: Combinations ordered best first, each ((food_id, servings), ...)
+    """
+    ceiling = target * (1 + CALORIE_TOLERANCE)
+    macro_weights = [MACRO_WEIGHT / (3 * value) if value else 0 for value in macros]
+    kept = {}
+    bound = [float('inf')]
+    food_count = len(options)
+
+    def record(score, picks):
+        key = frozenset(food_id for food_id, _ in picks)
+        current = kept.get(key)
+        if current is not None and current[0] <= score:
+            return
+        kept[key] = (score, picks)
+        if len(kept) > count:
+            del kept[max(kept, key=lambda item: kept[item][0])]
+        if len(kept) == count:
+            bound[0] = max(score for score, _ in kept.values())
+
+    def visit(start, slots, calories, *, protein, carbs, fat, picks):
+        calorie_error = abs(calories - target) / target
+        if picks:
+            score = calorie_error + (
+                abs(protein - macros[0]) * macro_weights[0]
+                + abs(carbs - macros[1]) * macro_weights[1]
+                + abs(fat - macros[2]) * macro_weights[2]
+            )
+            if score < bound[0]:
+                record(score, picks)
+        # Adding food only raises calories, so once over target the
+        # calorie error alone bounds every deeper combination.
+        if not slots or (calories >= target and calorie_error >= bound[0]):
+            return
+        for index in range(start, food_count):
+            for food_id, servings, cal, pro, carb, fat_g in options[index]:
+                total = calories + cal
+                if total > ceiling:
+                    break
+                visit(
+                    index + 1, slots - 1, total,
+                    protein=protein + pro, carbs=carbs + carb, fat=fat + fat_g,
+                    picks=picks + ((food_id, servings),),
+                )
+
+    visit(0, MAX_FOODS_PER_MEAL, 0, protein=0.0, carbs=0.0, fat=0.0, picks=())
+    return tuple(picks for _, picks in sorted(kept.values()))
+
+
+@lru_cache(maxsize=4096)
+def _solve(version, meal_type, goal_type, calories, count=1):
+    """Memoized per-bucket solve; ``version`` keys results to the catalog."""
+    del version  # Only part of the cache key
+    foods = sorted(foods_for_meal(meal_type), key=lambda food: -food.calories)
+    options = [
+        [
+            (food.pk, servings, food.calories * servings, food.protein_g * servings,
+             food.carbs_g * servings, food.fat_g * servings)
+            for servings in SERVING_OPTIONS
+        ]
+        for food in foods
+        if food.calories > 0
+    ]
+    if not options or calories <= 0:
+        return ()
+    return _search(options, calories, macro_targets(calories, goal_type), count)
+
+
+def optimize_meal(meal_type, goal_type, calories):
+    """
+    Pick foods for one meal.
+
+    Args:
+        meal_type: Meal key such as 'breakfast'
+        goal_type: 'weight_loss' or 'weight_gain'
+        calories: Calorie target for the meal
+
+    Returns:
+        list: [[food_id, servings], ...], empty if no foods are available
+    """
+    solutions = _solve(catalog_version(), meal_type, goal_type, bucket_calories(calories))
+    if not solutions:
+        return []
+    return [list(pick) for pick in solutions[0]]
+
+
+def meal_alternatives(meal_type, goal_type, calories, count):
+    """
+    Pick up to ``count`` alternative food combinations for one meal.
+
+    Alternatives use distinct food sets and are ordered best first; the
+    list is memoized per bucket like optimize_meal.
+
+    Args:
+        meal_type: Meal key such as 'breakfast'
+        goal_type: 'weight_loss' or 'weight_gain'
+        calories: Calorie target for the meal
+        count: Maximum number of alternatives
+
+    Returns:
+        list: [[[food_id, servings], ...], ...]
+    """
+    solutions = _solve(
+        catalog_version(), meal_type, goal_type, bucket_calories(calories), count
+    )
+    return [[list(pick) for pick in picks] for picks in solutions]
+
+
+def optimize_meals(targets, goal_type):
+    """
+    Add optimizer picks to per-meal calorie targets.
+
+    Args:
+        targets: Compact targets as returned by MealTemplate.split_calories
+        goal_type: 'weight_loss' or 'weight_gain'
+
+    Returns:
+        dict: Copy of ``targets`` with a 'foods' list on meals that have picks
+    """
+    meals = {}
+    for meal_key, target in targets.items():
+        meal = dict(target)
+        picks = optimize_meal(meal_key, goal_type, target['calories'])
+        if picks:
+            meal['foods'] = picks
+        meals[meal_key] = meal
+    return meals
+
+
+def optimize_meals_batch(template, goal_type, daily_calories):
+    """
+    Build meals for many daily calorie targets sharing one template.
+
+    Distinct targets are split once and every (meal, bucket) pair is
+    solved once, so the cost grows with the number of buckets rather than
+    the number of users.
+
+    Args:
+        template: MealTemplate used for all targets
+        goal_type: 'weight_loss' or 'weight_gain'
+        daily_calories: Iterable of daily calorie targets
+
+    Returns:
+        dict: daily calories -> meals as returned by optimize_meals
+    """
+    return {
+        calories: optimize_meals(template.split_calories(calories), goal_type)
+        for calories in set(daily_calories)
+    }
+
+
+def optimizer_cache_info():
+    """
+    Report memoization statistics for the per-bucket solver.
+
+    Returns:
+        functools._CacheInfo: hits, misses, maxsize and currsize
+    """
+    return _solve.cache_info()  # pylint: disable=no-value-for-parameter
+
+
+def clear_optimizer_cache():
+    """Drop every memoized meal solution."""
+    _solve.cache_clear()
@@ -0,0 +1,204 @@
+"""
+Bucketed memoization of generated meal picks.
+
+Meal picks depend only on the goal and the daily calorie target, so the
+key is the goal plus the calorie target quantized with the optimizer's
+CALORIE_BUCKET, not the profile itself: profiles whose gender, age,
+height, weight and activity level differ but come out at nearly the same
+target share a bucket. The first profile in a bucket runs the meal
+optimizer; later profiles reuse its food picks from an in-process LRU,
+falling back to Django's cache so other workers share the result (in the
+"diet_plans" cache namespace), and only their own calorie figures are
+computed. Enabled by the DIET_PLAN_BUCKET_CACHE setting.
+"""
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+from diet_planner.cache import namespace
+
+from .catalog import catalog_stamp
+from .optimizer import bucket_calories
+
+LOCAL_MAXSIZE = 2048
+SHARED_TIMEOUT = 60 * 60 * 24
+CACHE_NAMESPACE = 'diet_plans'
+STAT_NAMES = ('local_hits', 'shared_hits', 'misses')
+# Lookups counted locally before the shared counters are updated
+STATS_FLUSH_EVERY = 100
+
+
+def bucket_cache_enabled():
+    """
+    Check whether bucketed plan memoization is switched on.
+
+    Returns:
+        bool: Value of the DIET_PLAN_BUCKET_CACHE setting
+    """
+    return getattr(settings, 'DIET_PLAN_BUCKET_CACHE', False)
+
+
+def plan_bucket(plan_version, goal_type, daily_calories):
+    """
+    Quantize the inputs that shape a plan's meal picks.
+
+    Args:
+        plan_version: The generator's PLAN_VERSION, so a bump abandons
+            picks cached by the previous version
+        goal_type: 'weight_loss' or 'weight_gain'
+        daily_calories: The user's daily calorie target
+
+    Returns:
+        tuple: Hashable (version, goal, bucketed calories) key
+    """
+    return plan_version, goal_type, bucket_calories(daily_calories)
+
+
+def _shared_key(bucket, template):
+    parts = ['bucket', catalog_stamp(), str(template.pk)]
+    parts.extend(str(part) for part in bucket)
+    return ':'.join(parts)
+
+
+class PlanBucketCache:
+    """
+    Two-level cache of per-meal food picks keyed by plan bucket.
+    """
+    def __init__(self, maxsize=LOCAL_MAXSIZE, timeout=SHARED_TIMEOUT):
+        """
+        Initialize the bucket cache.
+
+        Args:
+            maxsize: Buckets kept in the in-process LRU
+            timeout: Seconds entries live in the shared cache
+        """
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = dict.fromkeys(STAT_NAMES, 0)
+        self._unflushed = dict.fromkeys(STAT_NAMES, 0)
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+            self._unflushed[name] += 1
+            flush = sum(self._unflushed.values()) >= STATS_FLUSH_EVERY
+        if flush:
+            self.flush_stats()
+
+    def flush_stats(self):
+        """Add this process's unreported counts to the shared counters."""
+        with self._lock:
+            pending, self._unflushed = self._unflushed, dict.fromkeys(STAT_NAMES, 0)
+        shared = namespace(CACHE_NAMESPACE)
+        for name, count in pending.items():
+            if not count:
+                continue
+            key = f'stats:{name}'
+            if not shared.add(key, count, timeout=None):
+                try:
+                    shared.incr(key, count)
+                except ValueError:
+                    shared.set(key, count, timeout=None)
+
+    def _remember(self, key, picks):
+        with self._lock:
+            self._local[key] = picks
+            self._local.move_to_end(key)
+            while len(self._local) > self.maxsize:
+                self._local.popitem(last=False)
+
+    def get_or_compute(self, bucket, template, compute):
+        """
+        Return cached picks for a bucket, computing them on a miss.
+
+        Args:
+            bucket: Value returned by plan_bucket
+            template: MealTemplate the picks belong to
+            compute: Callable returning {meal_key: picks} on a miss
+
+        Returns:
+            dict: meal key -> [[food_id, servings], ...]
+        """
+        key = _shared_key(bucket, template)
+        with self._lock:
+            picks = self._local.get(key)
+            if picks is not None:
+                self._local.move_to_end(key)
+        if picks is not None:
+            self._count('local_hits')
+            return picks
+
+        shared = namespace(CACHE_NAMESPACE)
+        picks = shared.get(key)
+        if picks is not None:
+            self._count('shared_hits')
+        else:
+            self._count('misses')
+            picks = compute()
+            shared.set(key, picks, timeout=self.timeout)
+        self._remember(key, picks)
+        return picks
+
+    def stats(self, shared=False):
+        """
+        Report hit and miss counts with the overall hit rate.
+
+        Args:
+            shared: Read the counters aggregated across processes instead
+                of this process's own
+
+        Returns:
+            dict: local_hits, shared_hits, misses, lookups and hit_rate
+        """
+        if shared:
+            self.flush_stats()
+            found = namespace(CACHE_NAMESPACE).get_many([f'stats:{name}' for name in STAT_NAMES])
+            counts = {name: found.get(f'stats:{name}', 0) for name in STAT_NAMES}
+        else:
+            with self._lock:
+                counts = dict(self._stats)
+        lookups = sum(counts.values())
+        hits = counts['local_hits'] + counts['shared_hits']
+        counts['lookups'] = lookups
+        counts['hit_rate'] = hits / lookups if lookups else 0.0
+        return counts
+
+    def clear(self, shared_stats=False):
+        """
+        Empty the in-process LRU and reset this process's counters.
+
+        Args:
+            shared_stats: Also reset the cross-process counters
+        """
+        with self._lock:
+            self._local.clear()
+            self._stats = dict.fromkeys(STAT_NAMES, 0)
+            self._unflushed = dict.fromkeys(STAT_NAMES, 0)
+        if shared_stats:
+            namespace(CACHE_NAMESPACE).delete_many([f'stats:{name}' for name in STAT_NAMES])
+
+
+plan_cache = PlanBucketCache()
+
+
+def personalize(targets, picks):
+    """
+    Combine a user's own calorie targets with cached food picks.
+
+    Args:
+        targets: Compact targets as returned by MealTemplate.split_calories
+        picks: meal key -> [[food_id, servings], ...] from the bucket cache
+
+    Returns:
+        dict: Meals in the format stored on DietPlan.meals
+    """
+    meals = {}
+    for meal_key, target in targets.items():
+        meal = dict(target)
+        if picks.get(meal_key):
+            meal['foods'] = picks[meal_key]
+        meals[meal_key] = meal
+    return meals
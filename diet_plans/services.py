@@ -4,7 +4,60 @@ Diet plan generation service.
 Calculates BMR, TDEE, and generates personalized meal plans
 based on user profile and fitness goals.
 """
+import hashlib
+
+from django.db import IntegrityError, transaction
+
+from .catalog import active_template
 from .models import DietPlan
+from .optimizer import optimize_meals
+from .plan_cache import bucket_cache_enabled, personalize, plan_bucket, plan_cache
+
+# Bump when calorie formulas or the stored plan layout change so stored
+# plan fingerprints no longer match and plans are regenerated. Food edits
+# to a meal template need no bump; plans render the template live.
+PLAN_VERSION = 3
+
+ACTIVITY_MULTIPLIERS = {
+    'sedentary': 1.2,
+    'light': 1.375,
+    'moderate': 1.55,
+    'active': 1.725,
+    'very_active': 1.9,
+}
+
+GOAL_CALORIE_ADJUSTMENTS = {
+    'weight_loss': -500,
+    'weight_gain': 500,
+}
+
+
+def plan_fingerprint(age, height, weight, gender, *, activity_level, goal):
+    """
+    Hash the profile inputs that determine a diet plan.
+
+    Numbers are normalized so equal values hash the same whether they come
+    from a form (int) or the database (float).
+
+    Args:
+        age: Age in years
+        height: Height in cm
+        weight: Current weight in kg
+        gender: Gender value
+        activity_level: Activity level value
+        goal: Fitness goal value
+
+    Returns:
+        str: Hex digest identifying the inputs and PLAN_VERSION
+    """
+    def number(value):
+        return '' if value is None else f'{float(value):.3f}'
+
+    raw = '|'.join([
+        str(PLAN_VERSION), number(age), number(height), number(weight),
+        gender or '', activity_level or '', goal or '',
+    ])
+    return hashlib.sha256(raw.encode()).hexdigest()
 
 
 class DietPlanGenerator:
@@ -66,14 +119,7 @@ class DietPlanGenerator:
         Returns:
             float: TDEE in calories per day
         """
-        activity_multipliers = {
-            'sedentary': 1.2,
-            'light': 1.375,
-            'moderate': 1.55,
-            'active': 1.725,
-            'very_active': 1.9,
-        }
-        multiplier = activity_multipliers.get(
+        multiplier = ACTIVITY_MULTIPLIERS.get(
             self.profile.activity_level,
             1.2
         )
@@ -90,97 +136,70 @@ class DietPlanGenerator:
         Returns:
             int: Adjusted daily calorie target
         """
-        if goal_type == 'weight_loss':
-            return int(tdee - 500)
-        if goal_type == 'weight_gain':
-            return int(tdee + 500)
-        return int(tdee)
+        return int(tdee + GOAL_CALORIE_ADJUSTMENTS.get(goal_type, 0))
 
     def generate_meal_plan(self, daily_calories, goal_type):
         """
-        Generate meal plan with food suggestions based on goal.
+        Split daily calories across the active meal template for a goal
+        and pick foods for each meal with the meal optimizer.
+
+        Meals are stored compactly as calorie targets plus
+        ``[[food_id, servings]]`` picks; names come from the catalog. With
+        DIET_PLAN_BUCKET_CACHE on, picks are shared by every profile in
+        the same bucket (see plan_cache) and only the calorie targets are
+        computed per user.
 
         Args:
             daily_calories: Target daily calorie intake
             goal_type: 'weight_loss' or 'weight_gain'
 
         Returns:
-            dict: Meal plan with breakfast, lunch, dinner, and snacks
+            tuple: (MealTemplate, per-meal targets and picks), or
+            (None, None) if no active template exists for the goal
         """
-        meals = {
-            'breakfast': {
-                'name': 'Breakfast',
-                'calories': int(daily_calories * 0.25),
-                'foods': []
-            },
-            'lunch': {
-                'name': 'Lunch',
-                'calories': int(daily_calories * 0.35),
-                'foods': []
-            },
-            'dinner': {
-                'name': 'Dinner',
-                'calories': int(daily_calories * 0.30),
-                'foods': []
-            },
-            'snacks': {
-                'name': 'Snacks',
-                'calories': int(daily_calories * 0.10),
-                'foods': []
+        template = active_template(goal_type)
+        if template is None:
+            return None, None
+        targets = template.split_calories(daily_calories)
+        if not bucket_cache_enabled():
+            return template, optimize_meals(targets, goal_type)
+
+        def compute():
+            return {
+                meal_key: meal['foods']
+                for meal_key, meal in optimize_meals(targets, goal_type).items()
+                if meal.get('foods')
             }
-        }
 
-        if goal_type == 'weight_loss':
-            meals['breakfast']['foods'] = [
-                'Oatmeal with berries (200 cal)',
-                'Greek yogurt with honey (150 cal)',
-                'Whole grain toast with avocado (180 cal)'
-            ]
-            meals['lunch']['foods'] = [
-                'Grilled chicken salad (350 cal)',
-                'Quinoa bowl with vegetables (320 cal)',
-                'Lentil soup with whole grain bread (380 cal)'
-            ]
-            meals['dinner']['foods'] = [
-                'Baked salmon with vegetables (400 cal)',
-                'Turkey stir-fry with brown rice (420 cal)',
-                'Vegetable curry with quinoa (380 cal)'
-            ]
-            meals['snacks']['foods'] = [
-                'Apple with almond butter (120 cal)',
-                'Protein bar (150 cal)',
-                'Mixed nuts (100 cal)'
-            ]
-        else:
-            meals['breakfast']['foods'] = [
-                'Protein smoothie with banana (400 cal)',
-                'Eggs with whole grain toast (350 cal)',
-                'Greek yogurt parfait with granola (380 cal)'
-            ]
-            meals['lunch']['foods'] = [
-                'Chicken and rice bowl (550 cal)',
-                'Pasta with meat sauce (600 cal)',
-                'Burrito bowl with extra protein (580 cal)'
-            ]
-            meals['dinner']['foods'] = [
-                'Steak with sweet potato (650 cal)',
-                'Salmon with rice and vegetables (620 cal)',
-                'Chicken curry with naan (600 cal)'
-            ]
-            meals['snacks']['foods'] = [
-                'Protein shake (250 cal)',
-                'Trail mix (200 cal)',
-                'Peanut butter sandwich (280 cal)'
-            ]
-
-        return meals
+        picks = plan_cache.get_or_compute(
+            plan_bucket(PLAN_VERSION, goal_type, daily_calories), template, compute
+        )
+        return template, personalize(targets, picks)
+
+    def fingerprint(self):
+        """
+        Fingerprint the profile inputs used to build the plan.
+
+        Returns:
+            str: Hex digest (see plan_fingerprint)
+        """
+        return plan_fingerprint(
+            self.profile.age,
+            self.profile.height,
+            self.profile.current_weight,
+            self.profile.gender,
+            activity_level=self.profile.activity_level,
+            goal=self.profile.fitness_goal,
+        )
 
     def generate(self):
         """
         Generate complete diet plan for user.
 
         Calculates BMR, TDEE, adjusts for goal, and creates meal plan.
-        Saves or updates DietPlan in database.
+        Saves or updates DietPlan in database. If the stored plan was built
+        from the same inputs (matching fingerprint) it is returned as-is
+        without recomputing or writing.
 
         Returns:
             DietPlan: Generated diet plan instance, or None if generation fails
@@ -188,6 +207,19 @@ class DietPlanGenerator:
         if not self.profile.fitness_goal:
             return None
 
+        fingerprint = self.fingerprint()
+        existing = DietPlan.objects.filter(
+            user=self.profile.user,
+            goal_type=self.profile.fitness_goal,
+        ).first()
+        template = active_template(self.profile.fitness_goal)
+        if (
+            existing is not None
+            and existing.input_fingerprint == fingerprint
+            and existing.template_id == getattr(template, 'pk', None)
+        ):
+            return existing
+
         bmr = self.calculate_bmr()
         if not bmr:
             return None
@@ -197,18 +229,36 @@ class DietPlanGenerator:
             tdee,
             self.profile.fitness_goal
         )
-        meals = self.generate_meal_plan(
+        template, meals = self.generate_meal_plan(
             daily_calories,
             self.profile.fitness_goal
         )
+        if template is None:
+            return None
 
-        diet_plan, _ = DietPlan.objects.update_or_create(
-            user=self.profile.user,
-            goal_type=self.profile.fitness_goal,
-            defaults={
-                'daily_calories': daily_calories,
-                'meals': meals
-            }
-        )
+        values = {
+            'daily_calories': daily_calories,
+            'template': template,
+            'meals': meals,
+            'source_weight': self.profile.current_weight,
+            'input_fingerprint': fingerprint,
+        }
+        if existing is None:
+            try:
+                with transaction.atomic():
+                    return DietPlan.objects.create(
+                        user=self.profile.user,
+                        goal_type=self.profile.fitness_goal,
+                        **values,
+                    )
+            except IntegrityError:
+                # A concurrent generation created the plan first; update it instead
+                existing = DietPlan.objects.get(
+                    user=self.profile.user,
+                    goal_type=self.profile.fitness_goal,
+                )
 
-        return diet_plan
+        for field, value in values.items():
+            setattr(existing, field, value)
+        existing.save(update_fields=[*values, 'updated_at'])
+        return existing
@@ -0,0 +1,24 @@
+"""
+Django signals for diet plans.
+
+Keeps the in-process meal catalog in sync with template and food edits.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .catalog import clear_catalog
+from .models import Food, MealTemplate
+
+
+@receiver(post_save, sender=MealTemplate)
+@receiver(post_delete, sender=MealTemplate)
+@receiver(post_save, sender=Food)
+@receiver(post_delete, sender=Food)
+def invalidate_meal_catalog(**kwargs):
+    """
+    Reload the meal catalog after a template or food changes.
+
+    Args:
+        **kwargs: Signal arguments (unused)
+    """
+    clear_catalog()
@@ -0,0 +1,66 @@
+"""
+Background diet plan generation tasks.
+
+Uses threading, like the stock alert emails, so plan generation never runs
+on the request path. Duplicate requests for a profile already being
+generated are ignored.
+"""
+import logging
+import threading
+
+from django.db import connection
+
+from accounts.models import Profile
+
+from .services import DietPlanGenerator
+
+logger = logging.getLogger(__name__)
+
+_pending_profiles = set()
+_pending_lock = threading.Lock()
+
+
+def generate_diet_plan(profile_id):
+    """
+    Generate (or refresh) the diet plan for a profile.
+
+    Args:
+        profile_id: Primary key of the Profile
+    """
+    try:
+        profile = Profile.objects.select_related('user').get(pk=profile_id)
+        DietPlanGenerator(profile).generate()
+    except Profile.DoesNotExist:
+        logger.warning("Profile %s not found for diet plan generation", profile_id)
+    except Exception:  # pylint: disable=broad-exception-caught
+        # Top of the thread: nothing else would report the failure
+        logger.exception("Diet plan generation failed for profile %s", profile_id)
+    finally:
+        with _pending_lock:
+            _pending_profiles.discard(profile_id)
+        connection.close()
+
+
+def generate_diet_plan_async(profile_id):
+    """
+    Generate a profile's diet plan in a background thread.
+
+    Args:
+        profile_id: Primary key of the Profile
+
+    Returns:
+        bool: True if a new job was started, False if one is already running
+    """
+    with _pending_lock:
+        if profile_id in _pending_profiles:
+            return False
+        _pending_profiles.add(profile_id)
+
+    thread = threading.Thread(
+        target=generate_diet_plan,
+        args=(profile_id,),
+        daemon=True
+    )
+    thread.start()
+    logger.debug("Started background diet plan generation for profile %s", profile_id)
+    return True
@@ -0,0 +1,8 @@
+from django.urls import path
+from . import views
+
+app_name = 'diet_plans'
+
+urlpatterns = [
+    path('week/', views.weekly_plan, name='weekly_plan'),
+]
@@ -1 +1,40 @@
-# Create your views here.
+"""
+Diet plan views.
+
+Shows the weekly meal rotation built on top of the user's daily plan.
+"""
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.db.models import F
+from django.shortcuts import redirect, render
+
+from accounts.models import Profile
+
+from .models import DietPlan
+from .weekly import WeeklyPlanGenerator, render_week
+
+
+@login_required
+def weekly_plan(request):
+    """
+    Display the 7-day meal rotation for the current goal.
+
+    GET only reads the stored rotation; POST (re)builds it, which is a
+    no-op write when the stored week is still current.
+    """
+    if request.method == 'POST':
+        profile = Profile.objects.filter(user=request.user).first()
+        if profile is None or WeeklyPlanGenerator(profile).generate() is None:
+            messages.error(request, 'Complete your profile and select a goal first.')
+            return redirect('accounts:dashboard')
+        return redirect('diet_plans:weekly_plan')
+
+    diet_plan = DietPlan.objects.filter(
+        user=request.user,
+        goal_type=F('user__profile__fitness_goal'),
+    ).first()
+    context = {
+        'diet_plan': diet_plan,
+        'days': render_week(diet_plan) if diet_plan else [],
+    }
+    return render(request, 'diet_plans/weekly_plan.html', context)
@@ -0,0 +1,132 @@
+"""
+Weekly diet plan generation.
+
+A week is stored as a rotation seed plus, per meal, a short list of
+alternative food combinations from the meal optimizer (food ids and
+servings only). Day N uses alternative ``(offset + N) % len(alternatives)``
+with a per-meal offset derived from the seed, so no meal repeats within
+the week as long as there are enough alternatives, and neither generation
+nor storage repeats work per day.
+"""
+import random
+
+from .catalog import food_catalog, get_template
+from .optimizer import meal_alternatives
+from .services import DietPlanGenerator
+
+WEEK_DAYS = 7
+# Alternatives kept per meal; longer plans cycle through the same list
+MAX_ALTERNATIVES = 7
+
+
+def _offset(seed, meal_key, count):
+    return random.Random(f'{seed}:{meal_key}').randrange(count)
+
+
+def week_is_current(plan):
+    """
+    Check whether a plan's stored week matches its current daily plan.
+
+    Args:
+        plan: DietPlan instance
+
+    Returns:
+        bool: True if the week was built for the same calories and template
+    """
+    week = plan.week or {}
+    return (
+        bool(week.get('options'))
+        and week.get('daily_calories') == plan.daily_calories
+        and week.get('template') == plan.template_id
+    )
+
+
+def build_week(plan, days=WEEK_DAYS, seed=None):
+    """
+    Build the compact weekly rotation for a plan.
+
+    Args:
+        plan: DietPlan with per-meal calorie targets
+        days: Number of days in the rotation
+        seed: Rotation seed (defaults to the plan's user id)
+
+    Returns:
+        dict: Value to store in DietPlan.week
+    """
+    count = min(days, MAX_ALTERNATIVES)
+    return {
+        'seed': plan.user_id if seed is None else seed,
+        'days': days,
+        'daily_calories': plan.daily_calories,
+        'template': plan.template_id,
+        'options': {
+            meal_key: meal_alternatives(meal_key, plan.goal_type, target['calories'], count)
+            for meal_key, target in plan.meals.items()
+        },
+    }
+
+
+def render_week(plan):
+    """
+    Expand a plan's stored rotation into day-by-day meals.
+
+    Args:
+        plan: DietPlan instance
+
+    Returns:
+        list: Dicts with 'number' (1-based) and 'meals' (as catalog.render_plan),
+        empty if the plan has no current week
+    """
+    if plan.template_id is None or not week_is_current(plan):
+        return []
+
+    week = plan.week
+    template = get_template(plan.template_id)
+    foods = food_catalog()
+    offsets = {
+        meal_key: _offset(week['seed'], meal_key, len(options))
+        for meal_key, options in week['options'].items()
+        if options
+    }
+
+    days = []
+    for day in range(week['days']):
+        targets = {}
+        for meal_key, target in plan.meals.items():
+            targets[meal_key] = {'calories': target.get('calories', 0)}
+            options = week['options'].get(meal_key)
+            if options:
+                targets[meal_key]['foods'] = options[(offsets[meal_key] + day) % len(options)]
+        days.append({'number': day + 1, 'meals': template.render(targets, foods)})
+    return days
+
+
+class WeeklyPlanGenerator(DietPlanGenerator):
+    """
+    Generate a diet plan plus a varied multi-day rotation of its meals.
+    """
+    def __init__(self, user_profile, days=WEEK_DAYS):
+        """
+        Initialize weekly plan generator with user profile.
+
+        Args:
+            user_profile: Profile instance containing user's physical attributes
+            days: Number of days in the rotation
+        """
+        super().__init__(user_profile)
+        self.days = days
+
+    def generate(self):
+        """
+        Generate the daily plan and refresh its weekly rotation if stale.
+
+        Returns:
+            DietPlan: Plan with a current ``week``, or None if generation fails
+        """
+        plan = super().generate()
+        if plan is None:
+            return None
+        if not week_is_current(plan) or plan.week.get('days') != self.days:
+            plan.week = build_week(plan, days=self.days)
+            plan.save(update_fields=['week', 'updated_at'])
+        return plan
@@ -0,0 +1,90 @@
+"""
+Stock alert evaluation service.
+
+Applies the low-stock alert rules to a batch of products using a fixed
+number of queries, so bulk stock changes can be checked in one pass.
+"""
+from collections import defaultdict
+
+from django.contrib.contenttypes.models import ContentType
+
+from .models import StockAlert
+from .tasks import send_stock_alert_email_async
+
+
+def build_alert_message(product):
+    """
+    Build the stored alert message for a low stock product.
+
+    Args:
+        product: Product instance (Supplement or ProteinBar)
+
+    Returns:
+        str: Human readable alert message
+    """
+    return (
+        f"{product.name} stock is low "
+        f"({product.stock_quantity} remaining). "
+        f"Threshold: {product.threshold}"
+    )
+
+
+def evaluate_stock_alerts(products):
+    """
+    Send or reset low stock alerts for a batch of products.
+
+    Logic (per product):
+    1. If stock is LOW and no alert has been sent: send email, mark as sent
+    2. If stock is LOW and alert already sent: do nothing (prevent duplicates)
+    3. If stock is ABOVE threshold: reset alert_sent flag so the product
+       can be re-alerted if it goes low again later
+
+    Existing alerts are loaded with one query per product type and flag
+    changes are written with bulk updates.
+
+    Args:
+        products: Iterable of product instances with current stock values
+    """
+    by_content_type = defaultdict(list)
+    for product in products:
+        content_type = ContentType.objects.get_for_model(product)
+        by_content_type[content_type].append(product)
+
+    for content_type, items in by_content_type.items():
+        alerts = {
+            alert.object_id: alert
+            for alert in StockAlert.objects.filter(
+                content_type=content_type,
+                object_id__in=[product.pk for product in items],
+            )
+        }
+
+        new_alerts = []
+        to_mark_sent = []
+        to_reset = []
+
+        for product in items:
+            alert = alerts.get(product.pk)
+            if product.is_low_stock():
+                if alert is None:
+                    new_alerts.append(StockAlert(
+                        content_type=content_type,
+                        object_id=product.pk,
+                        alert_sent=True,
+                        message=build_alert_message(product),
+                    ))
+                elif not alert.alert_sent:
+                    to_mark_sent.append(alert.pk)
+                else:
+                    continue
+                # Send email in background thread (non-blocking)
+                send_stock_alert_email_async(product.pk, content_type.id)
+            elif alert is not None and alert.alert_sent:
+                to_reset.append(alert.pk)
+
+        if new_alerts:
+            StockAlert.objects.bulk_create(new_alerts, ignore_conflicts=True)
+        if to_mark_sent:
+            StockAlert.objects.filter(pk__in=to_mark_sent).update(alert_sent=True)
+        if to_reset:
+            StockAlert.objects.filter(pk__in=to_reset).update(alert_sent=False)
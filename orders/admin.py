@@ -1,5 +1,7 @@
-from django.contrib import admin
-from .models import Order, OrderItem
+from django import forms
+from django.contrib import admin, messages
+from .models import Cart, CartItem, Order, OrderItem, OrderStatusHistory, StockReservation
+from .services import transition_orders
 
 
 class OrderItemInline(admin.TabularInline):
@@ -8,21 +10,106 @@ class OrderItemInline(admin.TabularInline):
     readonly_fields = ['subtotal']
 
 
+class OrderStatusHistoryInline(admin.TabularInline):
+    model = OrderStatusHistory
+    extra = 0
+    readonly_fields = ['from_status', 'to_status', 'changed_by', 'changed_at']
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+class OrderAdminForm(forms.ModelForm):
+    class Meta:
+        model = Order
+        fields = '__all__'
+
+    def clean_status(self):
+        status = self.cleaned_data['status']
+        order = self.instance
+        if order.pk and status != order.status and not order.can_transition_to(status):
+            raise forms.ValidationError(
+                f'An order that is {order.get_status_display().lower()} cannot move to {status}.'
+            )
+        return status
+
+
 @admin.register(Order)
 class OrderAdmin(admin.ModelAdmin):
+    form = OrderAdminForm
     list_display = ['id', 'user', 'order_date', 'total_amount', 'status']
     list_filter = ['status', 'order_date']
     search_fields = ['user__username', 'user__email', 'id']
     readonly_fields = ['order_date']
-    inlines = [OrderItemInline]
+    inlines = [OrderItemInline, OrderStatusHistoryInline]
+    actions = ['mark_processing', 'mark_shipped', 'mark_delivered', 'cancel_selected_orders']
 
     def get_readonly_fields(self, request, obj=None):
         if obj:
             return ['order_date', 'user', 'total_amount']
         return ['order_date']
 
+    def save_model(self, request, obj, form, change):
+        # OrderAdminForm only lets allowed transitions through; they are
+        # applied by transition_orders so history and restocking happen too
+        new_status = obj.status
+        changing_status = change and 'status' in form.changed_data
+        if changing_status:
+            obj.status = form.initial['status']
+        super().save_model(request, obj, form, change)
+        if changing_status:
+            transition_orders([obj.pk], new_status, user=request.user)
+
+    def _transition_selected(self, request, queryset, status):
+        updated = transition_orders(queryset.values_list('pk', flat=True), status, user=request.user)
+        skipped = queryset.count() - len(updated)
+        self.message_user(request, f'{len(updated)} order(s) moved to {status}.')
+        if skipped:
+            self.message_user(
+                request,
+                f'{skipped} order(s) skipped because they cannot move to {status}.',
+                level=messages.WARNING,
+            )
+
+    @admin.action(description='Mark selected orders as processing')
+    def mark_processing(self, request, queryset):
+        self._transition_selected(request, queryset, 'processing')
+
+    @admin.action(description='Mark selected orders as shipped')
+    def mark_shipped(self, request, queryset):
+        self._transition_selected(request, queryset, 'shipped')
+
+    @admin.action(description='Mark selected orders as delivered')
+    def mark_delivered(self, request, queryset):
+        self._transition_selected(request, queryset, 'delivered')
+
+    @admin.action(description='Cancel selected orders and restock items')
+    def cancel_selected_orders(self, request, queryset):
+        self._transition_selected(request, queryset, 'cancelled')
+
 
 @admin.register(OrderItem)
 class OrderItemAdmin(admin.ModelAdmin):
     list_display = ['order', 'product', 'quantity', 'price', 'subtotal']
     list_filter = ['order__status', 'order__order_date']
+
+
+@admin.register(StockReservation)
+class StockReservationAdmin(admin.ModelAdmin):
+    list_display = ['user', 'product_type', 'product_id', 'quantity', 'expires_at']
+    list_filter = ['product_type', 'expires_at']
+    search_fields = ['user__username']
+
+
+class CartItemInline(admin.TabularInline):
+    model = CartItem
+    extra = 0
+
+
+@admin.register(Cart)
+class CartAdmin(admin.ModelAdmin):
+    list_display = ['id', 'user', 'created_at', 'updated_at']
+    search_fields = ['user__username']
+    readonly_fields = ['created_at', 'updated_at']
+    inlines = [CartItemInline]
@@ -0,0 +1,472 @@
+"""
+Shopping cart storage.
+
+CART_STORAGE selects where carts live. "database" (the default) keeps
+them in Cart/CartItem rows: each add or update is a single upsert on the
+(cart, product_type, product_id) constraint, carts survive session
+expiry and are shared across a user's devices, and a guest's cart is
+merged into the user's own on login. "session" keeps the cart in the
+session in a compact encoding (see SessionCart).
+
+Both stores expose the same interface, so views only deal with
+(product_type, product_id, quantity) lines. Each store also reports a
+(count, version) state for the navigation badge: the version changes
+whenever the cart does, so per-user template fragments can vary on it.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count
+from django.utils import timezone
+
+from diet_planner.cache import namespace
+from products.models import PRODUCT_MODELS
+
+from .models import Cart, CartItem
+
+CART_SESSION_KEY = 'cart'
+CART_ID_SESSION_KEY = 'cart_id'
+CART_VERSION_SESSION_KEY = 'cart_version'
+# Version shared by every empty cart
+EMPTY_CART_VERSION = 'empty'
+# Seconds a database cart's badge state is cached. Bounds how stale it
+# can be in workers that did not handle the change (per-process cache
+# backends) or after edits made outside DatabaseCart, such as the admin.
+CART_STATE_TIMEOUT = 60
+
+
+# Short codes used in session cart keys
+PRODUCT_TYPE_CODES = {
+    'supplement': 's',
+    'protein_bar': 'p',
+}
+CODE_PRODUCT_TYPES = {code: product_type for product_type, code in PRODUCT_TYPE_CODES.items()}
+
+
+def _line_key(product_type, product_id):
+    return f'{PRODUCT_TYPE_CODES[product_type]}{product_id}'
+
+
+def _compact(cart):
+    """Convert a legacy list-of-dicts session cart to the compact dict."""
+    compact = {}
+    for item in cart:
+        if item.get('type') in PRODUCT_TYPE_CODES:
+            key = _line_key(item['type'], item.get('id'))
+            compact[key] = compact.get(key, 0) + item.get('quantity', 1)
+    return compact
+
+
+class SessionCart:
+    """
+    Cart stored in the session as {"<type code><product id>": quantity}.
+
+    For example {"p12": 1, "s3": 2} is one protein bar #12 and two of
+    supplement #3. Lookups and updates are dict operations and the
+    session payload stays a few bytes per line. Carts saved in the old
+    list-of-dicts format are converted the first time they are read.
+    """
+    def __init__(self, request):
+        self.session = request.session
+
+    def _cart(self):
+        cart = self.session.get(CART_SESSION_KEY) or {}
+        if isinstance(cart, list):
+            cart = _compact(cart)
+            self.session[CART_SESSION_KEY] = cart
+        return cart
+
+    def lines(self):
+        """
+        List the cart's contents.
+
+        Returns:
+            list: (product_type, product_id, quantity) tuples
+        """
+        return [
+            (CODE_PRODUCT_TYPES[key[0]], int(key[1:]), quantity)
+            for key, quantity in self._cart().items()
+        ]
+
+    def quantity(self, product_type, product_id):
+        """
+        Get the quantity of a product in the cart.
+
+        Args:
+            product_type: 'supplement' or 'protein_bar'
+            product_id: Product primary key
+
+        Returns:
+            int: Quantity, 0 if the product is not in the cart
+        """
+        if product_type not in PRODUCT_TYPE_CODES:
+            return 0
+        return self._cart().get(_line_key(product_type, product_id), 0)
+
+    def set_quantity(self, product_type, product_id, quantity):
+        """
+        Put a product in the cart with the given quantity.
+
+        Args:
+            product_type: 'supplement' or 'protein_bar'
+            product_id: Product primary key
+            quantity: New quantity (positive)
+        """
+        cart = self._cart()
+        cart[_line_key(product_type, product_id)] = quantity
+        self.session[CART_SESSION_KEY] = cart
+        self._changed()
+
+    def remove(self, product_type, product_id):
+        """
+        Take a product out of the cart.
+
+        Args:
+            product_type: 'supplement' or 'protein_bar'
+            product_id: Product primary key
+        """
+        cart = self._cart()
+        if product_type in PRODUCT_TYPE_CODES and cart.pop(_line_key(product_type, product_id), None):
+            self.session[CART_SESSION_KEY] = cart
+            self._changed()
+
+    def clear(self):
+        """Empty the cart."""
+        self.session[CART_SESSION_KEY] = {}
+        self._changed()
+
+    def _changed(self):
+        self.session[CART_VERSION_SESSION_KEY] = self.session.get(CART_VERSION_SESSION_KEY, 0) + 1
+
+    def count(self):
+        """
+        Count the distinct products in the cart.
+
+        Returns:
+            int: Number of cart lines
+        """
+        return len(self._cart())
+
+    def state(self):
+        """
+        Get the cart's line count and version without touching the database.
+
+        Returns:
+            tuple: (count, version) where version is a string that changes
+            whenever the cart does
+        """
+        cart = self._cart()
+        if not cart:
+            return 0, EMPTY_CART_VERSION
+        return len(cart), f's{self.session.session_key}.{self.session.get(CART_VERSION_SESSION_KEY, 0)}'
+
+
+class DatabaseCart:
+    """
+    Cart stored in Cart/CartItem rows.
+
+    Signed-in users' lines are looked up through the user's cart with an
+    indexed join; guests' through the cart_id kept in their session.
+    Every change bumps Cart.updated_at, which doubles as the badge
+    version; the badge state is cached briefly in the "orders" namespace
+    (see CART_STATE_TIMEOUT), so most pages read it without a query.
+    """
+    def __init__(self, request):
+        self.request = request
+        self.user = request.user if request.user.is_authenticated else None
+        self._cart = None
+
+    def _items(self):
+        if self.user is not None:
+            return CartItem.objects.filter(cart__user=self.user)
+        cart_id = self.request.session.get(CART_ID_SESSION_KEY)
+        if cart_id is None:
+            return CartItem.objects.none()
+        return CartItem.objects.filter(cart_id=cart_id)
+
+    def _get_cart(self):
+        if self._cart is not None:
+            return self._cart
+        if self.user is not None:
+            self._cart, _ = Cart.objects.get_or_create(user=self.user)
+            return self._cart
+
+        cart_id = self.request.session.get(CART_ID_SESSION_KEY)
+        if cart_id is not None:
+            self._cart = Cart.objects.filter(pk=cart_id, user__isnull=True).first()
+        if self._cart is None:
+            self._cart = Cart.objects.create()
+            self.request.session[CART_ID_SESSION_KEY] = self._cart.pk
+        return self._cart
+
+    def _carts(self):
+        if self.user is not None:
+            return Cart.objects.filter(user=self.user)
+        cart_id = self.request.session.get(CART_ID_SESSION_KEY)
+        if cart_id is None:
+            return Cart.objects.none()
+        return Cart.objects.filter(pk=cart_id, user__isnull=True)
+
+    def _owner(self):
+        if self.user is not None:
+            return f'u{self.user.pk}'
+        cart_id = self.request.session.get(CART_ID_SESSION_KEY)
+        return None if cart_id is None else f'g{cart_id}'
+
+    def _changed(self):
+        # Bumps the badge version; also keeps guest carts from being swept
+        # as abandoned (see delete_abandoned_carts)
+        self._carts().update(updated_at=timezone.now())
+        forget_cart_state(self._owner())
+
+    def lines(self):
+        """
+        List the cart's contents.
+
+        Returns:
+            list: (product_type, product_id, quantity) tuples
+        """
+        return list(self._items().values_list('product_type', 'product_id', 'quantity'))
+
+    def quantity(self, product_type, product_id):
+        """
+        Get the quantity of a product in the cart.
+
+        Args:
+            product_type: 'supplement' or 'protein_bar'
+            product_id: Product primary key
+
+        Returns:
+            int: Quantity, 0 if the product is not in the cart
+        """
+        return self._items().filter(
+            product_type=product_type, product_id=product_id
+        ).values_list('quantity', flat=True).first() or 0
+
+    def set_quantity(self, product_type, product_id, quantity):
+        """
+        Put a product in the cart with the given quantity (one upsert).
+
+        Args:
+            product_type: 'supplement' or 'protein_bar'
+            product_id: Product primary key
+            quantity: New quantity (positive)
+        """
+        cart = self._get_cart()
+        CartItem.objects.bulk_create(
+            [CartItem(cart=cart, product_type=product_type, product_id=product_id, quantity=quantity)],
+            update_conflicts=True,
+            unique_fields=['cart', 'product_type', 'product_id'],
+            update_fields=['quantity'],
+        )
+        self._changed()
+
+    def remove(self, product_type, product_id):
+        """
+        Take a product out of the cart.
+
+        Args:
+            product_type: 'supplement' or 'protein_bar'
+            product_id: Product primary key
+        """
+        self._items().filter(product_type=product_type, product_id=product_id).delete()
+        self._changed()
+
+    def clear(self):
+        """Empty the cart."""
+        self._items().delete()
+        self._changed()
+
+    def count(self):
+        """
+        Count the distinct products in the cart.
+
+        Returns:
+            int: Number of cart lines
+        """
+        return self._items().count()
+
+    def state(self):
+        """
+        Get the cart's line count and version, from the cache when possible.
+
+        Returns:
+            tuple: (count, version) where version is a string that changes
+            whenever the cart does
+        """
+        owner = self._owner()
+        if owner is None:
+            return 0, EMPTY_CART_VERSION
+        cache = namespace('orders')
+        state = cache.get(f'cart:{owner}')
+        if state is None:
+            count, updated_at = self._carts().annotate(count=Count('items')).values_list(
+                'count', 'updated_at'
+            ).first() or (0, None)
+            state = (count, f'{owner}.{updated_at.timestamp()}' if count else EMPTY_CART_VERSION)
+            cache.set(f'cart:{owner}', state, timeout=CART_STATE_TIMEOUT)
+        return state
+
+
+def forget_cart_state(owner):
+    """
+    Drop a database cart's cached badge state after it changes.
+
+    Only reaches the local process with a per-process cache backend;
+    other workers catch up within CART_STATE_TIMEOUT.
+
+    Args:
+        owner: "u<user id>" or "g<guest cart id>"; None is ignored
+    """
+    if owner is not None:
+        namespace('orders').delete(f'cart:{owner}')
+
+
+CART_STORES = {
+    'session': SessionCart,
+    'database': DatabaseCart,
+}
+
+
+def get_cart(request):
+    """
+    Return the configured cart store for a request.
+
+    With database storage, a cart left in the session by the session
+    store is moved into the database the first time it is seen.
+
+    Args:
+        request: Current HttpRequest
+
+    Returns:
+        SessionCart or DatabaseCart
+    """
+    store = CART_STORES[getattr(settings, 'CART_STORAGE', 'database')](request)
+    if isinstance(store, DatabaseCart) and request.session.get(CART_SESSION_KEY):
+        for product_type, product_id, quantity in SessionCart(request).lines():
+            store.set_quantity(product_type, product_id, store.quantity(product_type, product_id) + quantity)
+        del request.session[CART_SESSION_KEY]
+    return store
+
+
+def cart_contents(lines):
+    """
+    Load the products for cart lines and total them.
+
+    Products are fetched with one query per product type; lines for
+    products that no longer exist are skipped.
+
+    Args:
+        lines: (product_type, product_id, quantity) tuples
+
+    Returns:
+        tuple: (items, total) where items are dicts with product, type,
+        quantity and total
+    """
+    ids = {}
+    for product_type, product_id, _ in lines:
+        ids.setdefault(product_type, []).append(product_id)
+    products = {
+        (product_type, product.pk): product
+        for product_type, product_ids in ids.items() if product_type in PRODUCT_MODELS
+        for product in PRODUCT_MODELS[product_type].objects.filter(pk__in=product_ids)
+    }
+
+    items = []
+    total = 0
+    for product_type, product_id, quantity in lines:
+        product = products.get((product_type, product_id))
+        if product is None:
+            continue
+        item_total = float(product.price) * quantity
+        items.append({
+            'product': product,
+            'type': product_type,
+            'quantity': quantity,
+            'total': item_total,
+        })
+        total += item_total
+    return items, round(total, 2)
+
+
+def _existing_lines(lines):
+    """Drop lines whose product has been deleted (one query per product type)."""
+    lines = list(lines)
+    ids = {}
+    for product_type, product_id, _ in lines:
+        ids.setdefault(product_type, set()).add(product_id)
+    existing = {
+        (product_type, product_id)
+        for product_type, product_ids in ids.items() if product_type in PRODUCT_MODELS
+        for product_id in PRODUCT_MODELS[product_type].objects.filter(pk__in=product_ids).values_list('pk', flat=True)
+    }
+    return [line for line in lines if (line[0], line[1]) in existing]
+
+
+def merge_guest_cart(request, user):
+    """
+    Move a guest's database cart into the user's cart after login.
+
+    Quantities of products in both carts are added together; lines for
+    products deleted since they were added are dropped.
+
+    Args:
+        request: Login request (its session holds the guest cart_id)
+        user: User who just logged in
+
+    Returns:
+        list: (product_type, product_id, quantity) lines whose quantity
+        changed, so the caller can reserve stock for them
+    """
+    cart_id = request.session.pop(CART_ID_SESSION_KEY, None)
+    if cart_id is None:
+        return []
+    guest_lines = _existing_lines(
+        CartItem.objects.filter(cart_id=cart_id, cart__user__isnull=True).values_list(
+            'product_type', 'product_id', 'quantity'
+        )
+    )
+    if not guest_lines:
+        Cart.objects.filter(pk=cart_id, user__isnull=True).delete()
+        return []
+
+    cart, _ = Cart.objects.get_or_create(user=user)
+    existing = {
+        (product_type, product_id): quantity
+        for product_type, product_id, quantity in cart.items.values_list(
+            'product_type', 'product_id', 'quantity'
+        )
+    }
+    merged = [
+        (product_type, product_id, existing.get((product_type, product_id), 0) + quantity)
+        for product_type, product_id, quantity in guest_lines
+    ]
+    CartItem.objects.bulk_create(
+        [
+            CartItem(cart=cart, product_type=product_type, product_id=product_id, quantity=quantity)
+            for product_type, product_id, quantity in merged
+        ],
+        update_conflicts=True,
+        unique_fields=['cart', 'product_type', 'product_id'],
+        update_fields=['quantity'],
+    )
+    Cart.objects.filter(pk=cart.pk).update(updated_at=timezone.now())
+    Cart.objects.filter(pk=cart_id, user__isnull=True).delete()
+    forget_cart_state(f'g{cart_id}')
+    forget_cart_state(f'u{user.pk}')
+    return merged
+
+
+def delete_abandoned_carts():
+    """
+    Delete guest carts idle for longer than a session lives.
+
+    Their session (and with it the cart_id) has expired, so nobody can
+    reach them any more.
+
+    Returns:
+        int: Number of carts deleted
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.SESSION_COOKIE_AGE)
+    _, deleted = Cart.objects.filter(user__isnull=True, updated_at__lt=cutoff).delete()
+    return deleted.get(Cart._meta.label, 0)
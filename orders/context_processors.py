@@ -1,51 +1,24 @@
-from products.models import Supplement, ProteinBar
+from functools import cache
 
+from django.utils.functional import SimpleLazyObject
 
-def cart(request):
-    cart_items = []
-    cart_total = 0
-
-    if 'cart' in request.session:
+from .cart import get_cart
 
-        for item in request.session['cart']:
-            product_type = item.get('type')
-            product_id = item.get('id')
-            quantity = item.get('quantity', 1)
 
-            if product_type == 'supplement':
-                try:
-                    product = Supplement.objects.get(id=product_id)
-                    item_total = float(product.price) * quantity
-                    cart_items.append({
-                        'product': product,
-                        'type': 'supplement',
-                        'quantity': quantity,
-                        'total': item_total
-                    })
-                    cart_total += item_total
-                except Supplement.DoesNotExist:
-                    continue
-            elif product_type == 'protein_bar':
-                try:
-                    product = ProteinBar.objects.get(id=product_id)
-                    item_total = float(product.price) * quantity
-                    cart_items.append({
-                        'product': product,
-                        'type': 'protein_bar',
-                        'quantity': quantity,
-                        'total': item_total
-                    })
-                    cart_total += item_total
-                except ProteinBar.DoesNotExist:
-                    continue
+def cart(request):
+    """
+    Expose the cart badge to templates.
+
+    cart_count and cart_version are lazy: pages that never show the badge,
+    or serve it from a cached fragment keyed on the version, skip the cart
+    lookup, and the rest pay one cache read. Views that list the cart's
+    products load them with cart_contents themselves.
+    """
+    @cache
+    def state():
+        return get_cart(request).state()
 
     return {
-        'cart_items': cart_items,
-        'cart_total': round(cart_total, 2),
-        'cart_count': len(cart_items)
+        'cart_count': SimpleLazyObject(lambda: state()[0]),
+        'cart_version': SimpleLazyObject(lambda: state()[1]),
     }
-
-
-
-
-
@@ -0,0 +1,144 @@
+"""
+Management command to benchmark cart-click throughput per session engine.
+
+Each simulated shopper runs in its own thread and repeatedly does what
+an add-to-cart request does to the session: load it, update the cart and
+save it. --cart-format legacy replays the old list-of-dicts cart for
+comparison with the compact encoding used by SessionCart. Sessions
+created by the run are deleted afterwards.
+"""
+import random
+import statistics
+import threading
+import time
+from importlib import import_module
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection
+
+from orders.cart import PRODUCT_TYPE_CODES
+
+DEFAULT_ENGINES = 'db,cached_db,signed_cookies'
+PRODUCT_TYPES = tuple(PRODUCT_TYPE_CODES)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark concurrent cart clicks against each session engine.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--engines',
+            default=DEFAULT_ENGINES,
+            help=f'Comma-separated session backends to compare (default: {DEFAULT_ENGINES}).',
+        )
+        parser.add_argument(
+            '--shoppers',
+            type=int,
+            default=8,
+            help='Concurrent shoppers, one thread each (default: 8).',
+        )
+        parser.add_argument(
+            '--clicks',
+            type=int,
+            default=100,
+            help='Cart clicks per shopper (default: 100).',
+        )
+        parser.add_argument(
+            '--products',
+            type=int,
+            default=20,
+            help='Distinct products clicked at random (default: 20).',
+        )
+        parser.add_argument(
+            '--cart-format',
+            choices=['compact', 'legacy'],
+            default='compact',
+            help='Session cart encoding to replay (default: compact).',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Random seed for the clicked products.',
+        )
+
+    def _click(self, store_class, session_key, product, legacy):
+        store = store_class(session_key)
+        product_type, product_id = product
+        if legacy:
+            cart = store.get('cart', [])
+            in_cart = next(
+                (item for item in cart if item['type'] == product_type and item['id'] == product_id),
+                None
+            )
+            if in_cart:
+                in_cart['quantity'] += 1
+            else:
+                cart.append({'type': product_type, 'id': product_id, 'quantity': 1})
+        else:
+            cart = store.get('cart', {})
+            key = f'{PRODUCT_TYPE_CODES[product_type]}{product_id}'
+            cart[key] = cart.get(key, 0) + 1
+        store['cart'] = cart
+        store.save()
+        return store
+
+    def _shopper(self, store_class, products, legacy, results):
+        timings = []
+        errors = 0
+        store = None
+        session_key = None
+        try:
+            for product in products:
+                started = time.perf_counter()
+                try:
+                    store = self._click(store_class, session_key, product, legacy)
+                    session_key = store.session_key
+                except OperationalError:
+                    errors += 1
+                timings.append((time.perf_counter() - started) * 1000)
+            payload = len(store.encode({'cart': store['cart']})) if store else 0
+            if store is not None:
+                store.delete()
+        finally:
+            connection.close()
+        results.append((timings, errors, payload))
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        catalog = [
+            (rng.choice(PRODUCT_TYPES), product_id)
+            for product_id in range(1, options['products'] + 1)
+        ]
+        clicks = options['clicks']
+        legacy = options['cart_format'] == 'legacy'
+
+        for backend in options['engines'].split(','):
+            backend = backend.strip()
+            store_class = import_module(f'django.contrib.sessions.backends.{backend}').SessionStore
+            results = []
+            threads = [
+                threading.Thread(
+                    target=self._shopper,
+                    args=(store_class, [rng.choice(catalog) for _ in range(clicks)], legacy, results),
+                )
+                for _ in range(options['shoppers'])
+            ]
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+
+            timings = sorted(ms for shopper_timings, _, _ in results for ms in shopper_timings)
+            errors = sum(shopper_errors for _, shopper_errors, _ in results)
+            payload = statistics.mean(size for _, _, size in results) if results else 0
+            if not timings:
+                continue
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            self.stdout.write(
+                f'{backend}: {len(timings) / elapsed:.0f} clicks/s, '
+                f'p50 {statistics.median(timings):.2f} ms, p95 {p95:.2f} ms, '
+                f'{errors} locked, session {payload:.0f} bytes'
+            )
@@ -0,0 +1,17 @@
+"""
+Management command to sweep expired cart stock reservations.
+
+Expired holds are already ignored by availability checks; this keeps the
+reservation table small. Schedule it every few minutes (e.g. via cron).
+"""
+from django.core.management.base import BaseCommand
+
+from orders.services import release_expired_reservations
+
+
+class Command(BaseCommand):
+    help = 'Delete cart stock reservations whose hold has expired.'
+
+    def handle(self, *args, **options):
+        released = release_expired_reservations()
+        self.stdout.write(self.style.SUCCESS(f'Released {released} expired reservation(s).'))
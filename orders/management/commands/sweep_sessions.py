@@ -0,0 +1,34 @@
+"""
+Management command to delete expired sessions in small batches.
+
+Replaces Django's clearsessions for this project: the single large
+DELETE it issues locks SQLite for every concurrent cart click. Guest
+carts left behind by expired sessions are deleted too. Schedule it
+hourly (e.g. via cron).
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from orders.cart import delete_abandoned_carts
+from orders.sessions import SWEEP_BATCH_SIZE, sweep_expired_sessions
+
+
+class Command(BaseCommand):
+    help = 'Delete expired sessions in batches without long database locks.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=SWEEP_BATCH_SIZE,
+            help=f'Sessions deleted per statement (default: {SWEEP_BATCH_SIZE}).',
+        )
+
+    def handle(self, *args, **options):
+        deleted = sweep_expired_sessions(options['batch_size'])
+        if deleted is None:
+            self.stdout.write(f'{settings.SESSION_ENGINE} keeps no server-side sessions to sweep.')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired session(s).'))
+        carts = delete_abandoned_carts()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {carts} abandoned guest cart(s).'))
@@ -12,6 +12,15 @@ class Order(models.Model):
         ('cancelled', 'Cancelled'),
     ]
 
+    # Allowed status changes; delivered and cancelled orders are final.
+    ALLOWED_TRANSITIONS = {
+        'pending': ['processing', 'cancelled'],
+        'processing': ['shipped', 'cancelled'],
+        'shipped': ['delivered'],
+        'delivered': [],
+        'cancelled': [],
+    }
+
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='orders')
     order_date = models.DateTimeField(auto_now_add=True)
     total_amount = models.DecimalField(max_digits=10, decimal_places=2)
@@ -25,6 +34,62 @@ class Order(models.Model):
     def __str__(self):
         return f"Order #{self.id} - {self.user.username}"
 
+    @classmethod
+    def source_statuses(cls, status):
+        """
+        List the statuses an order may move to ``status`` from.
+
+        Args:
+            status: Target status
+
+        Returns:
+            list: Statuses with an allowed transition to ``status``
+        """
+        return [
+            source for source, targets in cls.ALLOWED_TRANSITIONS.items()
+            if status in targets
+        ]
+
+    def can_transition_to(self, status):
+        """
+        Check whether this order may move to ``status``.
+
+        Args:
+            status: Target status
+
+        Returns:
+            bool: True if the transition is allowed
+        """
+        return status in self.ALLOWED_TRANSITIONS.get(self.status, [])
+
+    def next_status_choices(self):
+        """
+        Get (value, label) pairs for the statuses this order can move to.
+
+        Returns:
+            list: Status choices allowed from the current status
+        """
+        allowed = self.ALLOWED_TRANSITIONS.get(self.status, [])
+        return [choice for choice in self.STATUS_CHOICES if choice[0] in allowed]
+
+
+class OrderStatusHistory(models.Model):
+    """
+    Record of a single order status change and who made it.
+    """
+    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='status_history')
+    from_status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    to_status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    changed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    changed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-changed_at']
+        verbose_name_plural = 'Order status history'
+
+    def __str__(self):
+        return f"Order #{self.order_id}: {self.from_status} -> {self.to_status}"
+
 
 class OrderItem(models.Model):
     order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='items')
@@ -39,8 +104,81 @@ class OrderItem(models.Model):
 
     @property
     def subtotal(self):
+        # The admin inline's blank form has neither value yet
+        if self.quantity is None or self.price is None:
+            return None
         return self.quantity * self.price
 
     def __str__(self):
         product_name = self.supplement.name if self.supplement else self.protein_bar.name
         return f"{product_name} x{self.quantity}"
+
+
+class StockReservation(models.Model):
+    """
+    Time-limited hold on product stock for an item sitting in a cart.
+
+    Active reservations are subtracted from stock when computing what other
+    shoppers can add; expired rows are ignored and removed by the
+    release_expired_reservations command.
+    """
+    PRODUCT_TYPE_CHOICES = [
+        ('supplement', 'Supplement'),
+        ('protein_bar', 'Protein Bar'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='stock_reservations')
+    product_type = models.CharField(max_length=20, choices=PRODUCT_TYPE_CHOICES)
+    product_id = models.PositiveIntegerField()
+    quantity = models.PositiveIntegerField()
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        unique_together = ['user', 'product_type', 'product_id']
+        indexes = [
+            models.Index(fields=['product_type', 'product_id', 'expires_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.quantity} x {self.product_type} #{self.product_id} for {self.user.username}"
+
+
+class Cart(models.Model):
+    """
+    A shopper's persistent cart.
+
+    Signed-in users have one cart each; guest carts have no user and are
+    found through the cart_id stored in their session until they sign in
+    and the cart is merged into their own.
+    """
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, null=True, blank=True, related_name='cart'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    def __str__(self):
+        return f"Cart of {self.user.username}" if self.user_id else f"Guest cart #{self.pk}"
+
+
+class CartItem(models.Model):
+    """
+    Quantity of one product in a cart.
+    """
+    cart = models.ForeignKey(Cart, on_delete=models.CASCADE, related_name='items')
+    product_type = models.CharField(max_length=20, choices=StockReservation.PRODUCT_TYPE_CHOICES)
+    product_id = models.PositiveIntegerField()
+    quantity = models.PositiveIntegerField(default=1)
+    added_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['added_at', 'pk']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['cart', 'product_type', 'product_id'],
+                name='unique_cart_item_product',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.quantity} x {self.product_type} #{self.product_id}"
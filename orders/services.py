@@ -0,0 +1,267 @@
+"""
+Order services: cart stock reservations and order status transitions.
+
+Reservations hold stock for items in a shopper's cart for
+CART_RESERVATION_MINUTES so flash-sale carts don't fill with items that
+vanish at checkout. Available-to-sell is stock minus the other shoppers'
+active reservations.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from products.models import PRODUCT_MODELS
+from products.services import apply_stock_adjustments
+
+from .models import Order, OrderItem, OrderStatusHistory, StockReservation
+
+
+def reservations_enabled():
+    """
+    Check whether cart reservations are switched on.
+
+    Returns:
+        bool: True if CART_RESERVATION_MINUTES is a positive number
+    """
+    return getattr(settings, 'CART_RESERVATION_MINUTES', 0) > 0
+
+
+def _active_reservations(product_type, exclude_user=None):
+    """
+    Build a queryset of unexpired reservations for a product type.
+
+    Args:
+        product_type: 'supplement' or 'protein_bar'
+        exclude_user: Optional user whose own reservations are ignored
+
+    Returns:
+        QuerySet: Active StockReservation rows
+    """
+    reservations = StockReservation.objects.filter(
+        product_type=product_type,
+        expires_at__gt=timezone.now(),
+    )
+    if exclude_user is not None:
+        reservations = reservations.exclude(user=exclude_user)
+    return reservations
+
+
+def with_available_quantity(queryset, product_type, exclude_user=None):
+    """
+    Annotate products with available_quantity (stock minus active holds).
+
+    The reserved total is a correlated subquery on the
+    (product_type, product_id, expires_at) index, so listing pages stay
+    a single query.
+
+    Args:
+        queryset: Supplement or ProteinBar queryset
+        product_type: 'supplement' or 'protein_bar'
+        exclude_user: Optional user whose own reservations still count as available
+
+    Returns:
+        QuerySet: Annotated queryset
+    """
+    if not reservations_enabled():
+        return queryset.annotate(available_quantity=F('stock_quantity'))
+
+    reserved = _active_reservations(product_type, exclude_user).filter(
+        product_id=OuterRef('pk')
+    ).values('product_id').annotate(total=Sum('quantity')).values('total')
+    return queryset.annotate(
+        available_quantity=F('stock_quantity') - Coalesce(
+            Subquery(reserved, output_field=IntegerField()), Value(0)
+        )
+    )
+
+
+def available_quantity(product, product_type, exclude_user=None):
+    """
+    Compute available-to-sell stock for a single product.
+
+    Args:
+        product: Product instance
+        product_type: 'supplement' or 'protein_bar'
+        exclude_user: Optional user whose own reservations still count as available
+
+    Returns:
+        int: Units that can still be added to a cart
+    """
+    if not reservations_enabled():
+        return product.stock_quantity
+    reserved = _active_reservations(product_type, exclude_user).filter(
+        product_id=product.pk
+    ).aggregate(total=Sum('quantity'))['total'] or 0
+    return product.stock_quantity - reserved
+
+
+def reserve_stock(user, product_type, product_id, quantity):
+    """
+    Create or refresh a user's reservation for a cart line.
+
+    The product row is locked while the check and upsert run, so two
+    shoppers cannot both claim the last unit.
+
+    Args:
+        user: Shopper holding the cart
+        product_type: 'supplement' or 'protein_bar'
+        product_id: Product primary key
+        quantity: Total quantity of this product in the cart
+
+    Returns:
+        int or None: None if reserved, otherwise the units still available
+    """
+    if not reservations_enabled():
+        return None
+
+    model = PRODUCT_MODELS[product_type]
+    with transaction.atomic():
+        product = model.objects.select_for_update().get(pk=product_id)
+        available = available_quantity(product, product_type, exclude_user=user)
+        if quantity > available:
+            return max(available, 0)
+
+        StockReservation.objects.update_or_create(
+            user=user,
+            product_type=product_type,
+            product_id=product_id,
+            defaults={
+                'quantity': quantity,
+                'expires_at': timezone.now() + timedelta(
+                    minutes=settings.CART_RESERVATION_MINUTES
+                ),
+            },
+        )
+    return None
+
+
+def release_reservation(user, product_type, product_id):
+    """
+    Drop a user's reservation for one product.
+
+    Args:
+        user: Shopper holding the cart
+        product_type: 'supplement' or 'protein_bar'
+        product_id: Product primary key
+    """
+    StockReservation.objects.filter(
+        user=user, product_type=product_type, product_id=product_id
+    ).delete()
+
+
+def release_user_reservations(user):
+    """
+    Drop all of a user's reservations (e.g. after checkout).
+
+    Args:
+        user: Shopper whose reservations are released
+    """
+    StockReservation.objects.filter(user=user).delete()
+
+
+def release_expired_reservations():
+    """
+    Delete reservations whose hold has expired.
+
+    Uses the expires_at index, so the sweep only touches expired rows.
+
+    Returns:
+        int: Number of reservations deleted
+    """
+    deleted, _ = StockReservation.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted
+
+
+def _restock_cancelled_orders(order_ids, user=None):
+    """
+    Return the items of cancelled orders to stock.
+
+    Stock is restored through apply_stock_adjustments (F() updates,
+    'cancellation' ledger entries, one low stock alert evaluation for the
+    batch). Must run inside the transaction that cancels the orders.
+
+    Args:
+        order_ids: Primary keys of the orders just cancelled
+        user: Staff user performing the cancellation, if any
+    """
+    adjustments = []
+    items = OrderItem.objects.filter(order_id__in=order_ids).values_list(
+        'supplement_id', 'protein_bar_id', 'quantity'
+    )
+    for supplement_id, protein_bar_id, quantity in items:
+        if supplement_id:
+            adjustments.append(('supplement', supplement_id, quantity))
+        elif protein_bar_id:
+            adjustments.append(('protein_bar', protein_bar_id, quantity))
+
+    note = 'Cancelled order(s) ' + ', '.join(f'#{pk}' for pk in order_ids)
+    apply_stock_adjustments(adjustments, kind='cancellation', note=note[:255], user=user)
+
+
+def transition_orders(order_ids, status, user=None):
+    """
+    Move many orders to a new status, following Order.ALLOWED_TRANSITIONS.
+
+    Orders whose current status cannot move to ``status`` are left alone.
+    The eligible orders are updated with a single
+    ``UPDATE ... WHERE status IN (...)``, one history row per order is
+    written with bulk_create, and cancelled orders are restocked, all in
+    one transaction.
+
+    Args:
+        order_ids: Iterable of Order primary keys
+        status: Target status
+        user: Staff user making the change, if any
+
+    Returns:
+        list: Primary keys of the orders that changed status
+    """
+    sources = Order.source_statuses(status)
+    if not sources:
+        return []
+
+    with transaction.atomic():
+        current = dict(
+            Order.objects.select_for_update().filter(
+                pk__in=list(order_ids), status__in=sources
+            ).values_list('pk', 'status')
+        )
+        if not current:
+            return []
+
+        Order.objects.filter(pk__in=list(current), status__in=sources).update(status=status)
+        OrderStatusHistory.objects.bulk_create([
+            OrderStatusHistory(
+                order_id=pk,
+                from_status=from_status,
+                to_status=status,
+                changed_by=user,
+            )
+            for pk, from_status in current.items()
+        ])
+
+        if status == 'cancelled':
+            _restock_cancelled_orders(list(current), user=user)
+
+    return list(current)
+
+
+def cancel_orders(order_ids, user=None):
+    """
+    Cancel orders and return their items to stock in one transaction.
+
+    Only orders whose status allows cancellation are changed, so repeating
+    a cancellation never restocks twice.
+
+    Args:
+        order_ids: Iterable of Order primary keys
+        user: Staff user performing the cancellation, if any
+
+    Returns:
+        list: Primary keys of the orders that were cancelled
+    """
+    return transition_orders(order_ids, 'cancelled', user=user)
@@ -0,0 +1,57 @@
+"""
+Session housekeeping for cart traffic.
+
+The configured SESSION_ENGINE decides where carts live (see the
+SESSION_BACKEND setting). Database-backed engines accumulate expired
+rows; they are deleted in small batches so the sweep never holds
+SQLite's single write lock long enough to stall cart clicks.
+"""
+from importlib import import_module
+
+from django.conf import settings
+from django.utils import timezone
+
+SWEEP_BATCH_SIZE = 500
+
+
+def session_store_class():
+    """
+    Return the SessionStore class of the configured session engine.
+
+    Returns:
+        type: SessionStore for settings.SESSION_ENGINE
+    """
+    return import_module(settings.SESSION_ENGINE).SessionStore
+
+
+def sweep_expired_sessions(batch_size=SWEEP_BATCH_SIZE):
+    """
+    Delete expired sessions for the configured engine.
+
+    Engines without server-side rows (cache, signed cookies) fall back to
+    the engine's own clear_expired, which is a no-op for them.
+
+    Args:
+        batch_size: Rows deleted per statement for database engines
+
+    Returns:
+        int or None: Sessions deleted, or None if the engine keeps no rows
+    """
+    store_class = session_store_class()
+    if not hasattr(store_class, 'get_model_class'):
+        store_class.clear_expired()
+        return None
+
+    session_model = store_class.get_model_class()
+    now = timezone.now()
+    deleted = 0
+    while True:
+        keys = list(
+            session_model.objects.filter(expire_date__lt=now).values_list(
+                'session_key', flat=True
+            )[:batch_size]
+        )
+        if not keys:
+            return deleted
+        session_model.objects.filter(session_key__in=keys).delete()
+        deleted += len(keys)
@@ -0,0 +1,29 @@
+"""
+Signal handlers for the orders app.
+
+Merges a guest's cart into the user's cart when they log in.
+"""
+from django.contrib.auth.signals import user_logged_in
+from django.dispatch import receiver
+
+from .cart import merge_guest_cart
+from .services import reserve_stock
+
+
+@receiver(user_logged_in)
+def merge_cart_on_login(request, user, **kwargs):
+    """
+    Merge the guest cart and reserve stock for the merged lines.
+
+    Reservations are best effort: a line that can no longer be fully
+    reserved stays in the cart and is checked again at checkout.
+
+    Args:
+        request: Login request (None for programmatic logins)
+        user: User who logged in
+        **kwargs: Additional signal arguments, including sender
+    """
+    if request is None or not hasattr(request, 'session'):
+        return
+    for product_type, product_id, quantity in merge_guest_cart(request, user):
+        reserve_stock(user, product_type, product_id, quantity)
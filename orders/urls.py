@@ -15,4 +15,5 @@ urlpatterns = [
     path('admin/orders/', views.admin_order_list, name='admin_order_list'),
     path('admin/orders/<int:order_id>/', views.admin_order_detail, name='admin_order_detail'),
     path('admin/orders/<int:order_id>/update-status/', views.update_order_status, name='update_order_status'),
+    path('admin/orders/bulk-update-status/', views.bulk_update_order_status, name='bulk_update_order_status'),
 ]
@@ -3,13 +3,39 @@ from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
 from django.core.mail import send_mail
 from django.conf import settings
+from django.db import transaction
 
-from products.models import Supplement, ProteinBar
+from diet_planner.routers import replica_reads
+from products.models import PRODUCT_MODELS, Supplement, ProteinBar
+from products.services import StockAdjustmentError, apply_stock_adjustments
 
+from .cart import cart_contents, get_cart
 from .models import Order, OrderItem
+from .services import (
+    available_quantity,
+    release_reservation,
+    release_user_reservations,
+    reserve_stock,
+    transition_orders,
+)
+
+
+def _hold_stock(request, product, product_type, quantity):
+    """
+    Reserve stock for a signed-in shopper, or just check it for a guest.
+
+    Guests hold no reservations; their lines are reserved when the cart
+    is merged on login and checked again at checkout.
+
+    Returns:
+        int or None: None if the quantity can be held, otherwise the units available
+    """
+    if request.user.is_authenticated:
+        return reserve_stock(request.user, product_type, product.pk, quantity)
+    available = available_quantity(product, product_type)
+    return None if quantity <= available else max(available, 0)
 
 
-@login_required
 def add_to_cart(request, product_type, product_id):
     if product_type == 'supplement':
         product = get_object_or_404(Supplement, pk=product_id)
@@ -23,179 +49,156 @@ def add_to_cart(request, product_type, product_id):
         messages.error(request, 'This product is out of stock.')
         return redirect('products:product_list')
 
-    if 'cart' not in request.session:
-        request.session['cart'] = []
+    cart = get_cart(request)
+    quantity = cart.quantity(product_type, product_id) + 1
 
-    cart = request.session['cart']
-
-    for item in cart:
-        if item.get('type') == product_type and item.get('id') == product_id:
-            item['quantity'] += 1
-            break
-    else:
-        cart.append({
-            'type': product_type,
-            'id': product_id,
-            'quantity': 1
-        })
+    available = _hold_stock(request, product, product_type, quantity)
+    if available is not None:
+        messages.error(request, f'Only {available} {product.name} available right now.')
+        return redirect('products:product_list')
 
-    request.session['cart'] = cart
+    cart.set_quantity(product_type, product_id, quantity)
     messages.success(request, f'{product.name} added to cart!')
     return redirect('products:product_list')
 
 
-@login_required
 def view_cart(request):
-    cart_items = []
-    cart_total = 0
-
-    if 'cart' in request.session:
-        for item in request.session['cart']:
-            product_type = item.get('type')
-            product_id = item.get('id')
-            quantity = item.get('quantity', 1)
-
-            if product_type == 'supplement':
-                try:
-                    product = Supplement.objects.get(id=product_id)
-                    item_total = float(product.price) * quantity
-                    cart_items.append({
-                        'product': product,
-                        'type': 'supplement',
-                        'quantity': quantity,
-                        'total': item_total
-                    })
-                    cart_total += item_total
-                except Supplement.DoesNotExist:
-                    continue
-            elif product_type == 'protein_bar':
-                try:
-                    product = ProteinBar.objects.get(id=product_id)
-                    item_total = float(product.price) * quantity
-                    cart_items.append({
-                        'product': product,
-                        'type': 'protein_bar',
-                        'quantity': quantity,
-                        'total': item_total
-                    })
-                    cart_total += item_total
-                except ProteinBar.DoesNotExist:
-                    continue
+    cart_items, cart_total = cart_contents(get_cart(request).lines())
 
     context = {
         'cart_items': cart_items,
-        'cart_total': round(cart_total, 2),
+        'cart_total': cart_total,
     }
     return render(request, 'orders/cart.html', context)
 
 
-@login_required
 def remove_from_cart(request, product_type, product_id):
-    if 'cart' in request.session:
-        cart = request.session['cart']
-        request.session['cart'] = [item for item in cart
-                                   if not (item.get('type') == product_type and item.get('id') == product_id)]
-        messages.success(request, 'Item removed from cart.')
+    get_cart(request).remove(product_type, product_id)
+    if request.user.is_authenticated:
+        release_reservation(request.user, product_type, product_id)
+    messages.success(request, 'Item removed from cart.')
     return redirect('orders:view_cart')
 
 
-@login_required
 def update_cart_quantity(request, product_type, product_id):
     if request.method == 'POST':
         quantity = int(request.POST.get('quantity', 1))
         if quantity <= 0:
             return remove_from_cart(request, product_type, product_id)
 
-        if 'cart' in request.session:
-            cart = request.session['cart']
-            for item in cart:
-                if item.get('type') == product_type and item.get('id') == product_id:
-                    item['quantity'] = quantity
-                    break
-            request.session['cart'] = cart
+        cart = get_cart(request)
+        model = PRODUCT_MODELS.get(product_type)
+        if model and cart.quantity(product_type, product_id):
+            product = get_object_or_404(model, pk=product_id)
+            available = _hold_stock(request, product, product_type, quantity)
+            if available is not None:
+                messages.error(request, f'Only {available} of this item available right now.')
+                return redirect('orders:view_cart')
+            cart.set_quantity(product_type, product_id, quantity)
 
     return redirect('orders:view_cart')
 
 
+def _lock_products(cart_items):
+    """
+    Lock the products in a cart for the current transaction.
+
+    Rows are locked one product type at a time in primary key order, so
+    concurrent checkouts acquire them in the same order.
+
+    Returns:
+        dict: (product_type, product_id) -> locked product
+    """
+    ids = {}
+    for item in cart_items:
+        ids.setdefault(item['type'], []).append(item['product'].pk)
+    return {
+        (product_type, product.pk): product
+        for product_type in sorted(ids)
+        for product in PRODUCT_MODELS[product_type].objects.select_for_update().filter(
+            pk__in=ids[product_type]
+        ).order_by('pk')
+    }
+
+
 @login_required
 def checkout(request):
-    if 'cart' not in request.session or not request.session['cart']:
+    cart = get_cart(request)
+    lines = cart.lines()
+    if not lines:
         messages.error(request, 'Your cart is empty.')
         return redirect('orders:view_cart')
 
+    cart_items, cart_total = cart_contents(lines)
+    context = {
+        'cart_items': cart_items,
+        'cart_total': cart_total,
+    }
+
     if request.method == 'POST':
         shipping_address = request.POST.get('shipping_address')
         phone = request.POST.get('phone')
 
         if not shipping_address or not phone:
             messages.error(request, 'Please provide shipping address and phone number.')
-            return render(request, 'orders/checkout.html')
-
-        cart = request.session['cart']
-        total_amount = 0
-        order_items_data = []
-
-        for item in cart:
-            product_type = item.get('type')
-            product_id = item.get('id')
-            quantity = item.get('quantity', 1)
-
-            if product_type == 'supplement':
-                try:
-                    product = Supplement.objects.get(id=product_id)
-                    if product.stock_quantity < quantity:
-                        messages.error(request, f'Insufficient stock for {product.name}.')
-                        return redirect('orders:view_cart')
-                except Supplement.DoesNotExist:
-                    continue
-            elif product_type == 'protein_bar':
-                try:
-                    product = ProteinBar.objects.get(id=product_id)
-                    if product.stock_quantity < quantity:
-                        messages.error(request, f'Insufficient stock for {product.name}.')
-                        return redirect('orders:view_cart')
-                except ProteinBar.DoesNotExist:
-                    continue
-            else:
-                continue
-
-            item_total = float(product.price) * quantity
-            total_amount += item_total
-            order_items_data.append({
-                'product': product,
-                'product_type': product_type,
-                'quantity': quantity,
-                'price': product.price
-            })
-
-        order = Order.objects.create(
-            user=request.user,
-            total_amount=total_amount,
-            shipping_address=shipping_address,
-            phone=phone
-        )
-
-        for item_data in order_items_data:
-            if item_data['product_type'] == 'supplement':
-                OrderItem.objects.create(
-                    order=order,
-                    supplement=item_data['product'],
-                    quantity=item_data['quantity'],
-                    price=item_data['price']
+            return render(request, 'orders/checkout.html', context)
+
+        try:
+            with transaction.atomic():
+                # The rows stay locked until the decrement below commits, so
+                # a concurrent checkout cannot pass the same availability check
+                products = _lock_products(cart_items)
+                total_amount = 0
+                order_items_data = []
+                for item in cart_items:
+                    product_type = item['type']
+                    quantity = item['quantity']
+                    product = products.get((product_type, item['product'].pk))
+                    if product is None:
+                        raise StockAdjustmentError(f"{item['product'].name} is no longer available.")
+                    if available_quantity(product, product_type, exclude_user=request.user) < quantity:
+                        raise StockAdjustmentError(f'Insufficient stock for {product.name}.')
+
+                    total_amount += float(product.price) * quantity
+                    order_items_data.append({
+                        'product': product,
+                        'product_type': product_type,
+                        'quantity': quantity,
+                        'price': product.price
+                    })
+
+                order = Order.objects.create(
+                    user=request.user,
+                    total_amount=total_amount,
+                    shipping_address=shipping_address,
+                    phone=phone
                 )
-                item_data['product'].stock_quantity -= item_data['quantity']
-                item_data['product'].save()
-            elif item_data['product_type'] == 'protein_bar':
-                OrderItem.objects.create(
-                    order=order,
-                    protein_bar=item_data['product'],
-                    quantity=item_data['quantity'],
-                    price=item_data['price']
+                OrderItem.objects.bulk_create([
+                    OrderItem(
+                        order=order,
+                        quantity=item_data['quantity'],
+                        price=item_data['price'],
+                        **{item_data['product_type']: item_data['product']},
+                    )
+                    for item_data in order_items_data
+                ])
+                # Locked F() decrement plus 'sale' ledger rows, so concurrent
+                # restocks and cancellations are never overwritten
+                apply_stock_adjustments(
+                    [
+                        (item_data['product_type'], item_data['product'].pk, -item_data['quantity'])
+                        for item_data in order_items_data
+                    ],
+                    kind='sale',
+                    note=f'Order #{order.id}',
+                    user=request.user,
                 )
-                item_data['product'].stock_quantity -= item_data['quantity']
-                item_data['product'].save()
+        except StockAdjustmentError as e:
+            messages.error(request, str(e))
+            return redirect('orders:view_cart')
 
-        request.session['cart'] = []
+        cart.clear()
+        release_user_reservations(request.user)
 
         try:
             message = (
@@ -218,7 +221,7 @@ def checkout(request):
         messages.success(request, f'Order placed successfully! Order ID: #{order.id}')
         return redirect('orders:order_detail', order_id=order.id)
 
-    return render(request, 'orders/checkout.html')
+    return render(request, 'orders/checkout.html', context)
 
 
 @login_required
@@ -238,9 +241,14 @@ def is_admin(user):
 
 
 @user_passes_test(is_admin)
+@replica_reads
 def admin_order_list(request):
-    orders = Order.objects.all().order_by('-order_date')
-    return render(request, 'orders/admin/order_list.html', {'orders': orders})
+    orders = Order.objects.select_related('user').order_by('-order_date')
+    return render(
+        request,
+        'orders/admin/order_list.html',
+        {'orders': orders, 'status_choices': Order.STATUS_CHOICES}
+    )
 
 
 @user_passes_test(is_admin)
@@ -254,8 +262,33 @@ def update_order_status(request, order_id):
     order = get_object_or_404(Order, id=order_id)
     if request.method == 'POST':
         status = request.POST.get('status')
-        if status in dict(Order.STATUS_CHOICES):
-            order.status = status
-            order.save()
+        if status == order.status:
+            messages.info(request, 'Order status unchanged.')
+        elif order.can_transition_to(status):
+            transition_orders([order.id], status, user=request.user)
             messages.success(request, 'Order status updated successfully!')
+        else:
+            messages.error(
+                request,
+                f'Cannot change order status from {order.get_status_display()} to {status}.'
+            )
     return redirect('orders:admin_order_detail', order_id=order.id)
+
+
+@user_passes_test(is_admin)
+def bulk_update_order_status(request):
+    if request.method == 'POST':
+        status = request.POST.get('status')
+        order_ids = [pk for pk in request.POST.getlist('order_ids') if pk.isdigit()]
+        if status not in dict(Order.STATUS_CHOICES) or not order_ids:
+            messages.error(request, 'Select at least one order and a valid status.')
+        else:
+            updated = transition_orders(order_ids, status, user=request.user)
+            skipped = len(order_ids) - len(updated)
+            messages.success(request, f'{len(updated)} order(s) updated.')
+            if skipped:
+                messages.warning(
+                    request,
+                    f'{skipped} order(s) skipped because they cannot move to that status.'
+                )
+    return redirect('orders:admin_order_list')
@@ -1,9 +1,19 @@
 from django.contrib import admin
-from .models import Supplement, ProteinBar
+from .models import Supplement, ProteinBar, StockMovement, StockSnapshot
+from .services import record_stock_change
+
+
+class StockLedgerMixin:
+    """Record stock edits made through the Django admin in the ledger."""
+
+    def save_model(self, request, obj, form, change):
+        previous_stock = form.initial.get('stock_quantity', 0) if change else 0
+        super().save_model(request, obj, form, change)
+        record_stock_change(obj, previous_stock or 0, note='Django admin edit', user=request.user)
 
 
 @admin.register(Supplement)
-class SupplementAdmin(admin.ModelAdmin):
+class SupplementAdmin(StockLedgerMixin, admin.ModelAdmin):
     list_display = ['name', 'brand', 'price', 'stock_quantity', 'threshold', 'is_low_stock', 'created_at']
     list_filter = ['brand', 'category', 'created_at']
     search_fields = ['name', 'brand', 'description']
@@ -16,8 +26,11 @@ class SupplementAdmin(admin.ModelAdmin):
 
 
 @admin.register(ProteinBar)
-class ProteinBarAdmin(admin.ModelAdmin):
-    list_display = ['name', 'flavor', 'price', 'stock_quantity', 'threshold', 'is_low_stock', 'created_at']
+class ProteinBarAdmin(StockLedgerMixin, admin.ModelAdmin):
+    list_display = [
+        'name', 'flavor', 'protein_g', 'calories', 'price',
+        'stock_quantity', 'threshold', 'is_low_stock', 'created_at',
+    ]
     list_filter = ['flavor', 'created_at']
     search_fields = ['name', 'flavor', 'description']
     readonly_fields = ['created_at', 'updated_at']
@@ -26,3 +39,33 @@ class ProteinBarAdmin(admin.ModelAdmin):
         return obj.is_low_stock()
     is_low_stock.boolean = True
     is_low_stock.short_description = 'Low Stock'
+
+
+@admin.register(StockMovement)
+class StockMovementAdmin(admin.ModelAdmin):
+    list_display = ['product', 'kind', 'quantity_delta', 'note', 'created_by', 'created_at']
+    list_filter = ['kind', 'content_type', 'created_at']
+    search_fields = ['note']
+    readonly_fields = ['content_type', 'object_id', 'kind', 'quantity_delta', 'note', 'created_by', 'created_at']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(StockSnapshot)
+class StockSnapshotAdmin(admin.ModelAdmin):
+    list_display = ['product', 'quantity', 'last_movement_id', 'taken_at']
+    list_filter = ['content_type', 'taken_at']
+    readonly_fields = ['content_type', 'object_id', 'quantity', 'last_movement_id', 'taken_at']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
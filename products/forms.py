@@ -1,5 +1,6 @@
 from django import forms
-from .models import Supplement, ProteinBar
+from .models import PRODUCT_MODELS, Supplement, ProteinBar
+from .nutrition import parse_protein_grams, parse_serving_grams
 
 
 class SupplementForm(forms.ModelForm):
@@ -19,6 +20,12 @@ class SupplementForm(forms.ModelForm):
             'category': forms.TextInput(attrs={'class': 'form-control'}),
         }
 
+    def clean_serving_size(self):
+        serving_size = self.cleaned_data['serving_size'].strip()
+        if serving_size and parse_serving_grams(serving_size) is None:
+            raise forms.ValidationError('Enter the serving weight, e.g. "1 scoop (30 g)".')
+        return serving_size
+
 
 class ProteinBarForm(forms.ModelForm):
     class Meta:
@@ -36,3 +43,91 @@ class ProteinBarForm(forms.ModelForm):
             'protein_content': forms.TextInput(attrs={'class': 'form-control'}),
             'calories': forms.NumberInput(attrs={'class': 'form-control'}),
         }
+
+    def clean_protein_content(self):
+        protein_content = self.cleaned_data['protein_content'].strip()
+        if protein_content and parse_protein_grams(protein_content) is None:
+            raise forms.ValidationError('Enter the protein per bar in grams, e.g. "20g".')
+        return protein_content
+
+    def clean_calories(self):
+        calories = self.cleaned_data.get('calories')
+        if calories is not None and calories < 0:
+            raise forms.ValidationError('Calories cannot be negative.')
+        return calories
+
+
+class ProteinBarFilterForm(forms.Form):
+    min_protein = forms.FloatField(
+        required=False,
+        min_value=0,
+        label='Min protein (g)',
+        widget=forms.NumberInput(attrs={'class': 'form-control form-control-sm', 'step': '1'})
+    )
+    max_calories = forms.IntegerField(
+        required=False,
+        min_value=0,
+        label='Max calories',
+        widget=forms.NumberInput(attrs={'class': 'form-control form-control-sm'})
+    )
+
+    def filter(self, queryset):
+        """Narrow a ProteinBar queryset using the indexed nutrition columns."""
+        if not self.is_valid():
+            return queryset
+        if self.cleaned_data['min_protein'] is not None:
+            queryset = queryset.filter(protein_g__gte=self.cleaned_data['min_protein'])
+        if self.cleaned_data['max_calories'] is not None:
+            queryset = queryset.filter(calories__lte=self.cleaned_data['max_calories'])
+        return queryset
+
+
+class BulkStockAdjustmentForm(forms.Form):
+    KIND_CHOICES = [
+        ('restock', 'Restock (delivery received)'),
+        ('adjustment', 'Adjustment (count correction, damage)'),
+    ]
+
+    kind = forms.ChoiceField(
+        choices=KIND_CHOICES,
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
+    lines = forms.CharField(
+        help_text='One change per line: type,id,delta (type is supplement or protein_bar).',
+        widget=forms.Textarea(attrs={
+            'class': 'form-control',
+            'rows': 12,
+            'placeholder': 'supplement,3,50\nprotein_bar,12,-2',
+        })
+    )
+    note = forms.CharField(
+        max_length=255,
+        required=False,
+        widget=forms.TextInput(attrs={'class': 'form-control'})
+    )
+
+    def clean_lines(self):
+        adjustments = []
+        errors = []
+        for number, raw_line in enumerate(self.cleaned_data['lines'].splitlines(), start=1):
+            line = raw_line.strip()
+            if not line or line.startswith('#'):
+                continue
+            parts = [part.strip() for part in line.split(',')]
+            if len(parts) != 3:
+                errors.append(f'Line {number}: expected type,id,delta.')
+                continue
+            product_type, product_id, delta = parts
+            if product_type not in PRODUCT_MODELS:
+                errors.append(f'Line {number}: unknown product type "{product_type}".')
+                continue
+            try:
+                adjustments.append((product_type, int(product_id), int(delta)))
+            except ValueError:
+                errors.append(f'Line {number}: id and delta must be whole numbers.')
+
+        if errors:
+            raise forms.ValidationError(errors)
+        if not adjustments:
+            raise forms.ValidationError('Enter at least one stock change.')
+        return adjustments
@@ -0,0 +1,53 @@
+"""
+Management command to reconcile stored stock with the movement ledger.
+
+Reports products whose stock_quantity differs from the ledger, or prints
+ledger-derived stock levels as of a given date.
+"""
+from datetime import datetime, time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from products.models import PRODUCT_MODELS
+from products.services import reconcile_stock, stock_as_of
+
+
+class Command(BaseCommand):
+    help = 'Compare stock_quantity with the stock movement ledger.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--as-of',
+            metavar='YYYY-MM-DD',
+            help='Print stock levels at the end of the given day instead of reconciling.',
+        )
+
+    def handle(self, *args, **options):
+        if options['as_of']:
+            self.print_stock_as_of(options['as_of'])
+            return
+
+        mismatches = reconcile_stock()
+        for row in mismatches:
+            self.stdout.write(
+                f"{row['product_type']} #{row['product_id']} {row['name']}: "
+                f"ledger={row['ledger']} actual={row['actual']}"
+            )
+        if mismatches:
+            self.stdout.write(self.style.WARNING(f'{len(mismatches)} product(s) out of sync.'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Stock matches the ledger.'))
+
+    def print_stock_as_of(self, value):
+        try:
+            day = datetime.strptime(value, '%Y-%m-%d').date()
+        except ValueError as e:
+            raise CommandError('--as-of must be formatted as YYYY-MM-DD') from e
+        when = timezone.make_aware(datetime.combine(day, time.max))
+
+        for product_type, model in PRODUCT_MODELS.items():
+            levels = stock_as_of(product_type, when)
+            names = dict(model.objects.values_list('pk', 'name'))
+            for pk, quantity in sorted(levels.items()):
+                self.stdout.write(f'{product_type} #{pk} {names[pk]}: {quantity}')
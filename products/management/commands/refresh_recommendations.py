@@ -0,0 +1,17 @@
+"""
+Management command to rebuild the cached product recommendations.
+
+Catalog edits refresh recommendations automatically; run this after bulk
+imports or from cron to warm the cache after a deploy.
+"""
+from django.core.management.base import BaseCommand
+
+from products.recommendations import refresh_recommendations
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the ranked product recommendations for every goal and calorie bucket.'
+
+    def handle(self, *args, **options):
+        ranked = refresh_recommendations()
+        self.stdout.write(self.style.SUCCESS(f'Cached recommendations for {len(ranked)} bucket(s).'))
@@ -0,0 +1,17 @@
+"""
+Management command to checkpoint stock levels from the movement ledger.
+
+Intended to run periodically (e.g. nightly via cron) so stock lookups only
+replay the movements recorded since the last snapshot.
+"""
+from django.core.management.base import BaseCommand
+
+from products.services import take_stock_snapshots
+
+
+class Command(BaseCommand):
+    help = 'Write StockSnapshot checkpoints for products with new stock movements.'
+
+    def handle(self, *args, **options):
+        written = take_stock_snapshots()
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} stock snapshot(s).'))
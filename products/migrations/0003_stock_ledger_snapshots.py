@@ -0,0 +1,67 @@
+# Generated by Django 6.0 on 2026-10-19 10:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Max
+from django.utils import timezone
+
+
+def create_opening_snapshots(apps, schema_editor):
+    """Checkpoint current stock so ledger lookups have an opening balance."""
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    StockMovement = apps.get_model('products', 'StockMovement')
+    StockSnapshot = apps.get_model('products', 'StockSnapshot')
+
+    watermark = StockMovement.objects.aggregate(last=Max('pk'))['last'] or 0
+    now = timezone.now()
+    snapshots = []
+    for model_name in ('supplement', 'proteinbar'):
+        model = apps.get_model('products', model_name)
+        if not model.objects.exists():
+            continue
+        content_type, _ = ContentType.objects.get_or_create(
+            app_label='products', model=model_name
+        )
+        snapshots.extend(
+            StockSnapshot(
+                content_type_id=content_type.pk,
+                object_id=pk,
+                quantity=quantity,
+                last_movement_id=watermark,
+                taken_at=now,
+            )
+            for pk, quantity in model.objects.values_list('pk', 'stock_quantity')
+        )
+    StockSnapshot.objects.bulk_create(snapshots, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('products', '0002_stockmovement'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='stockmovement',
+            name='kind',
+            field=models.CharField(choices=[('sale', 'Sale'), ('restock', 'Restock'), ('adjustment', 'Adjustment'), ('cancellation', 'Cancellation')], max_length=20),
+        ),
+        migrations.CreateModel(
+            name='StockSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveIntegerField()),
+                ('quantity', models.IntegerField()),
+                ('last_movement_id', models.BigIntegerField(default=0)),
+                ('taken_at', models.DateTimeField()),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+            ],
+            options={
+                'ordering': ['-taken_at'],
+                'indexes': [models.Index(fields=['content_type', 'object_id', 'taken_at'], name='products_st_content_02e288_idx')],
+            },
+        ),
+        migrations.RunPython(create_opening_snapshots, migrations.RunPython.noop),
+    ]
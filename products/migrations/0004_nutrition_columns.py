@@ -0,0 +1,56 @@
+# Generated by Django 6.0 on 2026-10-19 13:13
+
+from django.db import migrations, models
+
+from products.nutrition import parse_protein_grams, parse_serving_grams
+
+BATCH_SIZE = 500
+
+
+def backfill_nutrition(apps, schema_editor):
+    """Parse existing free-text nutrition fields into the numeric columns."""
+    ProteinBar = apps.get_model('products', 'ProteinBar')
+    Supplement = apps.get_model('products', 'Supplement')
+
+    bars = []
+    for bar in ProteinBar.objects.only('pk', 'protein_content').iterator(chunk_size=BATCH_SIZE):
+        bar.protein_g = parse_protein_grams(bar.protein_content)
+        if bar.protein_g is not None:
+            bars.append(bar)
+    ProteinBar.objects.bulk_update(bars, ['protein_g'], batch_size=BATCH_SIZE)
+
+    supplements = []
+    for supplement in Supplement.objects.only('pk', 'serving_size').iterator(chunk_size=BATCH_SIZE):
+        supplement.serving_grams = parse_serving_grams(supplement.serving_size)
+        if supplement.serving_grams is not None:
+            supplements.append(supplement)
+    Supplement.objects.bulk_update(supplements, ['serving_grams'], batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0003_stock_ledger_snapshots'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='proteinbar',
+            name='protein_g',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='supplement',
+            name='serving_grams',
+            field=models.FloatField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='proteinbar',
+            index=models.Index(fields=['protein_g', 'calories'], name='products_pr_protein_290bd8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='proteinbar',
+            index=models.Index(fields=['calories'], name='products_pr_calorie_1bbf5b_idx'),
+        ),
+        migrations.RunPython(backfill_nutrition, migrations.RunPython.noop),
+    ]
@@ -3,9 +3,15 @@ Product models for the Diet Planner application.
 
 Defines base product model and specific product types (Supplements, Protein Bars).
 """
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
 from django.db import models
 from django.urls import reverse
 
+from accounts.models import User
+
+from .nutrition import parse_protein_grams, parse_serving_grams
+
 
 class BaseProduct(models.Model):
     """
@@ -53,26 +59,108 @@ class Supplement(BaseProduct):
     Model representing a dietary supplement product.
 
     Inherits from BaseProduct and adds supplement-specific fields.
+    serving_grams is parsed from serving_size on save.
     """
     brand = models.CharField(max_length=100, blank=True)
     serving_size = models.CharField(max_length=50, blank=True)
+    serving_grams = models.FloatField(null=True, blank=True, editable=False, db_index=True)
     category = models.CharField(max_length=100, blank=True)
 
     class Meta:
         verbose_name = 'Supplement'
         verbose_name_plural = 'Supplements'
 
+    def save(self, *args, **kwargs):
+        self.serving_grams = parse_serving_grams(self.serving_size)
+        super().save(*args, **kwargs)
+
 
 class ProteinBar(BaseProduct):
     """
     Model representing a protein bar product.
 
     Inherits from BaseProduct and adds protein bar-specific fields.
+    protein_g is parsed from protein_content on save so bars can be
+    filtered and sorted by protein with an indexed query.
     """
     flavor = models.CharField(max_length=100, blank=True)
     protein_content = models.CharField(max_length=50, blank=True)
+    protein_g = models.FloatField(null=True, blank=True, editable=False)
     calories = models.IntegerField(null=True, blank=True)
 
     class Meta:
         verbose_name = 'Protein Bar'
         verbose_name_plural = 'Protein Bars'
+        indexes = [
+            models.Index(fields=['protein_g', 'calories']),
+            models.Index(fields=['calories']),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.protein_g = parse_protein_grams(self.protein_content)
+        super().save(*args, **kwargs)
+
+
+PRODUCT_MODELS = {
+    'supplement': Supplement,
+    'protein_bar': ProteinBar,
+}
+
+
+class StockMovement(models.Model):
+    """
+    Append-only ledger entry recording a change to a product's stock.
+
+    Every stock mutation (checkout, restock, admin edit, cancellation)
+    writes one row here, giving an audit trail of who changed what and why.
+    Rows are never updated or deleted; StockSnapshot checkpoints keep
+    point-in-time lookups short.
+    """
+    KIND_CHOICES = [
+        ('sale', 'Sale'),
+        ('restock', 'Restock'),
+        ('adjustment', 'Adjustment'),
+        ('cancellation', 'Cancellation'),
+    ]
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    product = GenericForeignKey('content_type', 'object_id')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    quantity_delta = models.IntegerField()
+    note = models.CharField(max_length=255, blank=True)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['content_type', 'object_id', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} {self.quantity_delta:+d} for {self.product}"
+
+
+class StockSnapshot(models.Model):
+    """
+    Periodic checkpoint of a product's ledger-derived stock level.
+
+    Stock at any point in time is the latest snapshot taken before it plus
+    the movements recorded after the snapshot's last_movement_id.
+    """
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    product = GenericForeignKey('content_type', 'object_id')
+    quantity = models.IntegerField()
+    last_movement_id = models.BigIntegerField(default=0)
+    taken_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-taken_at']
+        indexes = [
+            models.Index(fields=['content_type', 'object_id', 'taken_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.product}: {self.quantity} at {self.taken_at}"
@@ -0,0 +1,60 @@
+"""
+Parsing of free-text nutrition fields into numeric columns.
+
+Product forms keep the original text (e.g. "20g", "1 scoop (30 g)") for
+display and store the parsed numbers alongside it, so catalog filters
+and recommendations query indexed numeric columns instead of parsing
+strings per row.
+"""
+import re
+
+# Grams per unit for serving sizes
+UNIT_GRAMS = {
+    'mg': 0.001,
+    'g': 1.0,
+    'gram': 1.0,
+    'grams': 1.0,
+    'kg': 1000.0,
+    'oz': 28.3495,
+}
+
+_QUANTITY = re.compile(r'(\d+(?:\.\d+)?)\s*(mg|grams|gram|kg|oz|g)\b', re.IGNORECASE)
+
+
+def _first_weight_grams(text):
+    match = _QUANTITY.search(text or '')
+    if not match:
+        return None
+    return round(float(match.group(1)) * UNIT_GRAMS[match.group(2).lower()], 2)
+
+
+def parse_protein_grams(text):
+    """
+    Extract a gram value from free text such as "20g" or "20 g protein".
+
+    The first quantity with a weight unit is used, so "1 bar: 20 g" parses
+    to 20 g, and text with no weight (e.g. "20") parses to None.
+
+    Args:
+        text: protein_content string
+
+    Returns:
+        float or None: Grams of protein, if a weight is present
+    """
+    return _first_weight_grams(text)
+
+
+def parse_serving_grams(text):
+    """
+    Extract a serving weight in grams from text such as "1 scoop (30 g)".
+
+    Only quantities with a weight unit count, so "2 capsules" parses to
+    None rather than 2 g.
+
+    Args:
+        text: serving_size string
+
+    Returns:
+        float or None: Serving weight in grams, if a weight is present
+    """
+    return _first_weight_grams(text)
@@ -0,0 +1,177 @@
+"""
+Product recommendations for diet plans.
+
+In-stock supplements and protein bars are scored against every goal and
+calorie bucket in one pass, and the ranked lists (with the few fields the
+dashboard displays) are stored under a single key in the "products"
+cache namespace. Serving a recommendation is one cache read; scoring
+happens only when the catalog changes (see products.tasks), the cache
+entry expires or the namespace is invalidated.
+"""
+from bisect import bisect_right
+
+from diet_planner.cache import namespace
+
+from .models import ProteinBar, Supplement
+
+CACHE_KEY = 'recommendations'
+CACHE_TIMEOUT = 60 * 60
+RECOMMENDATION_COUNT = 4
+
+GOALS = ('weight_loss', 'weight_gain')
+# Daily calorie bucket edges; a bucket is scored at its midpoint
+CALORIE_BUCKET_EDGES = (1800, 2400, 3000)
+BUCKET_MIDPOINTS = (1500, 2100, 2700, 3300)
+# Share of daily calories a bar or shake is expected to cover (one snack)
+SNACK_SHARE = 0.10
+
+SUPPLEMENT_KEYWORDS = {
+    'weight_loss': {
+        'fat burner': 0.8, 'whey isolate': 0.8, 'protein': 0.7, 'whey': 0.7,
+        'fiber': 0.6, 'carnitine': 0.6, 'multivitamin': 0.5,
+    },
+    'weight_gain': {
+        'mass': 0.9, 'gainer': 0.9, 'protein': 0.8, 'whey': 0.8,
+        'creatine': 0.7, 'multivitamin': 0.5,
+    },
+}
+DEFAULT_SUPPLEMENT_SCORE = 0.2
+
+
+def calorie_bucket(daily_calories):
+    """
+    Map a daily calorie target to its recommendation bucket.
+
+    Args:
+        daily_calories: Daily calorie target
+
+    Returns:
+        int: Bucket index into BUCKET_MIDPOINTS
+    """
+    return bisect_right(CALORIE_BUCKET_EDGES, daily_calories)
+
+
+def score_protein_bar(protein, calories, goal_type, snack_calories):
+    """
+    Score a protein bar for a goal and snack calorie budget.
+
+    Weight loss favours protein per calorie and bars within the snack
+    budget; weight gain favours total protein and bars that fill it.
+
+    Args:
+        protein: Protein grams (or None)
+        calories: Calories per bar (or None)
+        goal_type: 'weight_loss' or 'weight_gain'
+        snack_calories: Calorie budget for one snack
+
+    Returns:
+        float: Score between 0 and 1
+    """
+    protein = protein or 0
+    if calories:
+        density = min(protein * 4 / calories, 0.6) / 0.6
+        fit = 1 - min(abs(calories - snack_calories) / snack_calories, 1)
+    else:
+        density, fit = 0, 0.5
+
+    if goal_type == 'weight_loss':
+        over_budget = calories and calories > snack_calories
+        return 0.6 * density + 0.4 * fit * (0.5 if over_budget else 1)
+    return 0.4 * min(protein / 30, 1) + 0.3 * fit + 0.3 * density
+
+
+def score_supplement(text, goal_type):
+    """
+    Score a supplement by matching its name and category to goal keywords.
+
+    Args:
+        text: Lower-cased name and category
+        goal_type: 'weight_loss' or 'weight_gain'
+
+    Returns:
+        float: Score between 0 and 1
+    """
+    matches = [
+        weight for keyword, weight in SUPPLEMENT_KEYWORDS[goal_type].items()
+        if keyword in text
+    ]
+    return max(matches, default=DEFAULT_SUPPLEMENT_SCORE)
+
+
+def build_recommendations():
+    """
+    Score every in-stock product for every goal and calorie bucket.
+
+    Returns:
+        dict: "goal:bucket" -> ranked list of display dicts
+    """
+    bars = list(ProteinBar.objects.filter(stock_quantity__gt=0).values(
+        'pk', 'name', 'price', 'protein_g', 'calories'
+    ))
+    supplements = list(Supplement.objects.filter(stock_quantity__gt=0).values(
+        'pk', 'name', 'price', 'category'
+    ))
+    for supplement in supplements:
+        supplement['text'] = f"{supplement['name']} {supplement['category']}".lower()
+
+    ranked = {}
+    for goal_type in GOALS:
+        supplement_scores = [
+            (score_supplement(item['text'], goal_type), 'supplement', item, item['category'])
+            for item in supplements
+        ]
+        for bucket, midpoint in enumerate(BUCKET_MIDPOINTS):
+            snack_calories = midpoint * SNACK_SHARE
+            scored = supplement_scores + [
+                (
+                    score_protein_bar(item['protein_g'], item['calories'], goal_type, snack_calories),
+                    'protein_bar',
+                    item,
+                    ', '.join(part for part in [
+                        f"{item['protein_g']:g} g protein" if item['protein_g'] else '',
+                        f"{item['calories']} cal" if item['calories'] else '',
+                    ] if part),
+                )
+                for item in bars
+            ]
+            scored.sort(key=lambda entry: -entry[0])
+            ranked[f'{goal_type}:{bucket}'] = [
+                {
+                    'product_type': product_type,
+                    'id': item['pk'],
+                    'name': item['name'],
+                    'price': item['price'],
+                    'detail': detail,
+                }
+                for _, product_type, item, detail in scored[:RECOMMENDATION_COUNT]
+            ]
+    return ranked
+
+
+def refresh_recommendations():
+    """
+    Rebuild and cache the ranked lists for all buckets.
+
+    Returns:
+        dict: The cached rankings
+    """
+    ranked = build_recommendations()
+    namespace('products').set(CACHE_KEY, ranked, timeout=CACHE_TIMEOUT)
+    return ranked
+
+
+def recommendations_for(goal_type, daily_calories):
+    """
+    Read the precomputed recommendations for a plan (no scoring).
+
+    Args:
+        goal_type: 'weight_loss' or 'weight_gain'
+        daily_calories: Daily calorie target
+
+    Returns:
+        list or None: Display dicts, or None if the cache is cold
+    """
+    ranked = namespace('products').get(CACHE_KEY)
+    if ranked is None:
+        return None
+    return ranked.get(f'{goal_type}:{calorie_bucket(daily_calories)}', [])
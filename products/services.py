@@ -0,0 +1,335 @@
+"""
+Inventory services for products.
+
+Applies stock changes in bulk with atomic F() updates, records every
+change in the StockMovement ledger, and answers point-in-time stock
+questions from StockSnapshot checkpoints plus a short ledger tail.
+"""
+from collections import defaultdict
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Max, OuterRef, Subquery, Sum, Value, When
+from django.utils import timezone
+
+from notifications.services import evaluate_stock_alerts
+
+from .models import PRODUCT_MODELS, StockMovement, StockSnapshot
+from .tasks import refresh_recommendations_async
+
+# Rows per UPDATE statement; keeps CASE expressions under SQLite's
+# bound-parameter limit.
+UPDATE_CHUNK_SIZE = 200
+
+
+class StockAdjustmentError(ValueError):
+    """Raised when a batch of stock adjustments cannot be applied."""
+
+
+def _merge_adjustments(adjustments):
+    """
+    Sum deltas per product so repeated lines become a single change.
+
+    Args:
+        adjustments: Iterable of (product_type, product_id, delta) tuples
+
+    Returns:
+        dict: product_type -> {product_id: total_delta}
+    """
+    merged = defaultdict(lambda: defaultdict(int))
+    for product_type, product_id, delta in adjustments:
+        if product_type not in PRODUCT_MODELS:
+            raise StockAdjustmentError(f'Unknown product type: {product_type}')
+        merged[product_type][int(product_id)] += int(delta)
+
+    return {
+        product_type: {pk: delta for pk, delta in deltas.items() if delta}
+        for product_type, deltas in merged.items()
+    }
+
+
+def _bulk_increment_stock(model, deltas):
+    """
+    Add per-row deltas to stock_quantity using CASE/WHEN UPDATE statements.
+
+    Args:
+        model: Product model class
+        deltas: dict of product_id -> delta
+    """
+    ids = list(deltas)
+    now = timezone.now()
+    for start in range(0, len(ids), UPDATE_CHUNK_SIZE):
+        chunk = ids[start:start + UPDATE_CHUNK_SIZE]
+        increment = Case(
+            *[When(pk=pk, then=Value(deltas[pk])) for pk in chunk],
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+        model.objects.filter(pk__in=chunk).update(
+            stock_quantity=F('stock_quantity') + increment,
+            updated_at=now,
+        )
+
+
+def apply_stock_adjustments(adjustments, kind='restock', note='', user=None):
+    """
+    Apply many stock changes in one transaction.
+
+    Locks the affected rows, validates that every product exists and that
+    no stock level would drop below zero, applies the changes with F()
+    updates, writes one ledger entry per product, and evaluates low stock
+    alerts once for the whole batch after commit. Product recommendations
+    are refreshed if any product went in or out of stock.
+
+    Args:
+        adjustments: Iterable of (product_type, product_id, delta) tuples
+        kind: StockMovement kind recorded in the ledger
+        note: Optional note stored on every ledger entry
+        user: User performing the change, if any
+
+    Returns:
+        list: Updated product instances
+
+    Raises:
+        StockAdjustmentError: If a product is unknown or stock would go negative
+    """
+    merged = _merge_adjustments(adjustments)
+    updated_products = []
+    movements = []
+    availability_changed = False
+
+    with transaction.atomic():
+        for product_type, deltas in merged.items():
+            if not deltas:
+                continue
+            model = PRODUCT_MODELS[product_type]
+            products = model.objects.select_for_update().in_bulk(list(deltas))
+
+            missing = sorted(set(deltas) - set(products))
+            if missing:
+                raise StockAdjustmentError(
+                    f'Unknown {product_type} id(s): {", ".join(map(str, missing))}'
+                )
+
+            for pk, delta in deltas.items():
+                product = products[pk]
+                if product.stock_quantity + delta < 0:
+                    raise StockAdjustmentError(
+                        f'Stock for {product.name} cannot go below zero '
+                        f'({product.stock_quantity} available, change {delta}).'
+                    )
+
+            _bulk_increment_stock(model, deltas)
+
+            content_type = ContentType.objects.get_for_model(model)
+            for pk, delta in deltas.items():
+                product = products[pk]
+                was_in_stock = product.stock_quantity > 0
+                product.stock_quantity += delta
+                availability_changed |= was_in_stock != (product.stock_quantity > 0)
+                updated_products.append(product)
+                movements.append(StockMovement(
+                    content_type=content_type,
+                    object_id=pk,
+                    kind=kind,
+                    quantity_delta=delta,
+                    note=note,
+                    created_by=user,
+                ))
+
+        StockMovement.objects.bulk_create(movements)
+        transaction.on_commit(lambda: evaluate_stock_alerts(updated_products))
+        if availability_changed:
+            transaction.on_commit(refresh_recommendations_async)
+
+    return updated_products
+
+
+def record_stock_movements(changes, kind, note='', user=None):
+    """
+    Write ledger entries for stock changes applied elsewhere.
+
+    Args:
+        changes: Iterable of (product, delta) pairs
+        kind: StockMovement kind ('sale', 'adjustment', ...)
+        note: Optional note stored on every entry
+        user: User responsible for the change, if any
+
+    Returns:
+        list: Created StockMovement instances
+    """
+    movements = [
+        StockMovement(
+            content_type=ContentType.objects.get_for_model(product),
+            object_id=product.pk,
+            kind=kind,
+            quantity_delta=delta,
+            note=note,
+            created_by=user,
+        )
+        for product, delta in changes
+        if delta
+    ]
+    return StockMovement.objects.bulk_create(movements)
+
+
+def record_stock_change(product, previous_quantity, note='', user=None):
+    """
+    Record an in-place edit of stock_quantity as an adjustment entry.
+
+    Args:
+        product: Saved product instance holding the new stock level
+        previous_quantity: Stock level before the edit
+        note: Optional note for the ledger entry
+        user: User who made the edit, if any
+    """
+    delta = product.stock_quantity - previous_quantity
+    record_stock_movements([(product, delta)], 'adjustment', note=note, user=user)
+
+
+def _ledger_levels(model, when=None, ids=None, up_to_movement=None):
+    """
+    Compute stock levels from the latest snapshots plus the ledger tail.
+
+    Uses one query to pick each product's latest snapshot (an index seek
+    per product), one to load those snapshots, and one aggregate query per
+    distinct snapshot watermark, so cost does not grow with history length.
+
+    Args:
+        model: Product model class
+        when: Point in time to evaluate, or None for the present
+        ids: Optional iterable of product ids to restrict the lookup
+        up_to_movement: Ignore movements with a higher id (used for snapshots)
+
+    Returns:
+        dict: product_id -> stock level according to the ledger
+    """
+    content_type = ContentType.objects.get_for_model(model)
+    snapshots = StockSnapshot.objects.filter(content_type=content_type)
+    if when is not None:
+        snapshots = snapshots.filter(taken_at__lte=when)
+
+    latest = snapshots.filter(
+        object_id=OuterRef('pk')
+    ).order_by('-taken_at', '-pk').values('pk')[:1]
+    products = model.objects.all()
+    if ids is not None:
+        products = products.filter(pk__in=list(ids))
+    snapshot_ids = dict(
+        products.annotate(snapshot_id=Subquery(latest)).values_list('pk', 'snapshot_id')
+    )
+
+    levels = dict.fromkeys(snapshot_ids, 0)
+    watermarks = defaultdict(list)
+    found = StockSnapshot.objects.in_bulk([pk for pk in snapshot_ids.values() if pk])
+    for product_id, snapshot_id in snapshot_ids.items():
+        snapshot = found.get(snapshot_id)
+        if snapshot is None:
+            watermarks[0].append(product_id)
+        else:
+            levels[product_id] = snapshot.quantity
+            watermarks[snapshot.last_movement_id].append(product_id)
+
+    for watermark, product_ids in watermarks.items():
+        tail = StockMovement.objects.filter(
+            content_type=content_type,
+            object_id__in=product_ids,
+            pk__gt=watermark,
+        )
+        if when is not None:
+            tail = tail.filter(created_at__lte=when)
+        if up_to_movement is not None:
+            tail = tail.filter(pk__lte=up_to_movement)
+        totals = tail.values('object_id').annotate(total=Sum('quantity_delta'))
+        for row in totals.values_list('object_id', 'total'):
+            levels[row[0]] += row[1]
+
+    return levels
+
+
+def stock_as_of(product_type, when, ids=None):
+    """
+    Reconstruct stock levels for one product type at a point in time.
+
+    Levels are exact from the ledger's opening snapshot onward.
+
+    Args:
+        product_type: 'supplement' or 'protein_bar'
+        when: Datetime to evaluate
+        ids: Optional iterable of product ids
+
+    Returns:
+        dict: product_id -> stock level at ``when``
+    """
+    return _ledger_levels(PRODUCT_MODELS[product_type], when=when, ids=ids)
+
+
+def take_stock_snapshots():
+    """
+    Checkpoint ledger-derived stock for products with new movements.
+
+    Products without movements since their last snapshot are skipped so
+    the snapshot table only grows with actual activity.
+
+    Returns:
+        int: Number of snapshots written
+    """
+    watermark = StockMovement.objects.aggregate(last=Max('pk'))['last'] or 0
+    now = timezone.now()
+    snapshots = []
+
+    for model in PRODUCT_MODELS.values():
+        content_type = ContentType.objects.get_for_model(model)
+        last_snapshots = dict(
+            StockSnapshot.objects.filter(content_type=content_type).values(
+                'object_id'
+            ).annotate(last=Max('last_movement_id')).values_list('object_id', 'last')
+        )
+        levels = _ledger_levels(model, up_to_movement=watermark)
+        latest_movements = dict(
+            StockMovement.objects.filter(
+                content_type=content_type,
+                pk__gt=min(last_snapshots.values(), default=0),
+                pk__lte=watermark,
+            ).values('object_id').annotate(
+                latest=Max('pk')
+            ).values_list('object_id', 'latest')
+        )
+
+        for product_id, quantity in levels.items():
+            last = last_snapshots.get(product_id)
+            if last is not None and latest_movements.get(product_id, 0) <= last:
+                continue
+            snapshots.append(StockSnapshot(
+                content_type=content_type,
+                object_id=product_id,
+                quantity=quantity,
+                last_movement_id=watermark,
+                taken_at=now,
+            ))
+
+    StockSnapshot.objects.bulk_create(snapshots)
+    return len(snapshots)
+
+
+def reconcile_stock():
+    """
+    Compare ledger-derived stock with the stored stock_quantity values.
+
+    Returns:
+        list: Dicts describing every product whose stock does not match
+    """
+    mismatches = []
+    for product_type, model in PRODUCT_MODELS.items():
+        levels = _ledger_levels(model)
+        for pk, name, actual in model.objects.values_list('pk', 'name', 'stock_quantity'):
+            expected = levels.get(pk, 0)
+            if expected != actual:
+                mismatches.append({
+                    'product_type': product_type,
+                    'product_id': pk,
+                    'name': name,
+                    'ledger': expected,
+                    'actual': actual,
+                })
+    return mismatches
@@ -0,0 +1,89 @@
+"""
+Django signals for the product catalog.
+
+Rebuilds the cached product recommendations after a product is added or
+removed, or when a save changes a field the recommendations use (so a
+routine checkout that only lowers stock does not trigger a rebuild).
+Stock changes made through apply_stock_adjustments() never call save();
+that service schedules its own refresh when availability flips.
+
+The values a save is compared against are captured when the instance is
+loaded, so detecting a change costs no extra query.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .models import ProteinBar, Supplement
+from .tasks import refresh_recommendations_async
+
+RECOMMENDATION_FIELDS = {
+    Supplement: ('name', 'price', 'category'),
+    ProteinBar: ('name', 'price', 'protein_g', 'calories'),
+}
+
+
+def _recommendation_state(sender, instance):
+    """
+    Snapshot the values recommendations are built from.
+
+    Returns None when a value is deferred or a pending expression (such
+    as an F() update), meaning the state is unknown.
+    """
+    fields = RECOMMENDATION_FIELDS[sender] + ('stock_quantity',)
+    values = [instance.__dict__.get(field) for field in fields]
+    if any(field not in instance.__dict__ for field in fields) or any(
+        hasattr(value, 'resolve_expression') for value in values
+    ):
+        return None
+    return tuple(values[:-1]) + (values[-1] is not None and values[-1] > 0,)
+
+
+@receiver(post_init, sender=Supplement)
+@receiver(post_init, sender=ProteinBar)
+def remember_recommendation_state(sender, instance, **kwargs):
+    """
+    Remember the loaded values so a later save can tell what changed.
+
+    Args:
+        sender: Product model class
+        instance: Product just initialized
+        **kwargs: Additional signal arguments
+    """
+    instance._recommendation_state = (  # pylint: disable=protected-access
+        _recommendation_state(sender, instance) if instance.pk is not None else None
+    )
+
+
+@receiver(post_save, sender=Supplement)
+@receiver(post_save, sender=ProteinBar)
+def schedule_refresh_on_save(sender, instance, created=False, raw=False, **kwargs):
+    """
+    Refresh recommendations once a relevant catalog change is committed.
+
+    Args:
+        sender: Product model class
+        instance: Product saved
+        created: True for a new product
+        raw: True when loading fixtures (skipped)
+        **kwargs: Additional signal arguments
+    """
+    if raw:
+        return
+    previous = getattr(instance, '_recommendation_state', None)
+    current = _recommendation_state(sender, instance)
+    instance._recommendation_state = current  # pylint: disable=protected-access
+    if created or previous is None or current is None or previous != current:
+        transaction.on_commit(refresh_recommendations_async)
+
+
+@receiver(post_delete, sender=Supplement)
+@receiver(post_delete, sender=ProteinBar)
+def schedule_refresh_on_delete(**kwargs):
+    """
+    Refresh recommendations once a product removal is committed.
+
+    Args:
+        **kwargs: Signal arguments (sender, instance, ...)
+    """
+    transaction.on_commit(refresh_recommendations_async)
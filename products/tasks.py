@@ -0,0 +1,58 @@
+"""
+Background product recommendation refresh.
+
+Uses threading, like the stock alert emails, so catalog edits never wait
+for the recommendation rebuild. Changes arriving while a rebuild runs
+trigger exactly one more rebuild afterwards.
+"""
+import logging
+import threading
+
+from django.db import connection
+
+from .recommendations import refresh_recommendations
+
+logger = logging.getLogger(__name__)
+
+_refresh_lock = threading.Lock()
+_refresh_state = {'running': False, 'dirty': False}
+
+
+def _refresh_loop():
+    try:
+        while True:
+            with _refresh_lock:
+                _refresh_state['dirty'] = False
+            refresh_recommendations()
+            with _refresh_lock:
+                if not _refresh_state['dirty']:
+                    _refresh_state['running'] = False
+                    return
+    except Exception:  # pylint: disable=broad-exception-caught
+        # Top of the thread: whatever failed (database, cache backend, a
+        # scoring bug), clear the flag or this process never refreshes again
+        logger.exception("Product recommendation refresh failed")
+        with _refresh_lock:
+            _refresh_state['running'] = False
+    finally:
+        connection.close()
+
+
+def refresh_recommendations_async():
+    """
+    Rebuild product recommendations in a background thread.
+
+    Returns:
+        bool: True if a new thread was started, False if a running
+        refresh will pick up the change instead
+    """
+    with _refresh_lock:
+        if _refresh_state['running']:
+            _refresh_state['dirty'] = True
+            return False
+        _refresh_state['running'] = True
+
+    thread = threading.Thread(target=_refresh_loop, daemon=True)
+    thread.start()
+    logger.debug("Started background product recommendation refresh")
+    return True
@@ -15,4 +15,5 @@ urlpatterns = [
     path('admin/protein-bar/create/', views.create_protein_bar, name='create_protein_bar'),
     path('admin/protein-bar/<int:pk>/update/', views.update_protein_bar, name='update_protein_bar'),
     path('admin/protein-bar/<int:pk>/delete/', views.delete_protein_bar, name='delete_protein_bar'),
+    path('admin/stock/bulk-adjust/', views.bulk_stock_adjustment, name='bulk_stock_adjustment'),
 ]
@@ -1,23 +1,34 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import user_passes_test
 from django.contrib import messages
+from diet_planner.routers import replica_reads
+from orders.services import with_available_quantity
 from .models import Supplement, ProteinBar
-from .forms import SupplementForm, ProteinBarForm
+from .forms import SupplementForm, ProteinBarForm, ProteinBarFilterForm, BulkStockAdjustmentForm
+from .services import apply_stock_adjustments, record_stock_change, StockAdjustmentError
 
 
+@replica_reads
 def product_list(request):
-    supplements = Supplement.objects.all()
-    protein_bars = ProteinBar.objects.all()
+    user = request.user if request.user.is_authenticated else None
+    supplements = with_available_quantity(Supplement.objects.all(), 'supplement', user)
+    filter_form = ProteinBarFilterForm(request.GET or None)
+    protein_bars = with_available_quantity(
+        filter_form.filter(ProteinBar.objects.all()), 'protein_bar', user
+    )
 
     context = {
         'supplements': supplements,
         'protein_bars': protein_bars,
+        'filter_form': filter_form,
     }
     return render(request, 'products/product_list.html', context)
 
 
+@replica_reads
 def supplement_detail(request, pk):
-    supplement = get_object_or_404(Supplement, pk=pk)
+    user = request.user if request.user.is_authenticated else None
+    supplement = get_object_or_404(with_available_quantity(Supplement.objects.all(), 'supplement', user), pk=pk)
     return render(
         request,
         'products/product_detail.html',
@@ -25,8 +36,10 @@ def supplement_detail(request, pk):
     )
 
 
+@replica_reads
 def protein_bar_detail(request, pk):
-    protein_bar = get_object_or_404(ProteinBar, pk=pk)
+    user = request.user if request.user.is_authenticated else None
+    protein_bar = get_object_or_404(with_available_quantity(ProteinBar.objects.all(), 'protein_bar', user), pk=pk)
     return render(
         request,
         'products/product_detail.html',
@@ -55,7 +68,8 @@ def create_supplement(request):
     if request.method == 'POST':
         form = SupplementForm(request.POST, request.FILES)
         if form.is_valid():
-            form.save()
+            supplement = form.save()
+            record_stock_change(supplement, 0, note='Initial stock', user=request.user)
             messages.success(request, 'Supplement created successfully!')
             return redirect('products:admin_product_list')
     else:
@@ -67,9 +81,11 @@ def create_supplement(request):
 def update_supplement(request, pk):
     supplement = get_object_or_404(Supplement, pk=pk)
     if request.method == 'POST':
+        previous_stock = supplement.stock_quantity
         form = SupplementForm(request.POST, request.FILES, instance=supplement)
         if form.is_valid():
             form.save()
+            record_stock_change(supplement, previous_stock, user=request.user)
             messages.success(request, 'Supplement updated successfully!')
             return redirect('products:admin_product_list')
     else:
@@ -104,7 +120,8 @@ def create_protein_bar(request):
     if request.method == 'POST':
         form = ProteinBarForm(request.POST, request.FILES)
         if form.is_valid():
-            form.save()
+            protein_bar = form.save()
+            record_stock_change(protein_bar, 0, note='Initial stock', user=request.user)
             messages.success(request, 'Protein bar created successfully!')
             return redirect('products:admin_product_list')
     else:
@@ -116,9 +133,11 @@ def create_protein_bar(request):
 def update_protein_bar(request, pk):
     protein_bar = get_object_or_404(ProteinBar, pk=pk)
     if request.method == 'POST':
+        previous_stock = protein_bar.stock_quantity
         form = ProteinBarForm(request.POST, request.FILES, instance=protein_bar)
         if form.is_valid():
             form.save()
+            record_stock_change(protein_bar, previous_stock, user=request.user)
             messages.success(request, 'Protein bar updated successfully!')
             return redirect('products:admin_product_list')
     else:
@@ -146,3 +165,25 @@ def delete_protein_bar(request, pk):
         'products/admin/product_confirm_delete.html',
         {'product': protein_bar, 'product_type': 'Protein Bar'}
     )
+
+
+@user_passes_test(is_admin)
+def bulk_stock_adjustment(request):
+    if request.method == 'POST':
+        form = BulkStockAdjustmentForm(request.POST)
+        if form.is_valid():
+            try:
+                updated = apply_stock_adjustments(
+                    form.cleaned_data['lines'],
+                    kind=form.cleaned_data['kind'],
+                    note=form.cleaned_data['note'],
+                    user=request.user,
+                )
+            except StockAdjustmentError as e:
+                form.add_error('lines', str(e))
+            else:
+                messages.success(request, f'Stock updated for {len(updated)} product(s).')
+                return redirect('products:admin_product_list')
+    else:
+        form = BulkStockAdjustmentForm()
+    return render(request, 'products/admin/bulk_stock_adjustment.html', {'form': form})
@@ -0,0 +1,35 @@
+from django.contrib import admin
+from .models import WeightAggregate, WeightEntry
+from .services import delete_weight_entry, save_weight_entry
+
+
+@admin.register(WeightEntry)
+class WeightEntryAdmin(admin.ModelAdmin):
+    list_display = ['user', 'date', 'weight', 'waist_cm']
+    list_filter = ['date']
+    search_fields = ['user__username', 'user__email']
+    date_hierarchy = 'date'
+
+    # Writes go through the services so weekly/monthly aggregates stay current
+    def save_model(self, request, obj, form, change):
+        save_weight_entry(obj)
+
+    def delete_model(self, request, obj):
+        delete_weight_entry(obj)
+
+    def delete_queryset(self, request, queryset):
+        for entry in queryset.select_related('user'):
+            delete_weight_entry(entry)
+
+
+@admin.register(WeightAggregate)
+class WeightAggregateAdmin(admin.ModelAdmin):
+    list_display = ['user', 'period', 'period_start', 'entry_count', 'weight_min', 'weight_max']
+    list_filter = ['period']
+    search_fields = ['user__username']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
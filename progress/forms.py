@@ -0,0 +1,27 @@
+from django import forms
+from django.utils import timezone
+
+from .models import WeightEntry
+
+
+class WeightEntryForm(forms.ModelForm):
+    class Meta:
+        model = WeightEntry
+        fields = ['date', 'weight', 'waist_cm']
+        widgets = {
+            'date': forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
+            'weight': forms.NumberInput(attrs={'class': 'form-control', 'step': '0.1'}),
+            'waist_cm': forms.NumberInput(attrs={'class': 'form-control', 'step': '0.1'}),
+        }
+
+    def clean_date(self):
+        day = self.cleaned_data['date']
+        if day > timezone.localdate():
+            raise forms.ValidationError('You cannot log a weight for a future date.')
+        return day
+
+    def clean_weight(self):
+        weight = self.cleaned_data['weight']
+        if not 20 <= weight <= 400:
+            raise forms.ValidationError('Enter a weight between 20 and 400 kg.')
+        return weight
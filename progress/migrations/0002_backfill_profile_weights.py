@@ -0,0 +1,47 @@
+# Generated by Django 6.0 on 2026-10-19 13:10
+
+from datetime import timedelta
+
+from django.db import migrations
+
+
+def backfill_profile_weights(apps, schema_editor):
+    """Start each user's log with the weight currently stored on their profile."""
+    Profile = apps.get_model('accounts', 'Profile')
+    WeightEntry = apps.get_model('progress', 'WeightEntry')
+    WeightAggregate = apps.get_model('progress', 'WeightAggregate')
+
+    entries = []
+    aggregates = []
+    profiles = Profile.objects.filter(current_weight__isnull=False).values_list(
+        'user_id', 'current_weight', 'updated_at'
+    )
+    for user_id, weight, updated_at in profiles.iterator():
+        day = updated_at.date()
+        entries.append(WeightEntry(user_id=user_id, date=day, weight=weight))
+        week_start = day - timedelta(days=day.weekday())
+        for period, start in (('week', week_start), ('month', day.replace(day=1))):
+            aggregates.append(WeightAggregate(
+                user_id=user_id,
+                period=period,
+                period_start=start,
+                entry_count=1,
+                weight_sum=weight,
+                weight_min=weight,
+                weight_max=weight,
+            ))
+
+    WeightEntry.objects.bulk_create(entries, batch_size=1000, ignore_conflicts=True)
+    WeightAggregate.objects.bulk_create(aggregates, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('progress', '0001_initial'),
+        ('accounts', '0002_create_missing_profiles'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_profile_weights, migrations.RunPython.noop),
+    ]
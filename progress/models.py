@@ -0,0 +1,65 @@
+"""
+Progress tracking models.
+
+Stores a weight log per user plus weekly and monthly aggregates that are
+kept up to date as entries change, so charts read one row per period.
+"""
+from django.db import models
+from accounts.models import User
+
+
+class WeightEntry(models.Model):
+    """
+    A user's weight (and optional waist measurement) on a given day.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='weight_entries')
+    date = models.DateField()
+    weight = models.FloatField(help_text='Weight in kg')
+    waist_cm = models.FloatField(null=True, blank=True, help_text='Waist in cm')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-date']
+        verbose_name_plural = 'Weight entries'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'date'], name='unique_weight_entry_per_day'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.date}: {self.weight} kg"
+
+
+class WeightAggregate(models.Model):
+    """
+    Downsampled weight statistics for one user and one week or month.
+    """
+    PERIOD_CHOICES = [
+        ('week', 'Week'),
+        ('month', 'Month'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='weight_aggregates')
+    period = models.CharField(max_length=10, choices=PERIOD_CHOICES)
+    period_start = models.DateField()
+    entry_count = models.PositiveIntegerField(default=0)
+    weight_sum = models.FloatField(default=0)
+    weight_min = models.FloatField()
+    weight_max = models.FloatField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['period', 'period_start']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'period', 'period_start'],
+                name='unique_weight_aggregate_period',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} {self.period} of {self.period_start}"
+
+    @property
+    def average(self):
+        """Mean weight over the period's entries."""
+        return self.weight_sum / self.entry_count if self.entry_count else None
@@ -0,0 +1,245 @@
+"""
+Weight log services.
+
+Logging or deleting an entry refreshes only the week and month
+aggregates containing that day (one indexed aggregate query each), and
+trend lines and ETA-to-target estimates are fitted with NumPy over those
+aggregates, so a year of daily entries is charted from ~52 weekly rows.
+"""
+from datetime import timedelta
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Count, Max, Min, Sum
+from django.utils import timezone
+
+from accounts.models import Profile
+
+from .models import WeightAggregate, WeightEntry
+
+# Weekly averages used to fit the trend line
+TREND_WEEKS = 12
+# Periods shown on the chart
+CHART_PERIODS = {'week': 52, 'month': 24}
+MOVING_AVERAGE_WINDOW = 4
+
+
+def period_bounds(day, period):
+    """
+    Return the first day of the period containing ``day`` and the day after it.
+
+    Args:
+        day: date
+        period: 'week' (Monday start) or 'month'
+
+    Returns:
+        tuple: (start, end) with end exclusive
+    """
+    if period == 'week':
+        start = day - timedelta(days=day.weekday())
+        return start, start + timedelta(days=7)
+    start = day.replace(day=1)
+    end = (start + timedelta(days=32)).replace(day=1)
+    return start, end
+
+
+def refresh_aggregates(user_id, day):
+    """
+    Recompute the week and month aggregates that contain ``day``.
+
+    Args:
+        user_id: Owner of the entries
+        day: Date whose periods changed
+    """
+    for period, _ in WeightAggregate.PERIOD_CHOICES:
+        start, end = period_bounds(day, period)
+        stats = WeightEntry.objects.filter(
+            user_id=user_id, date__gte=start, date__lt=end
+        ).aggregate(count=Count('pk'), total=Sum('weight'), low=Min('weight'), high=Max('weight'))
+
+        if not stats['count']:
+            WeightAggregate.objects.filter(
+                user_id=user_id, period=period, period_start=start
+            ).delete()
+            continue
+
+        WeightAggregate.objects.update_or_create(
+            user_id=user_id,
+            period=period,
+            period_start=start,
+            defaults={
+                'entry_count': stats['count'],
+                'weight_sum': stats['total'],
+                'weight_min': stats['low'],
+                'weight_max': stats['high'],
+            },
+        )
+
+
+def _sync_current_weight(user):
+    """Copy the latest logged weight to Profile.current_weight."""
+    latest = WeightEntry.objects.filter(user=user).order_by('-date').values_list(
+        'weight', flat=True
+    ).first()
+    if latest is not None:
+        Profile.objects.filter(user=user).exclude(current_weight=latest).update(
+            current_weight=latest,
+            updated_at=timezone.now(),
+        )
+
+
+def log_weight(user, weight, day=None, waist_cm=None):
+    """
+    Record (or correct) a user's weight for a day.
+
+    Updates the affected aggregates and, if this is the latest entry,
+    the profile's current weight.
+
+    Args:
+        user: User logging the weight
+        weight: Weight in kg
+        day: Date of the measurement (defaults to today)
+        waist_cm: Optional waist measurement; when omitted an existing
+            entry's waist is left as it was
+
+    Returns:
+        WeightEntry: The created or updated entry
+    """
+    day = day or timezone.localdate()
+    defaults = {'weight': weight}
+    if waist_cm is not None:
+        defaults['waist_cm'] = waist_cm
+    with transaction.atomic():
+        entry, _ = WeightEntry.objects.update_or_create(
+            user=user,
+            date=day,
+            defaults=defaults,
+        )
+        refresh_aggregates(user.pk, day)
+        _sync_current_weight(user)
+    return entry
+
+
+def save_weight_entry(entry):
+    """
+    Save an entry edited in place and refresh the aggregates it affects.
+
+    Used by the admin, where an entry's user or date may change: the
+    periods it left are refreshed as well as the ones it joined.
+
+    Args:
+        entry: WeightEntry to save (new or existing)
+    """
+    with transaction.atomic():
+        previous = None
+        if entry.pk is not None:
+            previous = WeightEntry.objects.filter(pk=entry.pk).values_list('user_id', 'date').first()
+        entry.save()
+        refresh_aggregates(entry.user_id, entry.date)
+        _sync_current_weight(entry.user)
+        if previous is not None and previous != (entry.user_id, entry.date):
+            refresh_aggregates(*previous)
+            if previous[0] != entry.user_id:
+                _sync_current_weight(previous[0])
+
+
+def delete_weight_entry(entry):
+    """
+    Delete an entry and refresh the aggregates it belonged to.
+
+    Args:
+        entry: WeightEntry to remove
+    """
+    with transaction.atomic():
+        entry.delete()
+        refresh_aggregates(entry.user_id, entry.date)
+        _sync_current_weight(entry.user)
+
+
+def weight_trend(user, target_weight=None, weeks=TREND_WEEKS):
+    """
+    Fit a linear trend to recent weekly averages.
+
+    Args:
+        user: User whose log is analysed
+        target_weight: Optional goal weight for the ETA estimate
+        weeks: Number of most recent weekly aggregates to fit
+
+    Returns:
+        dict or None: kg_per_week, current (fitted) weight and eta (date or
+        None if the trend points away from the target); None with fewer
+        than two weeks of data
+    """
+    rows = list(
+        WeightAggregate.objects.filter(user=user, period='week').order_by(
+            '-period_start'
+        ).values_list('period_start', 'weight_sum', 'entry_count')[:weeks]
+    )
+    if len(rows) < 2:
+        return None
+    rows.reverse()
+
+    origin = rows[0][0]
+    days = np.array([(start - origin).days for start, _, _ in rows], dtype=float)
+    averages = np.array([total / count for _, total, count in rows])
+    slope, intercept = np.polyfit(days, averages, 1)
+    current = float(intercept + slope * days[-1])
+
+    eta = None
+    if target_weight is not None and slope:
+        days_left = (target_weight - current) / slope
+        if days_left >= 0:
+            eta = rows[-1][0] + timedelta(days=int(np.ceil(days_left)))
+
+    return {
+        'kg_per_week': round(float(slope) * 7, 2),
+        'current': round(current, 1),
+        'eta': eta,
+    }
+
+
+def chart_series(user, period='week'):
+    """
+    Build chart data from the stored aggregates.
+
+    Args:
+        user: User whose log is charted
+        period: 'week' or 'month'
+
+    Returns:
+        dict: labels, average/min/max series, a moving average and a
+        linear trend line, as lists
+    """
+    limit = CHART_PERIODS.get(period, CHART_PERIODS['week'])
+    rows = list(
+        WeightAggregate.objects.filter(user=user, period=period).order_by(
+            '-period_start'
+        ).values_list('period_start', 'weight_sum', 'entry_count', 'weight_min', 'weight_max')[:limit]
+    )
+    rows.reverse()
+    if not rows:
+        return {
+            'labels': [], 'average': [], 'min': [], 'max': [],
+            'moving_average': [], 'trend': [],
+        }
+
+    starts, totals, counts, lows, highs = zip(*rows)
+    averages = np.array(totals) / np.array(counts)
+    window = min(MOVING_AVERAGE_WINDOW, len(averages))
+    smoothed = np.convolve(averages, np.ones(window) / window, mode='valid')
+    moving = [None] * (len(averages) - len(smoothed)) + np.round(smoothed, 1).tolist()
+
+    trend = []
+    if len(rows) > 1:
+        days = np.array([(start - starts[0]).days for start in starts], dtype=float)
+        slope, intercept = np.polyfit(days, averages, 1)
+        trend = np.round(intercept + slope * days, 1).tolist()
+
+    return {
+        'labels': [start.isoformat() for start in starts],
+        'average': np.round(averages, 1).tolist(),
+        'min': list(lows),
+        'max': list(highs),
+        'moving_average': moving,
+        'trend': trend,
+    }
@@ -0,0 +1,9 @@
+from django.urls import path
+from . import views
+
+app_name = 'progress'
+
+urlpatterns = [
+    path('', views.weight_log, name='weight_log'),
+    path('entries/<int:pk>/delete/', views.delete_entry, name='delete_entry'),
+]
@@ -0,0 +1,67 @@
+"""
+Progress views: weight log entry, history and trend chart.
+"""
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import get_object_or_404, redirect, render
+from django.utils import timezone
+
+from accounts.models import Profile
+
+from .forms import WeightEntryForm
+from .models import WeightAggregate, WeightEntry
+from .services import chart_series, delete_weight_entry, log_weight, weight_trend
+
+RECENT_ENTRIES = 14
+
+
+@login_required
+def weight_log(request):
+    """
+    Log today's weight and show history, chart and trend.
+
+    The chart is built from weekly or monthly aggregates (``?period=``),
+    never from the raw daily entries.
+    """
+    if request.method == 'POST':
+        form = WeightEntryForm(request.POST)
+        if form.is_valid():
+            log_weight(
+                request.user,
+                form.cleaned_data['weight'],
+                day=form.cleaned_data['date'],
+                waist_cm=form.cleaned_data['waist_cm'],
+            )
+            messages.success(request, 'Weight logged.')
+            return redirect('progress:weight_log')
+    else:
+        form = WeightEntryForm(initial={'date': timezone.localdate()})
+
+    period = request.GET.get('period', 'week')
+    if period not in dict(WeightAggregate.PERIOD_CHOICES):
+        period = 'week'
+
+    profile = Profile.objects.filter(user=request.user).first()
+    target_weight = profile.target_weight if profile else None
+
+    context = {
+        'form': form,
+        'entries': WeightEntry.objects.filter(user=request.user)[:RECENT_ENTRIES],
+        'chart': chart_series(request.user, period),
+        'period': period,
+        'trend': weight_trend(request.user, target_weight),
+        'target_weight': target_weight,
+    }
+    return render(request, 'progress/weight_log.html', context)
+
+
+@login_required
+def delete_entry(request, pk):
+    """
+    Delete one of the user's weight entries (POST only).
+    """
+    if request.method == 'POST':
+        entry = get_object_or_404(WeightEntry, pk=pk, user=request.user)
+        delete_weight_entry(entry)
+        messages.success(request, 'Entry deleted.')
+    return redirect('progress:weight_log')
@@ -23,7 +23,7 @@ echo "Running pylint analysis..."
 pylint --rcfile=.pylintrc \
        --output-format=text \
        --reports=yes \
-       accounts/ diet_plans/ products/ orders/ notifications/ diet_planner/ manage.py \
+       accounts/ diet_plans/ products/ orders/ notifications/ progress/ diet_planner/ manage.py \
        > pylint_report.txt 2>&1
 
 # Check exit code